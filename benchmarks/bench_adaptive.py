@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Detection of a skewed workload with adaptive ordering, against the fixed order.
+
+Generates a workload like the headers and environment of a service: a share of
+identifiers in ALL_CAPS and Train-Case, the last conventions of the built-in order,
+and the rest drawn from the corpus of every convention. Detects it with the fixed
+order of the conventions, then with adaptive ordering enabled, reorderings
+included, and prints the throughput of both and the adapted order. Custom
+conventions, lowercase words joined by other separators, can be put ahead of the
+built-in ones, like in a larger registry.
+
+Usage:
+    python benchmarks/bench_adaptive.py [--size N] [--rounds N] [--skew RATIO]
+        [--custom N]
+"""
+
+import argparse
+import random
+import re
+import time
+from collections.abc import Callable
+
+from corpus import WORDS, conventions, generate_corpus
+
+from nomage import NamingConvention
+from nomage.adaptive import disable_adaptive_ordering, enable_adaptive_ordering
+from nomage.engine import DetectionEngine
+from nomage.naming import BUILTINS_CONVENTIONS
+from nomage.tokenizer import Tokenizer
+
+_SEPARATORS = ".:/+~@%,;=!&*|^"
+
+
+def generate_workload(size: int, skew: float, *, seed: int = 0) -> list[str]:
+    """Generate identifiers, a `skew` share of them in ALL_CAPS or Train-Case."""
+    rng = random.Random(seed)
+    ncs = conventions()
+    hot = (ncs["ALL_CAPS"], ncs["Train-Case"])
+    corpus = generate_corpus(size, seed=seed)
+    return [
+        rng.choice(hot).converter(rng.choices(WORDS, k=rng.randint(1, 4)))
+        if rng.random() < skew
+        else id_str
+        for id_str, _ in corpus
+    ]
+
+
+def custom_conventions(count: int) -> list[NamingConvention]:
+    """Build conventions of lowercase words joined by other separators."""
+    return [
+        NamingConvention(
+            names=(f"custom{sep}case",),
+            match_regex=re.compile(
+                rf"^[a-z][a-z0-9]*({re.escape(sep)}[a-z][a-z0-9]*)+$"
+            ),
+            parser=Tokenizer(sep),
+            converter=sep.join,
+        )
+        for sep in _SEPARATORS[:count]
+    ]
+
+
+def _time(
+    detect: Callable[[str], NamingConvention | None], workload: list[str], rounds: int
+) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for id_str in workload:
+            detect(id_str)
+        best = min(best, time.perf_counter() - start)
+    return len(workload) / best
+
+
+def main() -> None:
+    """Run the benchmarks and print the throughput with each order."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--skew", type=float, default=0.8)
+    parser.add_argument("--custom", type=int, default=0)
+    args = parser.parse_args()
+
+    workload = generate_workload(args.size, args.skew)
+    ncs = [*custom_conventions(args.custom), *BUILTINS_CONVENTIONS]
+    fixed = _time(DetectionEngine(ncs).detect, workload, args.rounds)
+    engine = DetectionEngine(ncs)
+    enable_adaptive_ordering()
+    adaptive = _time(engine.detect, workload, args.rounds)
+    order = [nc.names[0] for nc in engine.order]
+    disable_adaptive_ordering()
+
+    print(f"{'fixed order':<16} {fixed:12,.0f} ids/s {1:6.2f}x")
+    print(f"{'adaptive order':<16} {adaptive:12,.0f} ids/s {adaptive / fixed:6.2f}x")
+    print(f"adapted order: {', '.join(order)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Event-loop latency while converting identifiers from an async iterator.
+
+A heartbeat task sleeps 1 ms in a loop and records how late it wakes up, while
+identifiers are converted by a naive loop calling `naming`, then by `aconvert_many`
+in the event loop and with thread and process executors.
+
+Usage:
+    python benchmarks/bench_aio.py [--size N] [--chunksize N]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import statistics
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from corpus import generate_corpus
+
+from nomage import naming
+from nomage.aio import aconvert_many
+from nomage.exceptions import UnrecognizedNamingConventionError
+
+HEARTBEAT_S = 0.001
+
+
+async def _source(id_strs: list[str]) -> AsyncIterator[str]:
+    for id_str in id_strs:
+        yield id_str
+
+
+async def _naive(id_strs: list[str], _: int, __: Executor | None) -> int:
+    count = 0
+    async for id_str in _source(id_strs):
+        with contextlib.suppress(UnrecognizedNamingConventionError):
+            naming(id_str).to("snake")
+        count += 1
+    return count
+
+
+async def _aio(id_strs: list[str], chunksize: int, executor: Executor | None) -> int:
+    results = aconvert_many(
+        _source(id_strs), "snake", chunksize=chunksize, executor=executor
+    )
+    count = 0
+    async for _ in results:
+        count += 1
+    return count
+
+
+async def _measure(
+    convert: Callable[[list[str], int, Executor | None], Awaitable[int]],
+    id_strs: list[str],
+    chunksize: int,
+    executor: Executor | None,
+) -> tuple[float, float, float]:
+    lags: list[float] = []
+
+    async def heartbeat() -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(HEARTBEAT_S)
+            lags.append(time.perf_counter() - start - HEARTBEAT_S)
+
+    task = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    count = await convert(id_strs, chunksize, executor)
+    elapsed = time.perf_counter() - start
+    task.cancel()
+    lags = lags or [elapsed]
+    p99 = (
+        statistics.quantiles(lags, n=100, method="inclusive")[98]
+        if len(lags) > 1
+        else lags[0]
+    )
+    return count / elapsed, p99 * 1e3, max(lags) * 1e3
+
+
+def main() -> None:
+    """Run the benchmarks and print throughput and heartbeat lateness."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=256)
+    args = parser.parse_args()
+
+    id_strs = [id_str for id_str, _ in generate_corpus(args.size)]
+    with ThreadPoolExecutor(1) as threads, ProcessPoolExecutor() as processes:
+        runs: list[tuple[str, Callable[..., Awaitable[int]], Executor | None]] = [
+            ("naive naming() loop", _naive, None),
+            ("aconvert_many", _aio, None),
+            ("aconvert_many, threads", _aio, threads),
+            ("aconvert_many, processes", _aio, processes),
+        ]
+        print(f"{'':26} {'ids/s':>10} {'p99 lag':>10} {'max lag':>10}")
+        for name, convert, executor in runs:
+            rate, p99, worst = asyncio.run(
+                _measure(convert, id_strs, args.chunksize, executor)
+            )
+            print(f"{name:26} {rate:10,.0f} {p99:8.2f}ms {worst:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
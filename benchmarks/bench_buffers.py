@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Detection of identifiers in place in a memory-mapped file, against decoding.
+
+Writes a corpus of identifiers separated by spaces and newlines to a temporary file,
+memory-maps it, and finds the spans of its words with a bytes regular expression.
+Each word is then detected by slicing and decoding it into a str for
+`DetectionEngine.detect`, and in place with `DetectionEngine.detect_bytes`, with
+its offsets in the buffer. The time of the word scan alone is given for scale.
+
+Usage:
+    python benchmarks/bench_buffers.py [--size N] [--rounds N]
+"""
+
+import argparse
+import mmap
+import re
+import tempfile
+import time
+from collections.abc import Callable
+
+from corpus import generate_corpus
+
+from nomage.engine import get_engine
+from nomage.naming import BUILTINS_CONVENTIONS
+
+_WORDS = re.compile(rb"\S+")
+
+
+def _scan(data: mmap.mmap) -> int:
+    return sum(1 for _ in _WORDS.finditer(data))
+
+
+def _decoded(data: mmap.mmap) -> int:
+    detect = get_engine(BUILTINS_CONVENTIONS).detect
+    return sum(
+        detect(data[m.start() : m.end()].decode()) is not None
+        for m in _WORDS.finditer(data)
+    )
+
+
+def _in_place(data: mmap.mmap) -> int:
+    detect_bytes = get_engine(BUILTINS_CONVENTIONS).detect_bytes
+    return sum(
+        detect_bytes(data, m.start(), m.end()) is not None
+        for m in _WORDS.finditer(data)
+    )
+
+
+def _time(func: Callable[[mmap.mmap], int], data: mmap.mmap, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmarks and print the throughput of each method."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.size)
+    text = "".join(
+        f"{id_str}{' ' if i % 8 else chr(10)}" for i, (id_str, _) in enumerate(corpus)
+    ).encode()
+    with tempfile.TemporaryFile() as file:
+        file.write(text)
+        file.flush()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            assert _decoded(data) == _in_place(data)
+            timings = {
+                "word scan only": _time(_scan, data, args.rounds),
+                "slice, decode, detect": _time(_decoded, data, args.rounds),
+                "detect_bytes in place": _time(_in_place, data, args.rounds),
+            }
+    baseline = timings["slice, decode, detect"]
+    for name, seconds in timings.items():
+        print(
+            f"{name:<24} {args.size / seconds:>12,.0f} ids/s "
+            f"{baseline / seconds:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
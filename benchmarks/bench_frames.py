@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Vectorized conversion of string columns against row by row conversion.
+
+Converts a pandas Series of identifiers drawn from a small vocabulary, like event
+names, to snake_case with `Series.map` calling `naming(x).to("snake")` on each row,
+then with `convert_array` on the Series, a NumPy array and a pyarrow array. Requires
+numpy, pandas and pyarrow.
+
+Usage:
+    python benchmarks/bench_frames.py [--rows N] [--distinct N]
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from corpus import generate_corpus
+
+from nomage import naming
+from nomage.exceptions import UnrecognizedNamingConventionError
+from nomage.frames import convert_array
+
+
+def _to_snake(id_str: str) -> str:
+    try:
+        return naming(id_str).to("snake")
+    except UnrecognizedNamingConventionError:
+        return id_str
+
+
+def _time(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmarks and print the rows converted per second."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--distinct", type=int, default=1000)
+    args = parser.parse_args()
+
+    vocabulary = [id_str for id_str, _ in generate_corpus(args.distinct)]
+    rows = random.Random(0).choices(vocabulary, k=args.rows)
+    # Columns are built before timing, only their conversion is measured.
+    series = pd.Series(rows)
+    strings = np.array(rows)
+    objects = np.array(rows, dtype=object)
+    array = pa.array(rows)
+    runs = {
+        "Series.map(naming)": lambda: series.map(_to_snake),
+        "convert_array(Series)": lambda: convert_array(series, "snake"),
+        "convert_array(str ndarray)": lambda: convert_array(strings, "snake"),
+        "convert_array(obj ndarray)": lambda: convert_array(objects, "snake"),
+        "convert_array(pa.array)": lambda: convert_array(array, "snake"),
+    }
+    print(f"{args.rows:,} rows, {args.distinct:,} distinct values")
+    for name, run in runs.items():
+        elapsed = _time(run)
+        print(f"{name:<28} {args.rows / elapsed:>14,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Conversion of the keys of JSON documents against a recursive `naming` walk.
+
+Generates a JSON document like an API response: a page of records with nested
+objects and lists, whose keys are snake_case identifiers drawn from a fixed schema.
+Converts its keys to camelCase with a recursive walk calling
+`naming(key).to("camel")` on each key, with the detection cache enabled, then with
+`convert_keys`, copying and in place, and rewrites the JSON text as a stream with
+`rewrite_json`. The time of `json.loads` is given for scale.
+
+Usage:
+    python benchmarks/bench_keys.py [--records N] [--rounds N]
+"""
+
+import argparse
+import io
+import json
+import random
+import time
+from collections.abc import Callable
+
+from corpus import WORDS
+
+from nomage import naming
+from nomage.cache import disable_cache, enable_cache
+from nomage.exceptions import UnrecognizedNamingConventionError
+from nomage.keys import clear_key_cache, convert_keys, rewrite_json
+
+
+def _schema(rng: random.Random, size: int) -> list[str]:
+    return ["_".join(rng.choices(WORDS, k=rng.randint(1, 3))) for _ in range(size)]
+
+
+def _record(rng: random.Random, keys: list[str], depth: int) -> dict[str, object]:
+    record: dict[str, object] = {}
+    for key in keys:
+        kind = rng.random()
+        if depth and kind < 0.1:
+            record[key] = _record(rng, keys[: len(keys) // 2], depth - 1)
+        elif depth and kind < 0.15:
+            record[key] = [
+                _record(rng, keys[: len(keys) // 3], depth - 1) for _ in range(3)
+            ]
+        elif kind < 0.6:
+            record[key] = rng.randint(0, 1 << 31)
+        else:
+            record[key] = " ".join(rng.choices(WORDS, k=3))
+    return record
+
+
+def generate_document(records: int, *, seed: int = 0) -> str:
+    """Generate the JSON text of a page of records."""
+    rng = random.Random(seed)
+    keys = _schema(rng, 24)
+    data = [_record(rng, keys, 2) for _ in range(records)]
+    return json.dumps({"page_info": {"total_count": records}, "data_items": data})
+
+
+def _convert_recursive(obj: object) -> object:
+    if isinstance(obj, dict):
+        converted = {}
+        for key, value in obj.items():
+            try:
+                new_key = naming(key).to("camel")
+            except UnrecognizedNamingConventionError:
+                new_key = key
+            converted[new_key] = _convert_recursive(value)
+        return converted
+    if isinstance(obj, list):
+        return [_convert_recursive(value) for value in obj]
+    return obj
+
+
+def _time(func: Callable[[object], object], text: str, rounds: int) -> float:
+    # Each round converts a freshly decoded document, like a service does.
+    best = float("inf")
+    for _ in range(rounds):
+        data = json.loads(text)
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmarks and print the throughput of each method."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    text = generate_document(args.records)
+    size_mb = len(text) / 1e6
+    data = json.loads(text)
+    assert convert_keys(data, "camel") == _convert_recursive(data)
+    print(f"document: {size_mb:.1f} MB")
+
+    enable_cache()
+    timings = {"json.loads": _time(lambda _: json.loads(text), text, args.rounds)}
+    timings["recursive naming().to()"] = _time(_convert_recursive, text, args.rounds)
+    disable_cache()
+    clear_key_cache()
+    timings["convert_keys"] = _time(
+        lambda data: convert_keys(data, "camel"), text, args.rounds
+    )
+    timings["convert_keys in place"] = _time(
+        lambda data: convert_keys(data, "camel", copy=False), text, args.rounds
+    )
+    encoded = text.encode()
+    timings["rewrite_json"] = _time(
+        lambda _: rewrite_json(io.BytesIO(encoded), io.BytesIO(), "camel"),
+        text,
+        args.rounds,
+    )
+
+    baseline = timings["recursive naming().to()"]
+    for name, seconds in timings.items():
+        print(
+            f"{name:<25} {seconds * 1e3:>8.1f} ms {size_mb / seconds:>8.1f} MB/s "
+            f"{baseline / seconds:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
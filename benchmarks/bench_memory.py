@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Memory per identifier of the identifier representations.
+
+Usage:
+    python benchmarks/bench_memory.py [--count N]
+"""
+
+import argparse
+import random
+import tracemalloc
+from collections.abc import Callable
+
+from nomage import naming
+from nomage.table import CompactIdentifier, IdentifierTable
+
+WORDS = (
+    "id user name get set value item list count index key data file path http "
+    "server request response handler config error message type size max min"
+).split()
+CONVENTIONS = ("camel", "snake", "pascal", "CONSTANT_CASE", "kebab")
+
+
+def _id_strs(count: int) -> list[str]:
+    rng = random.Random(0)
+    return [
+        naming("_".join(rng.choices(WORDS, k=rng.randint(1, 4)))).to(
+            rng.choice(CONVENTIONS)
+        )
+        for _ in range(count)
+    ]
+
+
+def _bytes_per_identifier(build: Callable[[], object], count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def main() -> None:
+    """Measure and print the bytes per identifier of each representation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    id_strs = _id_strs(args.count)
+    representations: dict[str, Callable[[], object]] = {
+        "list[Identifier]": lambda: [naming(id_str) for id_str in id_strs],
+        "list[CompactIdentifier]": lambda: [
+            CompactIdentifier.from_identifier(naming(id_str)) for id_str in id_strs
+        ],
+        "IdentifierTable": lambda: IdentifierTable.from_strings(id_strs),
+    }
+    print(f"{'representation':<24} {'bytes/identifier':>16}")
+    for name, build in representations.items():
+        print(f"{name:<24} {_bytes_per_identifier(build, args.count):>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
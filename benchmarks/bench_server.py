@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Latency of the one-shot CLI against the client of a running `nomage serve`.
+
+Usage:
+    python benchmarks/bench_server.py [--runs N] [--requests N]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+COMMAND = [sys.executable, "-m", "nomage", "myHttpServer", "--to", "snake"]
+
+
+def _cli_ms(socket_path: str, runs: int) -> float:
+    env = {**os.environ, "NOMAGE_SOCKET": socket_path}
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(COMMAND, env=env, check=True, capture_output=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e3
+
+
+def _request_us(socket_path: str, requests: int) -> float:
+    request = {"id": 1, "method": "convert"}
+    request["params"] = {"identifier": "myHttpServer", "to": "snake"}
+    line = json.dumps(request).encode() + b"\n"
+    times = []
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        reader = sock.makefile("rb")
+        for _ in range(requests):
+            start = time.perf_counter()
+            sock.sendall(line)
+            reader.readline()
+            times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1e6
+
+
+def _wait_for(path: Path, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        if time.monotonic() > deadline:
+            msg = f"server did not start on {path}"
+            raise TimeoutError(msg)
+        time.sleep(0.01)
+
+
+def main() -> None:
+    """Run the benchmarks and print the median latencies."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    one_shot = _cli_ms("", args.runs)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "nomage.sock"
+        server = subprocess.Popen(  # noqa: S603
+            [sys.executable, "-m", "nomage", "serve", "--socket", str(path)],
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_for(path)
+            client = _cli_ms(str(path), args.runs)
+            request = _request_us(str(path), args.requests)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"one-shot CLI:            {one_shot:8.1f} ms")
+    print(f"CLI client to server:    {client:8.1f} ms")
+    print(f"request on a connection: {request:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Scaling of bulk conversion with the number of threads.
+
+Converts a corpus of identifiers with `convert_many` in the calling thread, then
+with `convert_many_threaded` on 1 to N threads, and prints the throughput and the
+speedup of each run. Threads only scale on free-threaded builds of Python, like
+`python3.13t`, where the GIL is disabled. With the GIL, the runs give the overhead
+of the pool instead.
+
+Usage:
+    python benchmarks/bench_threads.py [--size N] [--max-threads N] [--chunksize N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+
+from corpus import generate_corpus
+
+from nomage import convert_many
+from nomage.naming import ConversionResult
+from nomage.parallel import convert_many_threaded, gil_enabled
+
+
+def _time(results: Iterator[ConversionResult], size: int) -> float:
+    start = time.perf_counter()
+    deque(results, maxlen=0)
+    return size / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the benchmarks and print the throughput for each number of threads."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--max-threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=1024)
+    args = parser.parse_args()
+
+    id_strs = [id_str for id_str, _ in generate_corpus(args.size)]
+    gil = "enabled" if gil_enabled() else "disabled"
+    print(f"Python {sys.version.split()[0]}, GIL {gil}, {os.cpu_count()} CPUs")
+    baseline = _time(convert_many(id_strs, "snake"), args.size)
+    print(f"{'convert_many':<28} {baseline:12,.0f} ids/s {1:6.2f}x")
+    threads = 1
+    while threads <= args.max_threads:
+        rate = _time(
+            convert_many_threaded(
+                id_strs, "snake", jobs=threads, chunksize=args.chunksize
+            ),
+            args.size,
+        )
+        name = f"convert_many_threaded, {threads}"
+        print(f"{name:<28} {rate:12,.0f} ids/s {rate / baseline:6.2f}x")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Microbenchmarks of the built-in parsers against their former implementation.
+
+Usage:
+    python benchmarks/bench_tokenizer.py [--number N]
+"""
+
+import argparse
+import re
+import timeit
+from collections.abc import Callable
+
+from nomage.tokenizer import (
+    Tokenizer,
+    split_none,
+    split_on_case,
+    split_on_hyphen,
+    split_on_underscore,
+)
+
+# Parsers of the built-in conventions before the tokenizer
+LEGACY_PARSERS = {
+    "camelCase": lambda id_str: tuple(
+        re.sub(r"([A-Z])", r" \1", id_str).lower().split()
+    ),
+    "snake_case": lambda id_str: tuple(id_str.lower().split("_")),
+    "kebab-case": lambda id_str: tuple(id_str.lower().split("-")),
+    "flatcase": lambda id_str: (id_str.lower(),),
+}
+TOKENIZERS = {
+    "camelCase": split_on_case,
+    "snake_case": split_on_underscore,
+    "kebab-case": split_on_hyphen,
+    "flatcase": split_none,
+    "Tokenizer": Tokenizer(".", case_boundary=True),
+}
+LEGACY_PARSERS["Tokenizer"] = lambda id_str: tuple(
+    w
+    for part in id_str.split(".")
+    for w in re.sub(r"([A-Z])", r" \1", part).lower().split()
+)
+SAMPLES = {
+    "camelCase": "myHttpServerRequestHandler",
+    "snake_case": "MY_HTTP_SERVER_REQUEST_HANDLER",
+    "kebab-case": "my-http-server-request-handler",
+    "flatcase": "myhttpserverrequesthandler",
+    "Tokenizer": "my.httpServer.requestHandler",
+}
+
+
+def _per_call_ns(
+    parser: Callable[[str], tuple[str, ...]], sample: str, number: int
+) -> float:
+    timer = timeit.Timer("parser(sample)", globals={"parser": parser, "sample": sample})
+    return min(timer.repeat(repeat=5, number=number)) * 1e9 / number
+
+
+def main() -> None:
+    """Run the microbenchmarks and print the per-call time of each parser."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'parser':<12} {'legacy (ns)':>12} {'tokenizer (ns)':>15} {'speedup':>8}")
+    for name, sample in SAMPLES.items():
+        legacy, tokenizer = LEGACY_PARSERS[name], TOKENIZERS[name]
+        assert legacy(sample) == tokenizer(sample)
+        legacy_ns = _per_call_ns(legacy, sample, args.number)
+        tokenizer_ns = _per_call_ns(tokenizer, sample, args.number)
+        print(
+            f"{name:<12} {legacy_ns:>12.0f} {tokenizer_ns:>15.0f} "
+            f"{legacy_ns / tokenizer_ns:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Microbenchmarks of compiled converters against `naming(x).to(target)`.
+
+For each of the 10x10 pairs of built-in conventions, converts the same sample
+identifier with `naming(x).to(target)`, with the parse-then-render round trip of
+the conventions, and with the function of `compile_converter(source, target)`.
+The cache is disabled, so `naming` detects the convention on every call.
+
+Usage:
+    python benchmarks/bench_transcode.py [--number N]
+"""
+
+import argparse
+import statistics
+import timeit
+from collections.abc import Callable
+
+from corpus import conventions
+
+from nomage import compile_converter, naming
+
+COMPONENTS = ("my", "http", "server", "v2")
+
+
+def _per_call_ns(func: Callable[[str], str], sample: str, number: int) -> float:
+    timer = timeit.Timer("func(sample)", globals={"func": func, "sample": sample})
+    return min(timer.repeat(repeat=5, number=number)) * 1e9 / number
+
+
+def main() -> None:
+    """Run the microbenchmarks and print the per-call time of each pair."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    ncs = conventions()
+    print(
+        f"{'source':<17} {'target':<17} {'to() (ns)':>10} "
+        f"{'round trip':>11} {'compiled':>9} {'speedup':>8}"
+    )
+    speedups = []
+    for source_name, source in ncs.items():
+        sample = source.converter(COMPONENTS)
+        for target_name, target in ncs.items():
+            convert = compile_converter(source, target)
+            expected = naming(sample).to(target)
+            assert convert(sample) == expected, (source_name, target_name)
+            naming_ns = _per_call_ns(
+                lambda x, t=target: naming(x).to(t), sample, args.number
+            )
+            round_trip_ns = _per_call_ns(
+                lambda x, s=source, t=target: t.converter(s.parser(x)),
+                sample,
+                args.number,
+            )
+            compiled_ns = _per_call_ns(convert, sample, args.number)
+            speedups.append(naming_ns / compiled_ns)
+            print(
+                f"{source_name:<17} {target_name:<17} {naming_ns:>10.0f} "
+                f"{round_trip_ns:>11.0f} {compiled_ns:>9.0f} "
+                f"{speedups[-1]:>7.2f}x"
+            )
+    print(f"geometric mean speedup: {statistics.geometric_mean(speedups):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Realistic identifier corpora for the benchmarks.
+
+Identifiers are built from common programming words, in every built-in naming
+convention, plus a share of identifiers matching none of them.
+
+Usage:
+    python benchmarks/corpus.py [--size N] [--seed N]
+"""
+
+import argparse
+import random
+
+from nomage import NamingConvention, builtins_conventions
+
+WORDS = (
+    "id user name get set value item list count index key data file path http "
+    "server request response handler config error message type size max min "
+    "is has to from parse load save cache node tree map buffer stream token "
+    "query result status client session v2 utf8 x y"
+).split()
+
+# Each of these turns a valid identifier into one matching no built-in convention.
+_MANGLERS = (
+    lambda s: f"_{s}",
+    lambda s: f"{s}_",
+    lambda s: f"{s}__{s}",
+    lambda s: f"{s}-x_y",
+    lambda s: f"9{s}",
+    lambda s: f"{s}.{s}",
+    lambda s: f"{s} {s}",
+)
+
+
+def conventions() -> dict[str, NamingConvention]:
+    """Get the distinct built-in conventions by their first name."""
+    return {nc.names[0]: nc for nc in builtins_conventions().values()}
+
+
+def generate_corpus(
+    size: int, *, seed: int = 0, unrecognized_ratio: float = 0.1
+) -> list[tuple[str, str | None]]:
+    """
+    Generate identifiers in every built-in naming convention.
+
+    Args:
+        size: The number of identifiers.
+        seed: The seed of the random generator, for reproducible corpora.
+        unrecognized_ratio: The share of identifiers matching no convention.
+
+    Returns:
+        Pairs of identifiers and of the first name of the convention they were
+        generated in, or None for unrecognizable ones.
+    """
+    rng = random.Random(seed)
+    ncs = list(conventions().values())
+    corpus: list[tuple[str, str | None]] = []
+    for _ in range(size):
+        components = tuple(rng.choices(WORDS, k=rng.randint(1, 4)))
+        nc = rng.choice(ncs)
+        id_str = nc.converter(components)
+        if rng.random() < unrecognized_ratio:
+            corpus.append((rng.choice(_MANGLERS)(id_str), None))
+        else:
+            corpus.append((id_str, nc.names[0]))
+    return corpus
+
+
+def main() -> None:
+    """Print a generated corpus, one identifier per line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for id_str, _ in generate_corpus(args.size, seed=args.seed):
+        print(id_str)
+
+
+if __name__ == "__main__":
+    main()
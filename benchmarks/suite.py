@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Benchmark suite of Nomage, with JSON baselines and regression gating.
+
+Measures detection latency per convention, conversion throughput per convention,
+convention lookup cost, memory per identifier and CLI cold start, on a generated
+corpus (see `corpus.py`).
+
+Usage:
+    python benchmarks/suite.py run [--output FILE] [--size N]
+    python benchmarks/suite.py compare BASELINE CURRENT [--tolerance RATIO]
+    python benchmarks/suite.py ab BASELINE_SRC [--output FILE] [--tolerance RATIO]
+
+`compare` exits with status 1 when a metric regressed by more than the tolerance.
+Timings depend on the machine, and on its load: `ab` runs the rounds of the suite
+alternately on the sources of a baseline, like another revision checked out by
+`make bench`, and on the current ones, then compares them, with the same exit status.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from corpus import conventions, generate_corpus
+
+import nomage
+from nomage import builtins_conventions, naming
+from nomage.exceptions import UnrecognizedNamingConventionError
+
+DEFAULT_TOLERANCE = 0.3
+# Units of metrics where higher is better, others are lower is better.
+THROUGHPUT_UNITS = ("ops/s",)
+
+Metrics = dict[str, dict[str, Any]]
+
+
+def _best_ns_per_call(
+    func: Callable[[Any], object], inputs: list[Any], repeat: int = 9
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for value in inputs:
+            func(value)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / len(inputs)
+
+
+def _detect(id_str: str) -> object:
+    try:
+        return naming(id_str)
+    except UnrecognizedNamingConventionError:
+        return None
+
+
+def bench_detection(corpus: list[tuple[str, str | None]]) -> Metrics:
+    """Measure the detection latency of identifiers, per convention."""
+    by_convention: dict[str, list[str]] = {}
+    for id_str, name in corpus:
+        by_convention.setdefault(name or "unrecognized", []).append(id_str)
+    return {
+        f"detect.{name}": {"value": _best_ns_per_call(_detect, id_strs), "unit": "ns"}
+        for name, id_strs in sorted(by_convention.items())
+    }
+
+
+def bench_conversion(corpus: list[tuple[str, str | None]]) -> Metrics:
+    """Measure the conversion throughput of identifiers, per target convention."""
+    identifiers = [naming(id_str) for id_str, name in corpus if name is not None]
+    metrics = {}
+    for name, nc in conventions().items():
+        ns = _best_ns_per_call(lambda identifier, nc=nc: identifier.to(nc), identifiers)
+        metrics[f"convert.{name}"] = {"value": 1e9 / ns, "unit": "ops/s"}
+    return metrics
+
+
+def bench_lookup() -> Metrics:
+    """Measure the lookup cost of conventions by name."""
+    ncs = builtins_conventions()
+    names = {
+        "exact": [nc.names[0] for nc in conventions().values()],
+        "loose": ["snake", "Pascal-Case", "kebab_case", "CONSTANT", "train"],
+        "missing": ["unknown", "snack", "pascal-snake"],
+    }
+    return {
+        f"lookup.{kind}": {
+            "value": _best_ns_per_call(ncs.get, keys * 200),
+            "unit": "ns",
+        }
+        for kind, keys in names.items()
+    }
+
+
+def bench_memory(corpus: list[tuple[str, str | None]]) -> Metrics:
+    """Measure the memory per parsed identifier."""
+    id_strs = [id_str for id_str, name in corpus if name is not None]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    identifiers = [naming(id_str) for id_str in id_strs]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del identifiers
+    return {
+        "memory.identifier": {"value": (after - before) / len(id_strs), "unit": "bytes"}
+    }
+
+
+def bench_cli(runs: int) -> Metrics:
+    """Measure the cold start of the CLI, without server."""
+    command = [sys.executable, "-m", "nomage", "myHttpServer", "--to", "snake"]
+    env = {**os.environ, "NOMAGE_SOCKET": ""}
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, capture_output=True)  # noqa: S603
+        times.append(time.perf_counter() - start)
+    return {"cli.cold_start": {"value": statistics.median(times) * 1e3, "unit": "ms"}}
+
+
+def _best(metrics: Metrics, other: Metrics) -> Metrics:
+    best = {}
+    for name, metric in metrics.items():
+        pick = max if metric["unit"] in THROUGHPUT_UNITS else min
+        best[name] = {**metric, "value": pick(metric["value"], other[name]["value"])}
+    return best
+
+
+def run(size: int, cli_runs: int, rounds: int) -> dict[str, Any]:
+    """
+    Run all the benchmarks.
+
+    The whole suite runs several rounds and the best value of each metric is kept,
+    which smooths out the noise of the machine better than longer measurements.
+    """
+    corpus = generate_corpus(size)
+    metrics: Metrics = {}
+    for _ in range(rounds):
+        round_metrics: Metrics = {}
+        round_metrics |= bench_detection(corpus)
+        round_metrics |= bench_conversion(corpus)
+        round_metrics |= bench_lookup()
+        round_metrics |= bench_memory(corpus)
+        round_metrics |= bench_cli(cli_runs)
+        metrics = _best(metrics, round_metrics) if metrics else round_metrics
+    return {
+        "environment": {
+            "nomage": nomage.__version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "node": platform.node(),
+        },
+        "corpus_size": size,
+        "metrics": metrics,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float
+) -> list[str]:
+    """
+    Compare results with a baseline.
+
+    Returns:
+        The names of the metrics which regressed by more than the tolerance.
+    """
+    regressions = []
+    print(f"{'metric':<34} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, metric in current["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if base is None:
+            print(f"{name:<34} {'-':>12} {metric['value']:>12.1f}")
+            continue
+        change = metric["value"] / base["value"] - 1
+        if metric["unit"] in THROUGHPUT_UNITS:
+            change = -change
+        regressed = change > tolerance
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<34} {base['value']:>12.1f} {metric['value']:>12.1f} "
+            f"{change:>+7.0%}{' REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def ab(
+    baseline_src: str, size: int, cli_runs: int, rounds: int
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Run the suite on the sources of a baseline and on the current ones.
+
+    Each round runs once on each side, in turn, in a new process, so that both see
+    the same changes of the load of the machine. The median value of each metric
+    is kept: unlike the best one, it does not favor the side which ran during a
+    quiet moment of the machine.
+
+    Returns:
+        The results of the baseline and the current ones.
+    """
+    rounds_results: list[list[dict[str, Any]]] = [[], []]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output = str(Path(tmp_dir) / "results.json")
+        for _ in range(rounds):
+            for side, src in enumerate((baseline_src, None)):
+                env = dict(os.environ)
+                if src is not None:
+                    paths = [str(Path(src).resolve()), env.get("PYTHONPATH", "")]
+                    env["PYTHONPATH"] = os.pathsep.join(filter(None, paths))
+                command = [sys.executable, __file__, "run", "--rounds", "1"]
+                command += ["--size", str(size), "--cli-runs", str(cli_runs)]
+                subprocess.run(  # noqa: S603
+                    [*command, "--output", output],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                )
+                rounds_results[side].append(_load(output))
+    baseline, current = (_median(side_results) for side_results in rounds_results)
+    return baseline, current
+
+
+def _median(results: list[dict[str, Any]]) -> dict[str, Any]:
+    metrics = {
+        name: {
+            **metric,
+            "value": statistics.median(r["metrics"][name]["value"] for r in results),
+        }
+        for name, metric in results[0]["metrics"].items()
+    }
+    return {**results[0], "metrics": metrics}
+
+
+def _print(results: dict[str, Any]) -> None:
+    for name, metric in results["metrics"].items():
+        print(f"{name:<34} {metric['value']:>12.1f} {metric['unit']}")
+
+
+def _save(results: dict[str, Any], path: str | None) -> None:
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+def _load(path: str) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def main(args: Iterable[str] | None = None) -> None:
+    """Run the benchmarks, or compare results with a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", help="save the results as JSON")
+    run_parser.add_argument("--size", type=int, default=10_000)
+    run_parser.add_argument("--cli-runs", type=int, default=10)
+    run_parser.add_argument("--rounds", type=int, default=3)
+    compare_parser = commands.add_parser("compare", help="compare with a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    ab_parser = commands.add_parser(
+        "ab", help="run alternately on baseline sources, and compare"
+    )
+    ab_parser.add_argument("baseline_src", help="directory of the baseline package")
+    ab_parser.add_argument("-o", "--output", help="save the current results as JSON")
+    ab_parser.add_argument("--size", type=int, default=10_000)
+    ab_parser.add_argument("--cli-runs", type=int, default=10)
+    ab_parser.add_argument("--rounds", type=int, default=5)
+    for command_parser in (compare_parser, ab_parser):
+        command_parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help="allowed relative slowdown (default: %(default)s)",
+        )
+    parsed = parser.parse_args(args)
+
+    if parsed.command == "run":
+        results = run(parsed.size, parsed.cli_runs, parsed.rounds)
+        _print(results)
+        _save(results, parsed.output)
+        return
+
+    if parsed.command == "ab":
+        baseline, current = ab(
+            parsed.baseline_src, parsed.size, parsed.cli_runs, parsed.rounds
+        )
+        _save(current, parsed.output)
+    else:
+        baseline, current = _load(parsed.baseline), _load(parsed.current)
+    # The version of nomage is expected to differ, other changes skew the results.
+    environments = (
+        {k: v for k, v in results["environment"].items() if k != "nomage"}
+        for results in (baseline, current)
+    )
+    if next(environments) != next(environments):
+        print("warning: results come from different environments", file=sys.stderr)
+    regressions = compare(baseline, current, parsed.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
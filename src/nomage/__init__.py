@@ -24,16 +24,87 @@ Examples:
     'my-identifier'
 """
 
-from importlib.metadata import PackageNotFoundError, version
+import sys
+from importlib import import_module
+from types import ModuleType
 
-from ._builtins import builtins_conventions
-from .convention import NamingConvention
-from .naming import Identifier, naming
+# `typing` is slow to import, and only needed by type checkers.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
 
-__all__ = ["Identifier", "NamingConvention", "builtins_conventions", "naming"]
+    from ._builtins import builtins_conventions
+    from .convention import NamingConvention
+    from .naming import (
+        Identifier,
+        compile_converter,
+        convert_many,
+        naming,
+        naming_many,
+    )
+    from .registry import ConventionRegistry
 
-try:
-    __version__ = version(__name__)
-except PackageNotFoundError:  # pragma: no cover
-    # package is not installed
-    __version__ = "undefined"
+__all__ = [
+    "ConventionRegistry",
+    "Identifier",
+    "NamingConvention",
+    "builtins_conventions",
+    "compile_converter",
+    "convert_many",
+    "naming",
+    "naming_many",
+]
+
+# Modules of the exports, only imported on first access, so that the thin client
+# of the `nomage` command does not load the library.
+_EXPORTS = {
+    "ConventionRegistry": ".registry",
+    "Identifier": ".naming",
+    "NamingConvention": ".convention",
+    "builtins_conventions": "._builtins",
+    "compile_converter": ".naming",
+    "convert_many": ".naming",
+    "naming": ".naming",
+    "naming_many": ".naming",
+}
+
+
+def __getattr__(name: str) -> "Any":  # noqa: ANN401
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    # `importlib.metadata` is slow to import, only look the version up on demand.
+    if name == "__version__":
+        from importlib.metadata import (  # noqa: PLC0415
+            PackageNotFoundError,
+            version,
+        )
+
+        try:
+            __version__ = version(__name__)
+        except PackageNotFoundError:  # pragma: no cover
+            # package is not installed
+            __version__ = "undefined"
+        globals()["__version__"] = __version__
+        return __version__
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
+
+class _Package(ModuleType):
+    """The package, whose exports are not shadowed by submodules of the same name."""
+
+    def __setattr__(self, name: str, value: object) -> None:
+        # Importing the `naming` submodule would otherwise bind it in place of the
+        # `naming` function.
+        if name in _EXPORTS and isinstance(value, ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
@@ -1,6 +1,6 @@
 """Top-level exec environment."""
 
-from ._cli import main
+from ._client import main
 
 if __name__ == "__main__":
     main()
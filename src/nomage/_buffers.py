@@ -0,0 +1,123 @@
+"""
+Nomage - matching in buffers.
+
+This module matches the str regular expressions of naming conventions against
+identifiers held in bytes-like buffers, like bytes, memoryview or mmap, without
+decoding them into a str first.
+
+Each regex gets a bytes variant, compiled from the same pattern. On ASCII text, it
+matches exactly like the str regex: Unicode and ASCII character classes only differ
+on non-ASCII characters. Regexes which can only match ASCII characters, like the
+built-in ones, also match UTF-8 text like their variant, both stop at the first
+non-ASCII character. For other regexes, identifiers with non-ASCII bytes are decoded
+as UTF-8 and matched by the str regex instead, and so are identifiers matched by
+regexes without a bytes variant. Bytes which are not valid UTF-8 never match then.
+
+Identifiers are matched in place, with the `pos` and `endpos` arguments of `re`.
+Since `^` only matches at the real beginning of the buffer, not at `pos`, the
+anchors starting the pattern or one of its top-level alternatives are dropped from
+the variant: `match` already anchors it at `pos`. Patterns with other anchors,
+anchors in groups, word boundaries or lookbehinds, which would look at the bytes
+before `pos`, have no bytes variant.
+"""
+
+import re
+import warnings
+from mmap import mmap
+from typing import TypeAlias
+
+from nomage._signature import matches_ascii_only
+
+Buffer: TypeAlias = bytes | bytearray | memoryview | mmap
+
+NON_ASCII = re.compile(rb"[\x80-\xff]")
+# Tokens of patterns: escapes, sets, group openings and inline flags.
+_PATTERN_TOKENS = re.compile(
+    r"""
+    (?P<escape>\\.)
+    | (?P<set>\[\^?\]?(?:[^\]\\]|\\.)*\])
+    | (?P<flags>\(\?[aiLmsux]+\))
+    | (?P<group>\((?!\?)|\(\?(?:[:=!>]|P<\w+>|[aiLmsux-]+:))
+    | (?P<unsupported>\(\?)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def bytes_regex(regex: re.Pattern[str]) -> tuple[re.Pattern[bytes] | None, bool]:
+    """
+    Compile the bytes variant of a str regular expression.
+
+    Args:
+        regex: The str regular expression.
+
+    Returns:
+        The bytes regular expression, or None if the pattern has non-ASCII
+        characters, or constructs the variant does not support. And whether
+        identifiers with non-ASCII bytes must be decoded rather than matched by the
+        bytes regular expression.
+    """
+    pattern = regex.pattern
+    if (
+        not isinstance(pattern, str)
+        or not pattern.isascii()
+        or regex.flags & re.VERBOSE
+    ):
+        return None, True
+    anchored = _drop_leading_anchors(pattern)
+    if anchored is None:
+        return None, True
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            compiled = re.compile(anchored.encode("ascii"), regex.flags & ~re.UNICODE)
+    except (re.error, ValueError, DeprecationWarning, FutureWarning):
+        return None, True
+    return compiled, not matches_ascii_only(regex)
+
+
+def _drop_leading_anchors(pattern: str) -> str | None:  # noqa: C901
+    parts = []
+    # Whether the current position is the start of the match: at the start of the
+    # pattern, or of one of its top-level alternatives. Anchors in groups, which
+    # may be repeated or follow other text, are not dropped.
+    leading = True
+    depth = 0
+    pos = 0
+    while pos < len(pattern):
+        m = _PATTERN_TOKENS.match(pattern, pos)
+        kind = None if m is None else m.lastgroup
+        item = pattern[pos] if m is None else m[0]
+        pos += len(item)
+        if item in {"^", "\\A"}:
+            if not leading or depth:
+                return None
+            continue
+        if kind == "group":
+            depth += 1
+            leading = False
+        elif kind == "unsupported":
+            # Lookbehinds, conditionals and group references.
+            return None
+        elif kind == "escape" and item[1] in "bB0123456789":
+            # Word boundaries and group references.
+            return None
+        elif item == "|":
+            leading = not depth
+        elif item == ")":
+            if not depth:
+                return None
+            depth -= 1
+            leading = False
+        elif kind != "flags" and item not in {"$", "\\Z"}:
+            leading = False
+        parts.append(item)
+    return "".join(parts)
+
+
+def decode(data: Buffer, start: int, end: int) -> str | None:
+    """Decode a span of a buffer as UTF-8, None if it is not valid UTF-8."""
+    try:
+        return str(memoryview(data)[start:end], "utf-8")
+    except UnicodeDecodeError:
+        return None
@@ -7,74 +7,151 @@ function `builtins_conventions` as a mapping for looking up conventions by their
 """
 
 import re
-from collections.abc import Iterator, Mapping, Sequence
+from collections.abc import Callable, Mapping
+from functools import partial
 
 from nomage.convention import NamingConvention
+from nomage.registry import ConventionRegistry
+from nomage.tokenizer import (
+    split_none,
+    split_on_case,
+    split_on_hyphen,
+    split_on_underscore,
+)
 
+# Components are in lower case, so the "lower" case has nothing to apply.
+_CASE_FUNCTIONS: Mapping[str, Callable[[str], str]] = {
+    "upper": str.upper,
+    "capitalize": str.capitalize,
+}
+
+
+def _join_upper(separator: str, components: tuple[str, ...]) -> str:
+    return separator.join(components).upper()
+
+
+def _join_cased(
+    separator: str,
+    first: Callable[[str], str] | None,
+    rest: Callable[[str], str] | None,
+    components: tuple[str, ...],
+) -> str:
+    if first is rest:
+        return separator.join(components if rest is None else map(rest, components))
+    if not components:
+        return ""
+    return separator.join(
+        (
+            components[0] if first is None else first(components[0]),
+            *(components[1:] if rest is None else map(rest, components[1:])),
+        )
+    )
 
-class _NamingConventionMap(Mapping[str, NamingConvention]):
-    def __init__(self, conventions: Sequence[NamingConvention], /) -> None:
-        self._size = len(conventions)
-        self._map, self._index = self._compute(conventions)
-
-    def __getitem__(self, key: str) -> NamingConvention:
-        return self._index[NamingConvention.get_name_index(key)]
-
-    def __len__(self) -> int:
-        return self._size
-
-    def __iter__(self) -> Iterator[str]:
-        return iter(self._map)
 
-    def _compute(
-        self, items: Sequence[NamingConvention]
-    ) -> tuple[Mapping[str, NamingConvention], Mapping[str, NamingConvention]]:
-        items_map: dict[str, NamingConvention] = {}
-        items_index: dict[str, NamingConvention] = {}
-        for nc in items:
-            for name in nc.names:
-                items_map[name] = nc
-                items_index[NamingConvention.get_name_index(name)] = nc
-        return items_map, items_index
+class _Joiner(partial[str]):
+    """
+    Converter joining components with a separator, after applying a case to them.
 
+    The case of the first component can differ from the case of the others, like
+    for camelCase. Unlike lambdas, joiners can be pickled, and expose how they
+    render components so that work can be shared between conventions. Joiners are
+    partial applications of C functions when they can, like `str.join` for lower
+    cases, so that calling them costs no Python frame.
+    """
 
-_BUILTINS_CONVENTIONS: Mapping[str, NamingConvention] = _NamingConventionMap(
+    __slots__ = ("first_case", "rest_case", "separator")
+
+    first_case: str
+    rest_case: str
+    separator: str
+
+    def __new__(  # noqa: PYI034
+        cls, separator: str, first_case: str, rest_case: str
+    ) -> "_Joiner":
+        """
+        Create a joiner.
+
+        Args:
+            separator: The separator of the components.
+            first_case: The case of the first component.
+            rest_case: The case of the other components.
+
+        Returns:
+            The joiner.
+        """
+        if first_case == rest_case == "lower":
+            joiner = super().__new__(cls, str.join, separator)
+        elif first_case == rest_case == "upper" and separator.upper() == separator:
+            # Upper-casing the joined string is a single call, not one per component.
+            joiner = super().__new__(cls, _join_upper, separator)
+        else:
+            joiner = super().__new__(
+                cls,
+                _join_cased,
+                separator,
+                _CASE_FUNCTIONS.get(first_case),
+                _CASE_FUNCTIONS.get(rest_case),
+            )
+        joiner.separator = separator
+        joiner.first_case = first_case
+        joiner.rest_case = rest_case
+        return joiner
+
+    def __reduce__(self) -> tuple[type["_Joiner"], tuple[str, str, str]]:
+        return (_Joiner, (self.separator, self.first_case, self.rest_case))
+
+    def render(
+        self, components: tuple[str, ...], cased: Mapping[str, tuple[str, ...]]
+    ) -> str:
+        """Render components, reusing their precomputed cased variants."""
+        rest = cased[self.rest_case]
+        if self.first_case == self.rest_case or not components:
+            return self.separator.join(rest)
+        return self.separator.join((cased[self.first_case][0], *rest[1:]))
+
+    def __repr__(self) -> str:
+        return f"_Joiner({self.separator!r}, {self.first_case!r}, {self.rest_case!r})"
+
+
+def _case_components(components: tuple[str, ...]) -> dict[str, tuple[str, ...]]:
+    """Compute all the cased variants of components, for `_Joiner.render`."""
+    cased = {"lower": components}
+    for case, func in _CASE_FUNCTIONS.items():
+        cased[case] = tuple(map(func, components))
+    return cased
+
+
+_BUILTINS_CONVENTIONS = ConventionRegistry._shared_registry(  # noqa: SLF001
     (
         NamingConvention(
             names=("flatcase", "lowercase"),
             match_regex=re.compile(r"^[a-z][a-z0-9]*$"),
-            parser=lambda id_str: (id_str.lower(),),
-            converter=lambda components: "".join(components),
+            parser=split_none,
+            converter=_Joiner("", "lower", "lower"),
         ),
         NamingConvention(
             names=("UPPERCASE", "SCREAMINGCASE"),
             match_regex=re.compile(r"^[A-Z][A-Z0-9]*$"),
-            parser=lambda id_str: (id_str.lower(),),
-            converter=lambda components: "".join(components).upper(),
+            parser=split_none,
+            converter=_Joiner("", "upper", "upper"),
         ),
         NamingConvention(
             names=("camelCase", "dromedaryCase"),
             match_regex=re.compile(r"^[a-z][a-zA-Z0-9]*$"),
-            parser=lambda id_str: tuple(
-                re.sub(r"([A-Z])", r" \1", id_str).lower().split()
-            ),
-            converter=lambda components: "".join(
-                [components[0], *(w.capitalize() for w in components[1:])]
-            ),
+            parser=split_on_case,
+            converter=_Joiner("", "lower", "capitalize"),
         ),
         NamingConvention(
             names=("PascalCase", "UpperCamelCase", "StudlyCase"),
             match_regex=re.compile(r"^[A-Z][a-zA-Z0-9]*$"),
-            parser=lambda id_str: tuple(
-                re.sub(r"([A-Z])", r" \1", id_str).lower().split()
-            ),
-            converter=lambda components: "".join(w.capitalize() for w in components),
+            parser=split_on_case,
+            converter=_Joiner("", "capitalize", "capitalize"),
         ),
         NamingConvention(
             names=("snake_case", "snail_case", "pothole_case"),
             match_regex=re.compile(r"^[a-z][a-z0-9]*(_[a-z][a-z0-9]*)*$"),
-            parser=lambda id_str: tuple(id_str.lower().split("_")),
-            converter=lambda components: "_".join(components),
+            parser=split_on_underscore,
+            converter=_Joiner("_", "lower", "lower"),
         ),
         NamingConvention(
             names=(
@@ -85,40 +162,43 @@ _BUILTINS_CONVENTIONS: Mapping[str, NamingConvention] = _NamingConventionMap(
                 "ENV_VAR_CASE",
             ),
             match_regex=re.compile(r"^[A-Z][A-Z0-9]*(_[A-Z][A-Z0-9]*)*$"),
-            parser=lambda id_str: tuple(id_str.lower().split("_")),
-            converter=lambda components: "_".join(w.upper() for w in components),
+            parser=split_on_underscore,
+            converter=_Joiner("_", "upper", "upper"),
         ),
         NamingConvention(
             names=("camel_Snake_Case",),
             match_regex=re.compile(r"^[a-z]+[a-z0-9]*(_[A-Z]+[a-z0-9]*)*$"),
-            parser=lambda id_str: tuple(id_str.lower().split("_")),
-            converter=lambda components: "_".join(
-                [components[0], *(w.capitalize() for w in components[1:])]
-            ),
+            parser=split_on_underscore,
+            converter=_Joiner("_", "lower", "capitalize"),
         ),
         NamingConvention(
             names=("kebab-case", "dash-case", "lisp-case", "spinal-case"),
             match_regex=re.compile(r"^[a-z][a-z0-9]*(-[a-z][a-z0-9]*)*$"),
-            parser=lambda id_str: tuple(id_str.lower().split("-")),
-            converter=lambda components: "-".join(components),
+            parser=split_on_hyphen,
+            converter=_Joiner("-", "lower", "lower"),
         ),
         NamingConvention(
             names=("COBOL-CASE", "SCREAMING-TRAIN-CASE", "SCREAMING-KEBAB-CASE"),
             match_regex=re.compile(r"^[A-Z][A-Z0-9]*(-[A-Z][A-Z0-9]*)*$"),
-            parser=lambda id_str: tuple(id_str.lower().split("-")),
-            converter=lambda components: "-".join(w.upper() for w in components),
+            parser=split_on_hyphen,
+            converter=_Joiner("-", "upper", "upper"),
         ),
         NamingConvention(
             names=("Train-Case", "Http-Header-Case"),
             match_regex=re.compile(r"^[A-Z]+[a-z0-9]*(-[A-Z]+[a-z0-9]*)*$"),
-            parser=lambda id_str: tuple(id_str.lower().split("-")),
-            converter=lambda components: "-".join(w.capitalize() for w in components),
+            parser=split_on_hyphen,
+            converter=_Joiner("-", "capitalize", "capitalize"),
         ),
     )
 )
 
 
-def builtins_conventions() -> Mapping[str, NamingConvention]:
+def _builtin_convention(name: str) -> NamingConvention | None:
+    """Get a built-in convention by name, used to unpickle them by reference."""
+    return _BUILTINS_CONVENTIONS.get(name)
+
+
+def builtins_conventions() -> ConventionRegistry:
     """
     Provide collection of common naming convention as a mapping for lookup by name.
 
@@ -144,7 +224,11 @@ def builtins_conventions() -> Mapping[str, NamingConvention]:
         >>> conventions.get("snake") == conventions.get("Snake-Case")
         True
 
+        The registry is shared, copy it to register custom conventions.
+
+        >>> registry = conventions.copy()
+
     Returns:
-        A mapping with str keys and NamingConvention values.
+        A registry with str keys and NamingConvention values.
     """
     return _BUILTINS_CONVENTIONS
@@ -15,25 +15,83 @@ Examples:
     Not matching convention: Train-Case / Http-Header-Case
     $ nomage MyIdentifier --to snake
     my_identifier
+    $ nomage -- json
+    Detected: flatcase / lowercase
     $ nomage MyIdentifier --to snack
     Unrecognized naming convention: snack
+    $ nomage MyIdentifier --to snake,kebab
+    {"snake_case": "my_identifier", "kebab-case": "my-identifier"}
+    $ cat identifiers.txt
+    MyIdentifier
+    my-identifier
+    $ nomage --file identifiers.txt --to snake
+    my_identifier
+    my_identifier
+    $ nomage lint --rule function=snake --rule class=pascal src/
+    src/users.py:1:1: function 'getUser' is not snake_case
+    Checked 3 files (2 cached), found 1 violations
+    $ nomage rewrite --from camel --to snake src/
+    Rewrote 12 identifiers in 3 files
+    $ nomage json --to snake export.ndjson > export_snake.ndjson
+    Rewrote 1024 keys
+    $ nomage stats identifiers.txt
+    Identifiers: 2 (2 distinct), ambiguous: 0 (0.00%), unrecognized: 0 (0.00%)
+    ...
+    $ nomage --profile --file identifiers.txt --to snake
+    ...
+    step            calls  total (ms)  mean (us)  p50 (us)  p99 (us)
+    detect              2        0.01       2.50      4.10      4.10
+    ...
+    $ nomage serve --stdio
+    {"id": 1, "method": "convert", "params": {"identifier": "MyId", "to": "snake"}}
+    {"jsonrpc": "2.0", "id": 1, "result": "my_id"}
 """
 
 import argparse
+import dataclasses
+import io
+import json
 import sys
-from collections.abc import Mapping
-from importlib.metadata import metadata
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from contextlib import nullcontext
+from itertools import count, islice
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, TypeAlias
 
 from nomage._builtins import builtins_conventions
+from nomage._client import COMMANDS, default_socket_path
 from nomage.convention import NamingConvention
+from nomage.engine import get_engine
 from nomage.exceptions import (
     UnknownNamingConventionError,
     UnrecognizedNamingConventionError,
 )
-from nomage.naming import naming
+from nomage.instrument import Report, enable_instrumentation, instrumentation_info
+from nomage.naming import BUILTINS_CONVENTIONS, Identifier, _transcoder, naming
+from nomage.registry import ConventionRegistry
+
+if TYPE_CHECKING:
+    from importlib.metadata import PackageMetadata
+
+    from nomage.lint import FileLint
+    from nomage.stats import Census
+
+_STREAM_BUFFER_LINES = 8192
+_CHUNK_LINES = 1024
+
+# Outcomes of the evaluation of an identifier read from a file.
+_OK, _UNRECOGNIZED, _NOT_MATCHING = 0, 1, 2
 
+# Lines of a file: its name, the number of the first line and the stripped lines.
+_Chunk: TypeAlias = tuple[str, int, list[str]]
 
-def main(_args: list[str] | None = None, /) -> None:
+# Evaluation function of a worker process, set once by `_init_evaluator`.
+_worker_evaluate: Callable[[str], tuple[int, str]]
+
+
+def main(
+    _args: list[str] | None = None, /, registry: ConventionRegistry | None = None
+) -> None:
     """
     Entry point for the Nomage command-line interface.
 
@@ -43,33 +101,93 @@ def main(_args: list[str] | None = None, /) -> None:
 
     Args:
         _args: Optional list of arguments to parse. If None, uses sys.argv[1:].
+        registry: The conventions to detect identifiers with and look names up in,
+            for applications embedding the CLI. Defaults to the built-in conventions.
     """
+    if registry is None:
+        registry = builtins_conventions()
     if _args is None:  # pragma: no cover
         _args = sys.argv[1:]
 
+    if _args and _args[0] in COMMANDS:
+        _COMMANDS[_args[0]](_args[1:])
+    if len(_args) > 1 and _args[0] == "--profile" and _args[1] in COMMANDS:
+        _profiled(_COMMANDS[_args[1]], _args[2:])
+
     parser = create_parser()
     args = parser.parse_args(_args)
+    if args.profile:
+        _profiled(_main, args, parser, registry)
+    else:
+        _main(args, parser, registry)
+
 
+def _main(
+    args: argparse.Namespace,
+    parser: argparse.ArgumentParser,
+    registry: ConventionRegistry,
+) -> None:
     if args.version:
-        pkg_metadata = metadata(__package__)
-        print(pkg_metadata["Version"])
+        print(_package_metadata()["Version"])
         sys.exit(0)
 
+    if args.jobs < 0:
+        parser.error("argument -j/--jobs: must not be negative")
+    if args.files:
+        if args.identifier:
+            parser.error("argument identifier: not allowed with argument -f/--file")
+        _main_files(args, registry)
+    if args.jobs != 1:
+        parser.error("argument -j/--jobs: only allowed with argument -f/--file")
+
     if not args.identifier:
         parser.print_help()
         sys.exit(2)
 
+    _main_identifier(args, registry)
+
+
+def _profiled(func: Callable[..., None], *args: object) -> None:
+    enable_instrumentation()
     try:
-        id_naming = naming(args.identifier)
+        func(*args)
+    finally:
+        print(_profile_text(instrumentation_info()), file=sys.stderr)
+
+
+def _profile_text(report: Report) -> str:
+    lines = [
+        f"{'step':<10} {'calls':>10} {'total (ms)':>11} {'mean (us)':>10} "
+        f"{'p50 (us)':>9} {'p99 (us)':>9}"
+    ]
+    for phase, histogram in report.timings.items():
+        lines.append(
+            f"{phase:<10} {histogram.count:>10} {histogram.total_ns / 1e6:>11.2f} "
+            f"{histogram.mean_ns / 1e3:>10.2f} {histogram.quantile(0.5) / 1e3:>9.2f} "
+            f"{histogram.quantile(0.99) / 1e3:>9.2f}"
+        )
+    lines += ["", f"{'convention':<20} {'attempts':>10} {'hits':>10}"]
+    lines += [
+        f"{name:<20} {stats.attempts:>10} {stats.hits:>10}"
+        for name, stats in report.conventions.items()
+    ]
+    lines.append(f"{'(unrecognized)':<20} {'':>10} {report.unrecognized:>10}")
+    cache = report.cache
+    if cache.maxsize:
+        lines += ["", f"Cache: {cache.hits} hits, {cache.misses} misses"]
+    return "\n".join(lines)
+
+
+def _main_identifier(args: argparse.Namespace, registry: ConventionRegistry) -> None:
+    try:
+        id_naming = naming(args.identifier, registry)
 
         if not args.check_convention and not args.to_convention:
             print("Detected:", " / ".join(id_naming.convention.names))
 
-        conventions = builtins_conventions()
-
         if args.check_convention:
-            nc = _get_naming_convention(args.check_convention, conventions)
-            if not nc.match(str(id_naming)):
+            nc = _get_naming_convention(args.check_convention, registry)
+            if not registry.engine.check(str(id_naming), nc):
                 print(
                     "Not matching convention:",
                     " / ".join(nc.names),
@@ -78,8 +196,11 @@ def main(_args: list[str] | None = None, /) -> None:
                 sys.exit(2)
 
         if args.to_convention:
-            nc = _get_naming_convention(args.to_convention, conventions)
-            print(id_naming.to(nc))
+            targets = _get_target_conventions(args.to_convention, registry)
+            if _is_multi_target(args.to_convention):
+                print(json.dumps(id_naming.to_all(targets)))
+            else:
+                print(id_naming.to(targets[0]))
 
     except (UnknownNamingConventionError, UnrecognizedNamingConventionError) as err:
         print(str(err).capitalize(), file=sys.stderr)
@@ -88,6 +209,593 @@ def main(_args: list[str] | None = None, /) -> None:
         sys.exit(0)
 
 
+def _main_files(args: argparse.Namespace, registry: ConventionRegistry) -> None:
+    # Identifiers which are not UTF-8 are written back as they were read, and
+    # escaped in reports.
+    _set_errors(sys.stdout, "surrogateescape")
+    _set_errors(sys.stderr, "backslashreplace")
+    try:
+        check_nc = targets = None
+        if args.check_convention:
+            check_nc = _get_naming_convention(args.check_convention, registry)
+        if args.to_convention:
+            targets = _get_target_conventions(args.to_convention, registry)
+        status = _process_files(
+            args.files,
+            check_nc,
+            targets,
+            _is_multi_target(args.to_convention),
+            args.jobs,
+            tuple(registry.values()),
+        )
+    except UnknownNamingConventionError as err:
+        print(str(err).capitalize(), file=sys.stderr)
+        sys.exit(1)
+    except OSError as err:
+        print(f"Could not read file: {err}", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(status)
+
+
+def _main_serve(_args: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="nomage serve",
+        description="Answer detect, check and convert requests, as JSON-RPC 2.0 "
+        "over JSON lines.",
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Unix socket to listen on (default: $NOMAGE_SOCKET or "
+        "nomage-<uid>.sock in the runtime directory)",
+    )
+    group.add_argument(
+        "--stdio", action="store_true", help="read requests from stdin instead"
+    )
+    args = parser.parse_args(_args)
+
+    # Only loaded when serving, the server is not needed by other commands.
+    from nomage._server import serve_stdio, serve_unix  # noqa: PLC0415
+
+    if args.stdio:
+        serve_stdio(sys.stdin, sys.stdout)
+        sys.exit(0)
+
+    path = args.socket or default_socket_path()
+    if not path:
+        parser.error("no socket path, $NOMAGE_SOCKET is empty")
+    try:
+        serve_unix(path, ready=lambda _: print(f"Listening on {path}", file=sys.stderr))
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except OSError as err:
+        print(f"Could not serve: {err}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _main_rewrite(_args: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="nomage rewrite",
+        description="Rewrite identifiers of a convention to another one, in files "
+        "and directory trees.",
+    )
+    parser.add_argument(
+        "--from", dest="source", required=True, help="convention to rewrite"
+    )
+    parser.add_argument(
+        "--to", dest="target", required=True, help="convention to rewrite to"
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="only rewrite files matching GLOB, repeatable",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="skip files and directories matching GLOB, repeatable "
+        "(.git, .hg and .svn are always skipped)",
+    )
+    parser.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="print a diff of the changes instead of writing them",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="rewrite files in N processes, 0 for one per CPU",
+    )
+    parser.add_argument(
+        "paths", nargs="*", default=["."], metavar="PATH", help="default: ."
+    )
+    args = parser.parse_args(_args)
+    if args.jobs < 0:
+        parser.error("argument -j/--jobs: must not be negative")
+
+    # Only loaded when rewriting, the module is not needed by other commands.
+    from nomage.rewrite import DEFAULT_EXCLUDE, rewrite_tree  # noqa: PLC0415
+
+    try:
+        results = rewrite_tree(
+            args.paths,
+            args.source,
+            args.target,
+            include=args.include,
+            exclude=(*DEFAULT_EXCLUDE, *args.exclude),
+            dry_run=args.dry_run,
+            jobs=args.jobs,
+        )
+    except UnknownNamingConventionError as err:
+        print(str(err).capitalize(), file=sys.stderr)
+        sys.exit(1)
+
+    status = files = replacements = 0
+    for result in results:
+        if result.error is not None:
+            print(f"Could not rewrite file: {result.error}", file=sys.stderr)
+            status = 1
+            continue
+        if result.diff is not None:
+            sys.stdout.write(result.diff)
+        files += 1
+        replacements += result.replacements
+    verb = "Would rewrite" if args.dry_run else "Rewrote"
+    print(f"{verb} {replacements} identifiers in {files} files", file=sys.stderr)
+    sys.exit(status)
+
+
+def _main_json(_args: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="nomage json",
+        description="Rewrite the object keys of JSON documents and JSON lines to a "
+        "convention, as a stream.",
+    )
+    parser.add_argument(
+        "--to", dest="target", required=True, help="convention to rewrite keys to"
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="fail on keys matching no convention, instead of keeping them",
+    )
+    parser.add_argument(
+        "-o", "--output", metavar="FILE", help="write to FILE instead of stdout"
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=["-"],
+        metavar="FILE",
+        help="JSON files, '-' for stdin (default)",
+    )
+    args = parser.parse_args(_args)
+
+    # Only loaded when rewriting JSON, the module is not needed by other commands.
+    from nomage.keys import rewrite_json  # noqa: PLC0415
+
+    keys = 0
+    try:
+        with (
+            nullcontext(sys.stdout.buffer)
+            if args.output is None
+            else Path(args.output).open("wb")
+        ) as output:
+            for path in args.files:
+                source = sys.stdin.buffer if path == "-" else path
+                keys += rewrite_json(source, output, args.target, strict=args.strict)
+    except (UnknownNamingConventionError, UnrecognizedNamingConventionError) as err:
+        print(str(err).capitalize(), file=sys.stderr)
+        sys.exit(1)
+    except OSError as err:
+        print(f"Could not rewrite JSON: {err}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Rewrote {keys} keys", file=sys.stderr)
+    sys.exit(0)
+
+
+def _main_lint(_args: list[str]) -> None:
+    # Only loaded when linting, the module is not needed by other commands.
+    from nomage import lint  # noqa: PLC0415
+    from nomage.rewrite import DEFAULT_EXCLUDE  # noqa: PLC0415
+
+    parser = _create_lint_parser()
+    args = parser.parse_args(_args)
+    if args.jobs < 0:
+        parser.error("argument -j/--jobs: must not be negative")
+    rules = dict(lint.DEFAULT_RULES)
+    if args.rules:
+        rules = {}
+        for rule in args.rules:
+            kind, _, name = rule.partition("=")
+            rules[kind.strip()] = name.strip()
+
+    try:
+        results = list(
+            lint.lint_paths(
+                args.paths,
+                rules,
+                include=args.include or lint.DEFAULT_INCLUDE,
+                exclude=(*DEFAULT_EXCLUDE, *args.exclude),
+                jobs=args.jobs,
+                cache=None if args.no_cache else args.cache,
+            )
+        )
+    except ValueError as err:
+        parser.error(f"argument --rule: {err}")
+
+    names = {kind: nc.names[0] for kind, nc in lint.resolve_rules(rules).items()}
+    violations = sum(len(result.violations) for result in results)
+    errors = [result for result in results if result.error is not None]
+    if args.format == "sarif":
+        print(json.dumps(lint.sarif_report(results, names), indent=2))
+    elif args.format == "json":
+        print(json.dumps(_lint_json(results), indent=2))
+    else:
+        for result in results:
+            for violation in result.violations:
+                print(lint.format_violation(result.path, violation))
+            if result.error is not None:
+                print(f"{result.path}: {result.error}", file=sys.stderr)
+        cached = sum(result.cached for result in results)
+        print(
+            f"Checked {len(results)} files ({cached} cached), "
+            f"found {violations} violations",
+            file=sys.stderr,
+        )
+    sys.exit(2 if errors else int(violations > 0))
+
+
+def _create_lint_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="nomage lint",
+        description="Check that the names defined in Python files follow naming "
+        "conventions, depending on their kind.",
+        epilog="exit status is 0 without violations, 1 with violations, and 2 on "
+        "invalid arguments or files which could not be read or parsed.",
+    )
+    parser.add_argument(
+        "-r",
+        "--rule",
+        dest="rules",
+        action="append",
+        metavar="KIND=CONVENTION",
+        help="check names of a KIND (class, function, argument, variable or global) "
+        "against a CONVENTION, repeatable (default: class=pascal, function=snake, "
+        "argument=snake, variable=snake)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="only check files matching GLOB, repeatable (default: *.py)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="skip files and directories matching GLOB, repeatable "
+        "(.git, .hg and .svn are always skipped)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "sarif"),
+        default="text",
+        help="output format (default: text)",
+    )
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--cache",
+        default=".nomage_cache/lint.json",
+        metavar="PATH",
+        help="results cache, keyed by file contents (default: %(default)s)",
+    )
+    group.add_argument("--no-cache", action="store_true", help="disable the cache")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="check files in N processes, 0 for one per CPU",
+    )
+    parser.add_argument(
+        "paths", nargs="*", default=["."], metavar="PATH", help="default: ."
+    )
+    return parser
+
+
+def _lint_json(results: "list[FileLint]") -> dict[str, object]:
+    return {
+        "files": len(results),
+        "violations": [
+            {"path": result.path, **dataclasses.asdict(violation)}
+            for result in results
+            for violation in result.violations
+        ],
+        "errors": [
+            {"path": result.path, "message": result.error}
+            for result in results
+            if result.error is not None
+        ],
+    }
+
+
+def _main_stats(_args: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="nomage stats",
+        description="Count the naming conventions of identifiers read line by line.",
+    )
+    parser.add_argument(
+        "-a",
+        "--approximate",
+        action="store_true",
+        help="estimate distinct counts, in constant memory for unbounded streams",
+    )
+    parser.add_argument(
+        "-s",
+        "--sample",
+        type=int,
+        default=0,
+        metavar="N",
+        help="sample N identifiers of each convention",
+    )
+    parser.add_argument("--seed", type=int, help="seed of the sampling")
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument(
+        "files",
+        nargs="*",
+        default=["-"],
+        metavar="FILE",
+        help="files of identifiers, '-' for stdin (default)",
+    )
+    args = parser.parse_args(_args)
+    if args.sample < 0:
+        parser.error("argument -s/--sample: must not be negative")
+
+    # Only loaded for censuses, the module is not needed by other commands.
+    from nomage.stats import census  # noqa: PLC0415
+
+    # Samples of identifiers which are not UTF-8 are escaped in the report.
+    _set_errors(sys.stdout, "backslashreplace")
+
+    id_strs = (
+        id_str
+        for _, _, id_strs in _read_chunks(args.files, _CHUNK_LINES)
+        for id_str in id_strs
+        if id_str
+    )
+    try:
+        report = census(
+            id_strs,
+            approximate=args.approximate,
+            sample_size=args.sample,
+            seed=args.seed,
+        )
+    except OSError as err:
+        print(f"Could not read file: {err}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.format == "json":
+        print(json.dumps(_stats_json(report), indent=2))
+    else:
+        print(_stats_text(report))
+    sys.exit(0)
+
+
+def _stats_json(report: "Census") -> dict[str, object]:
+    return {
+        "total": report.total,
+        "distinct": report.distinct,
+        "approximate": report.approximate,
+        "ambiguous": report.ambiguous,
+        "unrecognized": dataclasses.asdict(report.unrecognized),
+        "conventions": {
+            name: dataclasses.asdict(count)
+            for name, count in report.conventions.items()
+        },
+        "overlaps": [
+            {"conventions": list(names), "count": count}
+            for names, count in report.overlaps.items()
+        ],
+    }
+
+
+def _stats_text(report: "Census") -> str:
+    approx = "~" if report.approximate else ""
+    lines = [
+        f"Identifiers: {report.total} ({approx}{report.distinct} distinct), "
+        f"ambiguous: {report.ambiguous} ({report.ambiguous_rate:.2%}), "
+        f"unrecognized: {report.unrecognized.count} "
+        f"({report.unrecognized_rate:.2%})",
+        "",
+        f"{'convention':<20} {'count':>12} {'share':>8} {'distinct':>12}",
+    ]
+    rows = [*report.conventions.items(), ("(unrecognized)", report.unrecognized)]
+    for name, nc_count in rows:
+        share = nc_count.count / report.total if report.total else 0.0
+        samples = ", ".join(nc_count.samples)
+        lines.append(
+            f"{name:<20} {nc_count.count:>12} {share:>8.2%} "
+            f"{approx + str(nc_count.distinct):>12}"
+            + (f"  e.g. {samples}" if samples else "")
+        )
+    if report.overlaps:
+        lines += ["", "Ambiguous identifiers, by matching conventions:"]
+        lines += [
+            f"{count:>12}  {' / '.join(names)}"
+            for names, count in report.overlaps.items()
+        ]
+    return "\n".join(lines)
+
+
+_COMMANDS: dict[str, Callable[[list[str]], None]] = {
+    "json": _main_json,
+    "lint": _main_lint,
+    "rewrite": _main_rewrite,
+    "serve": _main_serve,
+    "stats": _main_stats,
+}
+
+
+def _process_files(  # noqa: PLR0913
+    files: list[str],
+    check_nc: NamingConvention | None,
+    targets: tuple[NamingConvention, ...] | None,
+    as_json: bool,
+    jobs: int = 1,
+    conventions: tuple[NamingConvention, ...] = BUILTINS_CONVENTIONS,
+) -> int:
+    chunks = _read_chunks(files, _CHUNK_LINES)
+    results: Iterable[tuple[_Chunk, list[tuple[int, str]]]]
+    if jobs == 1:
+        evaluate = _make_evaluator(check_nc, targets, as_json, conventions)
+        results = ((chunk, list(map(evaluate, chunk[2]))) for chunk in chunks)
+    else:
+        # Only loaded for parallel runs, process pools are slow to import.
+        from nomage.parallel import _imap_ordered  # noqa: PLC0415
+
+        results = _imap_ordered(
+            _evaluate_chunk,
+            chunks,
+            jobs=jobs or None,
+            initializer=_init_evaluator,
+            initargs=(check_nc, targets, as_json, conventions),
+        )
+    # One output line per input line, unless only checking.
+    return _write_results(results, output_values=bool(targets or not check_nc))
+
+
+def _write_results(
+    results: Iterable[tuple[_Chunk, list[tuple[int, str]]]], *, output_values: bool
+) -> int:
+    seen: set[int] = set()
+    out: list[str] = []
+    err: list[str] = []
+    for (name, start, id_strs), outcomes in results:
+        for lineno, id_str, (outcome, value) in zip(
+            count(start), id_strs, outcomes, strict=False
+        ):
+            seen.add(outcome)
+            if outcome == _UNRECOGNIZED:
+                err.append(
+                    f"{name}:{lineno}: unrecognized naming convention: {id_str}\n"
+                )
+            elif outcome == _NOT_MATCHING:
+                err.append(f"{name}:{lineno}: not matching convention: {id_str}\n")
+            if output_values:
+                out.append(value + "\n")
+        if len(out) >= _STREAM_BUFFER_LINES or len(err) >= _STREAM_BUFFER_LINES:
+            _flush(out, err)
+    _flush(out, err)
+
+    if _UNRECOGNIZED in seen:
+        return 1
+    return 2 if _NOT_MATCHING in seen else 0
+
+
+def _make_evaluator(
+    check_nc: NamingConvention | None,
+    targets: tuple[NamingConvention, ...] | None,
+    as_json: bool,
+    conventions: tuple[NamingConvention, ...] = BUILTINS_CONVENTIONS,
+) -> Callable[[str], tuple[int, str]]:
+    engine = get_engine(conventions)
+    render = _make_renderer(targets, as_json)
+    default = "null" if as_json else ""
+
+    def evaluate(id_str: str) -> tuple[int, str]:
+        nc = engine.detect(id_str) if id_str else None
+        if nc is None:
+            return (_UNRECOGNIZED if id_str else _OK), default
+        if check_nc and not engine.check(id_str, check_nc):
+            return _NOT_MATCHING, default
+        return _OK, render(id_str, nc)
+
+    return evaluate
+
+
+def _init_evaluator(
+    check_nc: NamingConvention | None,
+    targets: tuple[NamingConvention, ...] | None,
+    as_json: bool,
+    conventions: tuple[NamingConvention, ...] = BUILTINS_CONVENTIONS,
+) -> None:
+    global _worker_evaluate  # noqa: PLW0603
+    _worker_evaluate = _make_evaluator(check_nc, targets, as_json, conventions)
+
+
+def _evaluate_chunk(chunk: _Chunk) -> list[tuple[int, str]]:
+    return list(map(_worker_evaluate, chunk[2]))
+
+
+def _make_renderer(
+    targets: tuple[NamingConvention, ...] | None, as_json: bool
+) -> Callable[[str, NamingConvention], str]:
+    if not targets:
+        return lambda _, nc: nc.names[0]
+    if as_json:
+        return lambda id_str, nc: json.dumps(
+            Identifier(nc.parser(id_str), nc).to_all(targets)
+        )
+    transcode = _transcoder(targets[0])
+    return lambda id_str, nc: transcode(nc)(id_str)
+
+
+def _read_chunks(files: Iterable[str], size: int) -> Iterator[_Chunk]:
+    # Bytes which are not UTF-8 are read as surrogates, and never detected.
+    for path in files:
+        name = "<stdin>" if path == "-" else path
+        if path == "-":
+            _set_errors(sys.stdin, "surrogateescape")
+        with (
+            nullcontext(sys.stdin)
+            if path == "-"
+            else Path(path).open(encoding="utf-8", errors="surrogateescape")
+        ) as file:
+            start = 1
+            while id_strs := [line.strip() for line in islice(file, size)]:
+                yield name, start, id_strs
+                start += len(id_strs)
+
+
+def _set_errors(stream: IO[str], errors: str) -> None:
+    if isinstance(stream, io.TextIOWrapper):
+        stream.reconfigure(errors=errors)
+
+
+def _flush(out: list[str], err: list[str]) -> None:
+    sys.stdout.write("".join(out))
+    sys.stderr.write("".join(err))
+    out.clear()
+    err.clear()
+
+
+def _is_multi_target(value: str | None) -> bool:
+    return value is not None and (value == "all" or "," in value)
+
+
+def _get_target_conventions(
+    value: str, conventions: Mapping[str, NamingConvention]
+) -> tuple[NamingConvention, ...]:
+    if value == "all":
+        return tuple({id(nc): nc for nc in conventions.values()}.values())
+    return tuple(
+        _get_naming_convention(name.strip(), conventions) for name in value.split(",")
+    )
+
+
 def _get_naming_convention(
     name: str, conventions: Mapping[str, NamingConvention]
 ) -> NamingConvention:
@@ -97,6 +805,23 @@ def _get_naming_convention(
     return nc
 
 
+def _package_metadata() -> "PackageMetadata":
+    # `importlib.metadata` is slow to import, only needed for --version and --help.
+    from importlib.metadata import metadata  # noqa: PLC0415
+
+    return metadata(__package__)
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """Argument parser looking up the package description only to print help."""
+
+    def format_help(self) -> str:
+        if self.description is None:
+            pkg_metadata = _package_metadata()
+            self.description = f"{pkg_metadata['Name']} - {pkg_metadata['Summary']}"
+        return super().format_help()
+
+
 def create_parser() -> argparse.ArgumentParser:
     """
     Create and configure the argument parser for the CLI.
@@ -104,14 +829,49 @@ def create_parser() -> argparse.ArgumentParser:
     Returns:
         An ArgumentParser instance configured for the Nomage CLI.
     """
-    pkg_metadata = metadata(__package__)
-    parser = argparse.ArgumentParser(
-        description=f"{pkg_metadata['Name']} - {pkg_metadata['Summary']}",
+    parser = _ArgumentParser(
+        epilog="commands:\n"
+        "  json     rewrite keys of JSON files, see 'nomage json --help'\n"
+        "  lint     check names in Python files, see 'nomage lint --help'\n"
+        "  rewrite  rewrite identifiers in files, see 'nomage rewrite --help'\n"
+        "  serve    run a resident server, see 'nomage serve --help'\n"
+        "  stats    count the conventions of identifiers, see 'nomage stats --help'\n"
+        "\n"
+        "identifiers named like a command follow '--', like 'nomage -- json'",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument(
         "-V", "--version", action="store_true", help="print version and exit"
     )
-    parser.add_argument("-t", "--to", dest="to_convention")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print a breakdown of the time spent in detection, parsing and "
+        "conversion to stderr, also before a command",
+    )
+    parser.add_argument(
+        "-t",
+        "--to",
+        dest="to_convention",
+        help="convert to a convention, to several comma-separated ones or to 'all' "
+        "of them as JSON",
+    )
     parser.add_argument("-c", "--check", dest="check_convention")
+    parser.add_argument(
+        "-f",
+        "--file",
+        dest="files",
+        action="append",
+        metavar="FILE",
+        help="read identifiers line by line from FILE ('-' for stdin), repeatable",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="with --file, process identifiers in N processes, 0 for one per CPU",
+    )
     parser.add_argument("identifier", nargs="?")
     return parser
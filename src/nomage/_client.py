@@ -0,0 +1,140 @@
+"""Thin client of the Nomage server.
+
+This module is the entry point of the `nomage` command. When a server started by
+`nomage serve` is listening on the default socket, the command line is forwarded
+to it and its output is printed, which skips loading the conventions, compiling
+the detection engine and warming the caches on every call. Otherwise, or when the
+command cannot be forwarded, the command-line interface runs in process.
+Command lines are only forwarded to a socket owned by the current user, so that
+another user cannot answer them from a shared directory, and only run by a server
+of the same version, so that a server started before an upgrade does not answer
+with the old code.
+
+It only imports light standard modules, so that forwarding stays cheap.
+
+Examples:
+    $ nomage serve &
+    $ nomage MyIdentifier --to snake  # answered by the server
+    my_identifier
+    $ NOMAGE_SOCKET= nomage MyIdentifier --to snake  # never forwarded
+    my_identifier
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+from pathlib import Path
+
+# Subcommands of the CLI, never forwarded.
+COMMANDS = ("json", "lint", "rewrite", "serve", "stats")
+SOCKET_ENV_VAR = "NOMAGE_SOCKET"
+
+_CONNECT_TIMEOUT = 10.0
+
+
+def main() -> None:
+    """Entry point of the `nomage` command, forwarding to the server if running."""
+    args = sys.argv[1:]
+    status = forward(args, default_socket_path())
+    if status is None:
+        from nomage._cli import main as cli_main  # noqa: PLC0415
+
+        cli_main(args)
+    sys.exit(status)
+
+
+def default_socket_path() -> str:
+    """
+    Get the path of the server socket.
+
+    The path is read from the `NOMAGE_SOCKET` environment variable, an empty value
+    disabling forwarding. It defaults to `nomage-<uid>.sock` in the user runtime
+    directory, or in the temporary directory.
+
+    Returns:
+        The path of the server socket, or an empty string if disabled.
+    """
+    path = os.environ.get(SOCKET_ENV_VAR)
+    if path is not None:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir:
+        import tempfile  # noqa: PLC0415
+
+        runtime_dir = tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return str(Path(runtime_dir) / f"nomage-{uid}.sock")
+
+
+def is_forwardable(args: list[str]) -> bool:
+    """
+    Check if a command line can be run by the server.
+
+    Subcommands are never forwarded, nor are command lines reading files, because
+    the server does not share the working directory and the standard input of
+    the client, nor profiled command lines.
+
+    Args:
+        args: The command-line arguments, without the program name.
+
+    Returns:
+        True if the command line can be forwarded, False otherwise.
+    """
+    if (args and args[0] in COMMANDS) or "--profile" in args:
+        return False
+    return not any(arg == "-" or arg.startswith(("-f", "--f")) for arg in args)
+
+
+def forward(args: list[str], path: str) -> int | None:
+    """
+    Run a command line on the server, and print its output.
+
+    Args:
+        args: The command-line arguments, without the program name.
+        path: The path of the server socket, forwarding is disabled if empty.
+
+    Returns:
+        The exit status of the command, or None if it was not run by the server:
+        forwarding is disabled, the command line is not forwardable, the socket
+        is not owned by the current user, the server is not running, or runs
+        another version.
+    """
+    if not path or not hasattr(socket, "AF_UNIX") or not is_forwardable(args):
+        return None
+    if not _is_own_socket(path):
+        return None
+    from nomage import __version__  # noqa: PLC0415
+
+    params = {"args": args, "version": __version__}
+    request = {"jsonrpc": "2.0", "id": 0, "method": "cli", "params": params}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_CONNECT_TIMEOUT)
+            sock.connect(path)
+            # Once connected, the command may take any time to run, and must not
+            # be run again in process.
+            sock.settimeout(None)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reader:
+                response = json.loads(reader.readline())
+    except (OSError, ValueError):
+        return None
+
+    result = response.get("result")
+    if not isinstance(result, dict):
+        return None
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return int(result["status"])
+
+
+def _is_own_socket(path: str) -> bool:
+    try:
+        status = Path(path).stat()
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(status.st_mode):
+        return False
+    return not hasattr(os, "getuid") or status.st_uid == os.getuid()
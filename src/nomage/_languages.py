@@ -0,0 +1,332 @@
+"""
+Nomage - regular languages.
+
+This module proves, from their regular expressions, that two naming conventions
+can never match the same identifier. The relative detection order of such
+conventions does not matter: no identifier is detected differently when they are
+swapped.
+
+Patterns are parsed into nondeterministic automata, over a partition of the
+characters into the ranges the patterns tell apart. Two conventions are disjoint
+when no input leads both automata to accept, which a search of the reachable pairs
+of state sets decides. As `re.match` does, an automaton accepts any text after the
+match, unless the pattern ends with an end anchor.
+
+The analysis is conservative: patterns with constructs it does not model, like
+lookarounds, anchors other than leading and trailing ones, character categories or
+case-insensitive matching, are never proven disjoint.
+"""
+
+import re
+import sys
+from bisect import bisect_left
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any, TypeAlias
+
+if sys.version_info >= (3, 11):
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+else:
+    import sre_constants
+    import sre_parse
+
+# Parsed regex items are untyped tuples of opcode and argument.
+_Items: TypeAlias = Any
+# Nodes are ("set", intervals), ("seq", nodes), ("alt", nodes) or
+# ("repeat", min, max, node), with half-open intervals of code points and a max of
+# None when unbounded.
+_Node: TypeAlias = tuple[Any, ...]
+_Intervals: TypeAlias = tuple[tuple[int, int], ...]
+
+_CHARS = sys.maxunicode + 1
+_NEWLINE = ord("\n")
+# Bounded repeats are unrolled, up to this number of copies.
+_MAX_COPIES = 64
+# Pairs of state sets searched before giving up on a proof.
+_MAX_PAIRS = 10_000
+
+# Pseudo-states of the automata. After the match of a pattern without end anchor,
+# any text is accepted. After the match of a pattern ending with `$`, a single
+# newline is accepted too.
+_ANY_TEXT = -1
+_FINAL_NEWLINE = -2
+
+# How a pattern ends: without anchor, with `$` or with `\Z`.
+_OPEN, _END_OR_NEWLINE, _END = range(3)
+
+
+class _UnsupportedError(Exception):
+    """Raised on constructs the analysis does not model."""
+
+
+@lru_cache(maxsize=1024)
+def disjoint(a: re.Pattern[str], b: re.Pattern[str], /) -> bool:
+    """
+    Tell if two regular expressions can never both match the same string.
+
+    Args:
+        a: The first regular expression, matched with `re.match`.
+        b: The second regular expression.
+
+    Returns:
+        True if no string is matched by both, False if one is, or when it cannot
+        be proven.
+    """
+    try:
+        node_a, end_a = _language(a)
+        node_b, end_b = _language(b)
+    except _UnsupportedError:
+        return False
+    bounds = sorted(
+        {0, _NEWLINE, _NEWLINE + 1, _CHARS}
+        | {
+            bound
+            for intervals in _sets(node_a, node_b)
+            for r in intervals
+            for bound in r
+        }
+    )
+    return not _intersect(
+        _Automaton(node_a, end_a, bounds), _Automaton(node_b, end_b, bounds)
+    )
+
+
+def _language(regex: re.Pattern[str]) -> tuple[_Node, int]:
+    flags = regex.flags
+    if not isinstance(regex.pattern, str) or flags & re.IGNORECASE:
+        raise _UnsupportedError
+    try:
+        items: list[_Items] = sre_parse.parse(regex.pattern, flags).data[:]
+    except Exception as exc:  # pragma: no cover
+        raise _UnsupportedError from exc
+    # `match` anchors the pattern at the start, leading anchors always succeed.
+    while (
+        items
+        and items[0][0] is sre_constants.AT
+        and items[0][1]
+        in {
+            sre_constants.AT_BEGINNING,
+            sre_constants.AT_BEGINNING_STRING,
+        }
+    ):
+        del items[0]
+    end = _OPEN
+    if items and items[-1] == (sre_constants.AT, sre_constants.AT_END_STRING):
+        end = _END
+        del items[-1]
+    elif items and items[-1] == (sre_constants.AT, sre_constants.AT_END):
+        if flags & re.MULTILINE:
+            raise _UnsupportedError
+        end = _END_OR_NEWLINE
+        del items[-1]
+    return _sequence(items, bool(flags & re.DOTALL)), end
+
+
+def _sequence(items: _Items, dotall: bool) -> _Node:
+    return ("seq", tuple(_node(op, av, dotall) for op, av in items))
+
+
+def _node(op: _Items, av: _Items, dotall: bool) -> _Node:  # noqa: PLR0911
+    if op is sre_constants.LITERAL:
+        return ("set", ((av, av + 1),))
+    if op is sre_constants.NOT_LITERAL:
+        return ("set", _complement(((av, av + 1),)))
+    if op is sre_constants.ANY:
+        return (
+            "set",
+            ((0, _CHARS),) if dotall else _complement(((_NEWLINE, _NEWLINE + 1),)),
+        )
+    if op is sre_constants.IN:
+        return ("set", _set_intervals(av))
+    if op in {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}:
+        min_, max_, item = av
+        max_ = None if max_ == sre_constants.MAXREPEAT else max_
+        if min_ > _MAX_COPIES or (max_ is not None and max_ > _MAX_COPIES):
+            raise _UnsupportedError
+        return ("repeat", min_, max_, _sequence(item, dotall))
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, del_flags, item = av
+        if add_flags or del_flags:
+            raise _UnsupportedError
+        return _sequence(item, dotall)
+    if op is sre_constants.BRANCH:
+        return ("alt", tuple(_sequence(item, dotall) for item in av[1]))
+    # Anchors, lookarounds, group references, atomic groups and possessive repeats.
+    raise _UnsupportedError
+
+
+def _set_intervals(items: _Items) -> _Intervals:
+    intervals = []
+    negate = False
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            intervals.append((av, av + 1))
+        elif op is sre_constants.RANGE:
+            intervals.append((av[0], av[1] + 1))
+        elif op is sre_constants.NEGATE:
+            negate = True
+        else:
+            # Categories, and ranges of case-insensitive sets.
+            raise _UnsupportedError
+    merged = _merge(intervals)
+    return _complement(merged) if negate else merged
+
+
+def _merge(intervals: Iterable[tuple[int, int]]) -> _Intervals:
+    merged: list[tuple[int, int]] = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(high, merged[-1][1]))
+        else:
+            merged.append((low, high))
+    return tuple(merged)
+
+
+def _complement(intervals: _Intervals) -> _Intervals:
+    complement = []
+    low = 0
+    for start, end in intervals:
+        if start > low:
+            complement.append((low, start))
+        low = end
+    if low < _CHARS:
+        complement.append((low, _CHARS))
+    return tuple(complement)
+
+
+def _sets(*nodes: _Node) -> Iterable[_Intervals]:
+    for node in nodes:
+        kind = node[0]
+        if kind == "set":
+            yield node[1]
+        elif kind == "repeat":
+            yield from _sets(node[3])
+        else:
+            yield from _sets(*node[1])
+
+
+class _Automaton:
+    """Nondeterministic automaton of a pattern, over classes of characters."""
+
+    __slots__ = (
+        "_bounds",
+        "classes",
+        "edges",
+        "end",
+        "epsilons",
+        "final",
+        "newline",
+        "start",
+    )
+
+    def __init__(self, node: _Node, end: int, bounds: list[int]) -> None:
+        # Class `i` holds the code points from `bounds[i]` to `bounds[i + 1]`.
+        self._bounds = bounds
+        self.classes = len(bounds) - 1
+        self.edges: list[list[tuple[frozenset[int], int]]] = []
+        self.epsilons: list[list[int]] = []
+        self.start = self._state()
+        self.final = self._build(node, self.start)
+        self.end = end
+        self.newline = bisect_left(bounds, _NEWLINE)
+
+    def initial(self) -> frozenset[int]:
+        """The set of states before any character."""
+        return self._close({self.start})
+
+    def step(self, states: frozenset[int], char_class: int) -> frozenset[int]:
+        """The set of states after a character of a class."""
+        targets = set()
+        for state in states:
+            if state == _ANY_TEXT:
+                targets.add(_ANY_TEXT)
+            elif state >= 0:
+                for classes, target in self.edges[state]:
+                    if char_class in classes:
+                        targets.add(target)
+        if (
+            self.end == _END_OR_NEWLINE
+            and char_class == self.newline
+            and self.final in states
+        ):
+            targets.add(_FINAL_NEWLINE)
+        return self._close(targets)
+
+    def accepts(self, states: frozenset[int]) -> bool:
+        """Whether the input read so far is matched."""
+        return self.final in states or _ANY_TEXT in states or _FINAL_NEWLINE in states
+
+    def _close(self, states: set[int]) -> frozenset[int]:
+        closure = set(states)
+        pending = [state for state in states if state >= 0]
+        while pending:
+            for target in self.epsilons[pending.pop()]:
+                if target not in closure:
+                    closure.add(target)
+                    pending.append(target)
+        if self.end == _OPEN and self.final in closure:
+            closure.add(_ANY_TEXT)
+        return frozenset(closure)
+
+    def _state(self) -> int:
+        self.edges.append([])
+        self.epsilons.append([])
+        return len(self.edges) - 1
+
+    def _build(self, node: _Node, start: int) -> int:
+        # Adds the automaton of a node from a state, returns its final state.
+        kind = node[0]
+        if kind == "set":
+            end = self._state()
+            bounds = self._bounds
+            classes = frozenset(
+                i
+                for low, high in node[1]
+                for i in range(bisect_left(bounds, low), bisect_left(bounds, high))
+            )
+            self.edges[start].append((classes, end))
+            return end
+        if kind == "seq":
+            for item in node[1]:
+                start = self._build(item, start)
+            return start
+        if kind == "alt":
+            end = self._state()
+            for item in node[1]:
+                self.epsilons[self._build(item, start)].append(end)
+            return end
+        _, min_, max_, item = node
+        for _ in range(min_):
+            start = self._build(item, start)
+        if max_ is None:
+            loop = self._state()
+            self.epsilons[start].append(loop)
+            self.epsilons[self._build(item, loop)].append(loop)
+            return loop
+        end = self._state()
+        for _ in range(max_ - min_):
+            self.epsilons[start].append(end)
+            start = self._build(item, start)
+        self.epsilons[start].append(end)
+        return end
+
+
+def _intersect(a: _Automaton, b: _Automaton) -> bool:
+    # True when some input is accepted by both, or when the search gives up.
+    classes = range(a.classes)
+    initial = (a.initial(), b.initial())
+    seen = {initial}
+    pending = [initial]
+    while pending:
+        states_a, states_b = pending.pop()
+        if a.accepts(states_a) and b.accepts(states_b):
+            return True
+        for char_class in classes:
+            pair = (a.step(states_a, char_class), b.step(states_b, char_class))
+            if pair[0] and pair[1] and pair not in seen:
+                if len(seen) >= _MAX_PAIRS:
+                    return True
+                seen.add(pair)
+                pending.append(pair)
+    return False
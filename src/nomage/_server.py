@@ -0,0 +1,304 @@
+"""Resident server for Nomage.
+
+This module provides the `nomage serve` command: a long-running process answering
+requests on a local Unix socket, or on its standard input and output. Conventions,
+detection engine and caches stay warm between requests.
+
+The protocol is JSON-RPC 2.0 over JSON lines: each request is a JSON object on
+its own line, and each response is written on its own line. Batches of requests
+are JSON arrays. Requests without an `id` are notifications, and get no response.
+
+The methods are:
+
+- `detect`: `{"identifier": str}`, returns the first name of the detected
+  convention, or null when unrecognized.
+- `check`: `{"identifier": str, "convention": str}`, returns a boolean.
+- `convert`: `{"identifier": str, "to": str | list[str]}`, returns the converted
+  identifier, or a mapping of convention names to converted identifiers for a
+  list, or null when unrecognized.
+- `cli`: `{"args": list[str], "version": str}`, runs a command line and returns
+  its `stdout`, `stderr` and exit `status`. Used by the thin client of the
+  `nomage` command, the request is refused when its version is not the version of
+  the server.
+
+The `detect`, `check` and `convert` methods take a list of `identifiers` instead
+of a single `identifier` to get a list of results.
+
+Examples:
+    $ nomage serve --stdio
+    {"jsonrpc": "2.0", "id": 1, "method": "detect", "params": {"identifier": "myId"}}
+    {"jsonrpc": "2.0", "id": 1, "result": "camelCase"}
+    {"id": 2, "method": "convert", "params": {"identifiers": ["myId"], "to": "snake"}}
+    {"jsonrpc": "2.0", "id": 2, "result": ["my_id"]}
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from collections.abc import Callable
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import IO, Any
+
+from nomage import __version__
+from nomage._cli import main
+from nomage._client import is_forwardable
+from nomage.cache import enable_cache
+from nomage.convention import NamingConvention
+from nomage.engine import get_engine
+from nomage.exceptions import (
+    UnknownNamingConventionError,
+    UnrecognizedNamingConventionError,
+)
+from nomage.naming import (
+    BUILTINS_CONVENTIONS,
+    _resolve_convention,
+    _transcoder,
+    naming,
+)
+
+_PARSE_ERROR = -32700
+_INVALID_REQUEST = -32600
+_METHOD_NOT_FOUND = -32601
+_INVALID_PARAMS = -32602
+
+# The CLI prints to the process-wide standard streams.
+_CLI_LOCK = threading.Lock()
+
+
+class _RPCError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def serve_stdio(infile: IO[str], outfile: IO[str]) -> None:
+    """
+    Answer requests read line by line from a stream, until its end.
+
+    Args:
+        infile: The stream to read requests from.
+        outfile: The stream to write responses to.
+    """
+    enable_cache()
+    for line in infile:
+        response = handle_line(line)
+        if response is not None:
+            outfile.write(response + "\n")
+            outfile.flush()
+
+
+def serve_unix(
+    path: str, *, ready: Callable[[socketserver.BaseServer], None] | None = None
+) -> None:
+    """
+    Answer requests on a Unix socket, until interrupted.
+
+    Each connection is handled in its own thread and can send many requests.
+    A stale socket file left by a stopped server is replaced, any other file is
+    kept.
+
+    Args:
+        path: The path of the socket to listen on.
+        ready: Called with the server once listening, which can be shut down.
+
+    Raises:
+        OSError: Raised when a server is already listening on `path`, or when
+            `path` is not a socket.
+    """
+    _remove_stale_socket(path)
+    enable_cache()
+    # Only the current user can connect to the socket.
+    umask = os.umask(0o077)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(path, _RequestHandler)
+    finally:
+        os.umask(umask)
+    server.daemon_threads = True
+    try:
+        if ready is not None:
+            ready(server)
+        server.serve_forever()
+    finally:
+        server.server_close()
+        Path(path).unlink(missing_ok=True)
+
+
+def handle_line(line: str) -> str | None:
+    """
+    Answer a JSON-lines request, or batch of requests.
+
+    Args:
+        line: The JSON-encoded request, or array of requests.
+
+    Returns:
+        The JSON-encoded response, or None when there is nothing to respond.
+    """
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return json.dumps(_error(None, _PARSE_ERROR, "parse error"))
+    if isinstance(message, list):
+        if not message:
+            return json.dumps(_error(None, _INVALID_REQUEST, "empty batch"))
+        responses = [r for r in map(_handle, message) if r is not None]
+        return json.dumps(responses) if responses else None
+    response = _handle(message)
+    return None if response is None else json.dumps(response)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            response = handle_line(line.decode("utf-8", errors="replace"))
+            if response is not None:
+                self.wfile.write(response.encode() + b"\n")
+
+
+def _remove_stale_socket(path: str) -> None:
+    try:
+        mode = Path(path).lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        msg = f"not a socket: {path}"
+        raise OSError(msg)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            Path(path).unlink()
+            return
+    msg = f"a server is already listening on {path}"
+    raise OSError(msg)
+
+
+def _handle(message: object) -> dict[str, Any] | None:
+    if not isinstance(message, dict):
+        return _error(None, _INVALID_REQUEST, "invalid request")
+    request_id = message.get("id")
+    try:
+        result = _call(message.get("method"), message.get("params", {}))
+    except _RPCError as err:
+        response = _error(request_id, err.code, err.message)
+    except UnknownNamingConventionError as err:
+        response = _error(request_id, _INVALID_PARAMS, str(err))
+    else:
+        response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+    return response if "id" in message else None
+
+
+def _call(method: object, params: object) -> object:
+    if not isinstance(method, str):
+        raise _RPCError(_INVALID_REQUEST, "invalid request")
+    if method not in _METHODS:
+        raise _RPCError(_METHOD_NOT_FOUND, f"method not found: {method}")
+    if not isinstance(params, dict):
+        raise _RPCError(_INVALID_PARAMS, "params must be an object")
+    return _METHODS[method](params)
+
+
+def _error(request_id: object, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _for_each(params: dict[str, Any], func: Callable[[str], object]) -> object:
+    if "identifiers" in params:
+        id_strs = params["identifiers"]
+        if not isinstance(id_strs, list) or not all(
+            isinstance(s, str) for s in id_strs
+        ):
+            raise _RPCError(_INVALID_PARAMS, "identifiers must be a list of strings")
+        return [func(id_str) for id_str in id_strs]
+    id_str = params.get("identifier")
+    if not isinstance(id_str, str):
+        raise _RPCError(_INVALID_PARAMS, "identifier must be a string")
+    return func(id_str)
+
+
+def _get_str(params: dict[str, Any], name: str) -> str:
+    value = params.get(name)
+    if not isinstance(value, str):
+        raise _RPCError(_INVALID_PARAMS, f"{name} must be a string")
+    return value
+
+
+def _detect(params: dict[str, Any]) -> object:
+    detect = get_engine(BUILTINS_CONVENTIONS).detect
+
+    def _detect_one(id_str: str) -> str | None:
+        nc = detect(id_str)
+        return None if nc is None else nc.names[0]
+
+    return _for_each(params, _detect_one)
+
+
+def _check(params: dict[str, Any]) -> object:
+    nc = _resolve_convention(_get_str(params, "convention"))
+    check = get_engine(BUILTINS_CONVENTIONS).check
+    return _for_each(params, lambda id_str: check(id_str, nc))
+
+
+def _convert(params: dict[str, Any]) -> object:
+    to = params.get("to")
+    if isinstance(to, list) and all(isinstance(name, str) for name in to):
+        targets = [_resolve_convention(name) for name in to]
+        return _for_each(params, lambda id_str: _convert_one(id_str, targets))
+    transcode = _transcoder(_resolve_convention(_get_str(params, "to")))
+    return _for_each(params, lambda id_str: _convert_one(id_str, transcode))
+
+
+def _convert_one(
+    id_str: str,
+    to: list[NamingConvention] | Callable[[NamingConvention], Callable[[str], str]],
+) -> object:
+    try:
+        id_naming = naming(id_str)
+    except UnrecognizedNamingConventionError:
+        return None
+    if isinstance(to, list):
+        return id_naming.to_all(to)
+    return to(id_naming.convention)(id_str)
+
+
+def _cli(params: dict[str, Any]) -> object:
+    args = params.get("args")
+    if not isinstance(args, list) or not all(isinstance(arg, str) for arg in args):
+        raise _RPCError(_INVALID_PARAMS, "args must be a list of strings")
+    if not is_forwardable(args):
+        raise _RPCError(_INVALID_PARAMS, "subcommands and files are not supported")
+    if params.get("version") != __version__:
+        # A server started before an upgrade would answer with the old code.
+        msg = f"version mismatch: server runs nomage {__version__}"
+        raise _RPCError(_INVALID_PARAMS, msg)
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with _CLI_LOCK, redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            main(args)
+        except SystemExit as exc:
+            status = exc.code
+        else:  # pragma: no cover
+            status = 0
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "status": status if isinstance(status, int) else int(status is not None),
+    }
+
+
+_METHODS: dict[str, Callable[[dict[str, Any]], object]] = {
+    "detect": _detect,
+    "check": _check,
+    "convert": _convert,
+    "cli": _cli,
+}
@@ -0,0 +1,281 @@
+"""
+Nomage - character signatures.
+
+This module computes cheap character signatures of identifiers, and analyzes the
+regular expressions of naming conventions to know which signatures they could
+possibly match. It allows ruling out conventions before running any regex.
+
+A signature is a small bitmask made of the category of the first character, and
+of flags telling if the identifier has underscores, hyphens, or is all lower or
+upper case.
+"""
+
+import re
+import sys
+from dataclasses import dataclass
+from typing import Any, TypeAlias
+
+if sys.version_info >= (3, 11):
+    from re import _constants as sre_constants  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+else:
+    import sre_constants
+    import sre_parse
+
+# Parsed regex items are untyped tuples of opcode and argument.
+_Items: TypeAlias = Any
+
+# Character categories
+UNDERSCORE = 1
+HYPHEN = 2
+LOWER = 4
+UPPER = 8
+OTHER = 16
+ANY_CATEGORY = UNDERSCORE | HYPHEN | LOWER | UPPER | OTHER
+
+# Signature flags, above the first character category
+HAS_UNDERSCORE = 32
+HAS_HYPHEN = 64
+IS_LOWER = 128
+IS_UPPER = 256
+
+_MAX_RANGE_SCAN = 256
+_ASCII_SIZE = 128
+
+
+def char_category(char: str) -> int:
+    """Compute the category of a single character."""
+    if char == "_":
+        return UNDERSCORE
+    if char == "-":
+        return HYPHEN
+    if char.islower():
+        return LOWER
+    if char.isupper():
+        return UPPER
+    return OTHER
+
+
+_ASCII_CATEGORIES = {chr(c): char_category(chr(c)) for c in range(128)}
+
+
+def signature(id_str: str) -> int:
+    """
+    Compute the signature of a non-empty identifier.
+
+    Every step is a single C-level string operation, there is no Python loop
+    over the characters.
+    """
+    return (
+        (_ASCII_CATEGORIES.get(id_str[0]) or char_category(id_str[0]))
+        | ("_" in id_str) << 5
+        | ("-" in id_str) << 6
+        | id_str.islower() << 7
+        | id_str.isupper() << 8
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RegexSignature:
+    """
+    Character categories a regular expression could possibly match.
+
+    Attributes:
+        alphabet: Categories of the characters a full match could contain.
+        first: Categories of the first character of a match.
+    """
+
+    alphabet: int
+    first: int
+
+    def accepts(self, sig: int) -> bool:
+        """Check if an identifier with signature `sig` could be matched."""
+        required = (
+            (sig & HAS_UNDERSCORE and UNDERSCORE)
+            | (sig & HAS_HYPHEN and HYPHEN)
+            | (sig & IS_LOWER and LOWER)
+            | (sig & IS_UPPER and UPPER)
+        )
+        return not required & ~self.alphabet and bool(sig & self.first)
+
+
+def analyze(regex: re.Pattern[str]) -> RegexSignature:
+    """
+    Analyze a regular expression to compute its signature.
+
+    The analysis is conservative: any construct it does not understand is
+    considered able to match any character.
+
+    Args:
+        regex: The compiled regular expression of a naming convention.
+
+    Returns:
+        The signature of the regular expression.
+    """
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:  # noqa: BLE001 # pragma: no cover
+        return RegexSignature(alphabet=ANY_CATEGORY, first=ANY_CATEGORY)
+    ignorecase = bool(regex.flags & re.IGNORECASE)
+    alphabet, first, nullable = _analyze_sequence(parsed, ignorecase)
+    # Without end anchor, characters after the match are not constrained.
+    if regex.flags & re.MULTILINE or not _is_end_anchored(parsed):
+        alphabet = ANY_CATEGORY
+    if nullable:
+        first = ANY_CATEGORY
+    return RegexSignature(alphabet=alphabet, first=first)
+
+
+def matches_ascii_only(regex: re.Pattern[str]) -> bool:
+    """
+    Tell if a regular expression can only match ASCII characters.
+
+    Such an expression matches a text like its bytes variant matches the UTF-8
+    encoding of the text: both stop at the first non-ASCII character. The analysis
+    is conservative: any construct it does not understand may match any character.
+
+    Args:
+        regex: The compiled regular expression of a naming convention.
+
+    Returns:
+        True if no match of the regular expression can hold a non-ASCII character.
+    """
+    # Unicode case folding maps ASCII letters to others, like `k` to the Kelvin sign.
+    if regex.flags & re.IGNORECASE and not regex.flags & re.ASCII:
+        return False
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except Exception:  # noqa: BLE001 # pragma: no cover
+        return False
+    return _is_ascii_only(parsed)
+
+
+def _analyze_sequence(items: _Items, ignorecase: bool) -> tuple[int, int, bool]:
+    alphabet, first, nullable = 0, 0, True
+    for op, av in items:
+        item_alphabet, item_first, item_nullable = _analyze_item(op, av, ignorecase)
+        alphabet |= item_alphabet
+        if nullable:
+            first |= item_first
+        nullable = nullable and item_nullable
+    return alphabet, first, nullable
+
+
+def _analyze_item(  # noqa: C901, PLR0911
+    op: _Items, av: _Items, ignorecase: bool
+) -> tuple[int, int, bool]:
+    if op is sre_constants.LITERAL:
+        cats = _literal_categories(av, ignorecase)
+        return cats, cats, False
+    if op is sre_constants.IN:
+        cats = _set_categories(av, ignorecase)
+        return cats, cats, False
+    if op in {sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT}:
+        # Zero-width: ignoring a constraint can only widen the signature.
+        return 0, 0, True
+    if op in _REPEAT_OPS:
+        min_, max_, item = av
+        if max_ == 0:
+            return 0, 0, True
+        alphabet, first, nullable = _analyze_sequence(item, ignorecase)
+        return alphabet, first, nullable or min_ == 0
+    if op is sre_constants.SUBPATTERN:
+        _, add_flags, del_flags, item = av
+        if add_flags & re.IGNORECASE:
+            ignorecase = True
+        elif del_flags & re.IGNORECASE:
+            ignorecase = False
+        return _analyze_sequence(item, ignorecase)
+    if op is sre_constants.BRANCH:
+        alphabet, first, nullable = 0, 0, False
+        for item in av[1]:
+            b_alphabet, b_first, b_nullable = _analyze_sequence(item, ignorecase)
+            alphabet |= b_alphabet
+            first |= b_first
+            nullable = nullable or b_nullable
+        return alphabet, first, nullable
+    if op is _ATOMIC_GROUP:  # pragma: no cover
+        return _analyze_sequence(av, ignorecase)
+    return ANY_CATEGORY, ANY_CATEGORY, True
+
+
+def _literal_categories(code: int, ignorecase: bool) -> int:
+    char = chr(code)
+    if ignorecase:
+        return char_category(char.lower()) | char_category(char.upper())
+    return char_category(char)
+
+
+def _set_categories(items: _Items, ignorecase: bool) -> int:
+    cats = 0
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            cats |= _literal_categories(av, ignorecase)
+        elif op in {sre_constants.RANGE, sre_constants.RANGE_UNI_IGNORE}:
+            low, high = av
+            if high - low > _MAX_RANGE_SCAN:
+                return ANY_CATEGORY
+            for code in range(low, high + 1):
+                cats |= _literal_categories(
+                    code, ignorecase or op is sre_constants.RANGE_UNI_IGNORE
+                )
+        elif op is sre_constants.CATEGORY and av is sre_constants.CATEGORY_DIGIT:
+            cats |= OTHER
+        else:
+            return ANY_CATEGORY
+    return cats
+
+
+def _is_ascii_only(items: _Items) -> bool:
+    return all(_is_ascii_item(op, av) for op, av in items)
+
+
+def _is_ascii_item(op: _Items, av: _Items) -> bool:  # noqa: PLR0911
+    if op is sre_constants.LITERAL:
+        return bool(av < _ASCII_SIZE)
+    if op is sre_constants.IN:
+        return all(_is_ascii_set_item(*item) for item in av)
+    if op is sre_constants.AT:
+        # Word boundaries depend on the class of the characters around them.
+        return av not in {sre_constants.AT_BOUNDARY, sre_constants.AT_NON_BOUNDARY}
+    if op in {sre_constants.ASSERT, sre_constants.ASSERT_NOT}:
+        return _is_ascii_only(av[1])
+    if op in _REPEAT_OPS:
+        return _is_ascii_only(av[2])
+    if op is sre_constants.SUBPATTERN:
+        return not av[1] & re.IGNORECASE and _is_ascii_only(av[3])
+    if op is sre_constants.BRANCH:
+        return all(map(_is_ascii_only, av[1]))
+    if op is _ATOMIC_GROUP:  # pragma: no cover
+        return _is_ascii_only(av)
+    return False
+
+
+def _is_ascii_set_item(op: _Items, av: _Items) -> bool:
+    if op is sre_constants.LITERAL:
+        return bool(av < _ASCII_SIZE)
+    if op is sre_constants.RANGE:
+        return bool(av[1] < _ASCII_SIZE)
+    # Negated sets, categories like digits, and case-insensitive ranges.
+    return False
+
+
+def _is_end_anchored(items: _Items) -> bool:
+    if not items:
+        return False
+    op, av = items[-1]
+    if op is sre_constants.AT:
+        return av in {sre_constants.AT_END, sre_constants.AT_END_STRING}
+    if op is sre_constants.SUBPATTERN:
+        return _is_end_anchored(av[-1])
+    if op is sre_constants.BRANCH:
+        return all(_is_end_anchored(item) for item in av[1])
+    return False
+
+
+_REPEAT_OPS = {
+    getattr(sre_constants, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre_constants, name)
+}
+_ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
@@ -0,0 +1,166 @@
+"""
+Nomage - direct transcoders.
+
+This module builds specialized transcoders converting an identifier of a built-in
+naming convention straight to another convention, without parsing it into
+components first. Most pairs of built-in conventions only differ by their
+separator and case, so that a conversion is one or two string method calls:
+snake_case to kebab-case is a `str.replace`, snake_case to CONSTANT_CASE is a
+`str.upper`.
+
+Transcoders are only valid for identifiers matching the source convention, which
+is why they are specialized for built-in conventions only: their regular
+expressions guarantee ASCII identifiers with well-formed components.
+"""
+
+from collections.abc import Callable, Mapping
+from functools import partial
+from operator import methodcaller
+
+from nomage._builtins import _builtin_convention, _Joiner
+from nomage.convention import NamingConvention
+from nomage.tokenizer import _CASE_FINDALL
+
+# How built-in conventions split identifiers: their tokenizer ("none" for a single
+# component, "case" on case boundaries, or "sep" on their separator), their
+# separator, and the case of their letters if uniform.
+_SOURCES: Mapping[str, tuple[str, str, str | None]] = {
+    "flatcase": ("none", "", "lower"),
+    "UPPERCASE": ("none", "", "upper"),
+    "camelCase": ("case", "", None),
+    "PascalCase": ("case", "", None),
+    "snake_case": ("sep", "_", "lower"),
+    "ALL_CAPS": ("sep", "_", "upper"),
+    "camel_Snake_Case": ("sep", "_", None),
+    "kebab-case": ("sep", "-", "lower"),
+    "COBOL-CASE": ("sep", "-", "upper"),
+    "Train-Case": ("sep", "-", None),
+}
+
+_RECASE: Mapping[str, Callable[[str], str]] = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "capitalize": str.capitalize,
+}
+
+
+def specialize(
+    source: NamingConvention, target: NamingConvention
+) -> Callable[[str], str] | None:
+    """
+    Build a direct transcoder between two naming conventions, if there is one.
+
+    Args:
+        source: The naming convention of the identifiers to convert.
+        target: The naming convention to convert identifiers to.
+
+    Returns:
+        A function converting an identifier matching `source` to `target`, or
+        None if the source is not built-in or the target does not join components.
+    """
+    spec = _SOURCES.get(source.names[0])
+    if (
+        spec is None
+        or _builtin_convention(source.names[0]) is not source
+        or not isinstance(target.converter, _Joiner)
+    ):
+        return None
+    kind, separator, case = spec
+    joiner = target.converter
+    if kind == "none":
+        # A single component, only the case of its first letter matters.
+        return _same if joiner.first_case == case else _RECASE[joiner.first_case]
+    if kind == "case":
+        return _specialize_case(source, joiner)
+    return _specialize_separator(separator, case, joiner)
+
+
+def _specialize_case(
+    source: NamingConvention, joiner: _Joiner
+) -> Callable[[str], str] | None:
+    # Words of camelCase and PascalCase after the first one are already
+    # capitalized, only the case of the first letter may have to change.
+    first, rest = joiner.first_case, joiner.rest_case
+    recase: Callable[[str], str] | None
+    if first == rest and first != "capitalize":
+        recase = _RECASE[first]
+    elif rest != "capitalize" or first == "upper":
+        return None
+    elif (first == "lower") == (source.names[0] == "camelCase"):
+        recase = None
+    else:
+        recase = _lower_first if first == "lower" else _upper_first
+    if not joiner.separator:
+        return recase or _same
+    split = partial(_join_case, joiner.separator)
+    return split if recase is None else partial(_split_case_recase, split, recase)
+
+
+def _specialize_separator(
+    separator: str, case: str | None, joiner: _Joiner
+) -> Callable[[str], str] | None:
+    first, rest = joiner.first_case, joiner.rest_case
+    if first == rest and first != "capitalize":
+        if case == first:
+            return (
+                _same
+                if separator == joiner.separator
+                else methodcaller("replace", separator, joiner.separator)
+            )
+        recase = _RECASE[first]
+        if separator == joiner.separator:
+            return recase
+        return partial(_recase_replace, recase, separator, joiner.separator)
+    if rest != "capitalize" or first == "upper":
+        return None
+    return partial(
+        _split_capitalize,
+        separator,
+        joiner.separator,
+        first == "lower",
+        case == "lower",
+    )
+
+
+def _join_case(separator: str, id_str: str, /) -> str:
+    # Words are split before upper case letters, they keep their case.
+    return separator.join(_CASE_FINDALL(id_str))
+
+
+def _same(id_str: str, /) -> str:
+    return id_str
+
+
+def _lower_first(id_str: str, /) -> str:
+    return id_str[:1].lower() + id_str[1:]
+
+
+def _upper_first(id_str: str, /) -> str:
+    return id_str[:1].upper() + id_str[1:]
+
+
+def _recase_replace(
+    recase: Callable[[str], str], separator: str, new_separator: str, id_str: str, /
+) -> str:
+    return recase(id_str).replace(separator, new_separator)
+
+
+def _split_case_recase(
+    split: Callable[[str], str], recase: Callable[[str], str], id_str: str, /
+) -> str:
+    return recase(split(id_str))
+
+
+def _split_capitalize(
+    separator: str,
+    new_separator: str,
+    lower_first: bool,
+    is_lower: bool,
+    id_str: str,
+    /,
+) -> str:
+    words = (id_str if is_lower else id_str.lower()).split(separator)
+    first = words[0] if lower_first else words[0].capitalize()
+    if len(words) == 1:
+        return first
+    return new_separator.join((first, *map(str.capitalize, words[1:])))
@@ -0,0 +1,78 @@
+"""
+Nomage - adaptive ordering.
+
+This module provides an opt-in adaptive ordering of detection. When enabled, each
+detection engine counts the identifiers detected in each naming convention, and
+once a convention reaches `interval` detections, reorders its combined regular
+expression so that the most frequent conventions are tried first. Counts are halved
+at each reordering, so that the order follows the changes of the workload.
+
+The detected convention stays the first matching one in the order of the
+conventions. A convention only moves ahead of an earlier one when their regular
+expressions are proven disjoint: no identifier matches both, so none can tell their
+order. For the built-in conventions, the ones starting with an uppercase letter can
+move ahead of the ones starting with a lowercase letter, and conversely. The proofs are
+computed once per engine, on its first reordering.
+
+Adaptive ordering is disabled by default, and then costs a flag check on the hot
+path. When enabled, each detection also costs a counter increment, which is about
+what moving a group of conventions ahead saves: it pays off on skewed workloads
+whose frequent conventions come late in the order, and are disjoint from many
+earlier ones. Threads update the counts without a lock: concurrent updates may be
+lost, which only makes the counts approximate. Engines keep their order once
+disabled, and identifiers detected in buffers by `detect_bytes` are not counted.
+Worker processes of `nomage.parallel` are not affected.
+
+Examples:
+    >>> from nomage.engine import DetectionEngine
+    >>> from nomage.naming import BUILTINS_CONVENTIONS
+    >>> engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    >>> enable_adaptive_ordering(interval=2)
+    >>> [
+    ...     engine.detect(id_str).names[0]
+    ...     for id_str in ("Content-Type", "X-Api-Key")
+    ... ]
+    ['Train-Case', 'Train-Case']
+    >>> [nc.names[0] for nc in engine.order][:3]
+    ['UPPERCASE', 'PascalCase', 'ALL_CAPS']
+    >>> disable_adaptive_ordering()
+"""
+
+DEFAULT_INTERVAL = 4096
+
+
+class _Ordering:
+    """Settings of adaptive ordering, shared by all engines."""
+
+    __slots__ = ("enabled", "interval")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.interval = DEFAULT_INTERVAL
+
+
+# Checked by the hot path, disabled until `enable_adaptive_ordering`.
+_ORDERING = _Ordering()
+
+
+def enable_adaptive_ordering(interval: int = DEFAULT_INTERVAL) -> None:
+    """
+    Enable the adaptive ordering of detection.
+
+    Args:
+        interval: The number of detections of a convention which triggers the
+            reordering of its engine.
+
+    Raises:
+        ValueError: Raised when `interval` is not positive.
+    """
+    if interval <= 0:
+        msg = f"ordering interval must be positive, got {interval}"
+        raise ValueError(msg)
+    _ORDERING.interval = interval
+    _ORDERING.enabled = True
+
+
+def disable_adaptive_ordering() -> None:
+    """Disable the adaptive ordering, engines keep the order they adapted to."""
+    _ORDERING.enabled = False
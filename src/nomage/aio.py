@@ -0,0 +1,170 @@
+"""
+Nomage - asyncio streaming conversion.
+
+This module provides an async variant of `convert_many`, for services converting
+identifiers from async iterators, like message queues or streaming HTTP bodies,
+without blocking their event loop.
+
+Input is read in chunks, and control is given back to the event loop after each
+chunk, so that other tasks wait at most the time of converting one chunk. Chunks
+can also be converted on an executor, which keeps the event loop free while they
+are converted. Input is only read as results are consumed, with a single chunk in
+flight, so that a slow consumer slows reading down instead of filling memory.
+
+Examples:
+    >>> import asyncio
+    >>> async def main():
+    ...     return [
+    ...         r.converted
+    ...         async for r in aconvert_many(["myId", "x__"], "snake")
+    ...     ]
+    >>> asyncio.run(main())
+    ['my_id', None]
+"""
+
+import asyncio
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+)
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+
+from nomage.convention import NamingConvention
+from nomage.engine import get_engine
+from nomage.exceptions import UnrecognizedNamingConventionError
+from nomage.naming import (
+    BUILTINS_CONVENTIONS,
+    ConversionResult,
+    _registry_of,
+    _resolve_convention,
+)
+from nomage.parallel import _chunked, _converter
+from nomage.registry import ConventionRegistry
+
+DEFAULT_CHUNKSIZE = 256
+DEFAULT_OFFLOAD_THRESHOLD = 64
+
+_WORKER_CONVERTERS_MAX_SIZE = 16
+# Converters of worker processes, by the ids of their conventions and target.
+_worker_converters: dict[
+    tuple[int, ...],
+    tuple[tuple[NamingConvention, ...], NamingConvention, Callable[[str], str | None]],
+] = {}
+
+
+def aconvert_many(  # noqa: PLR0913
+    id_strs: AsyncIterable[str] | Iterable[str],
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+    *,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    executor: Executor | None = None,
+    offload_threshold: int = DEFAULT_OFFLOAD_THRESHOLD,
+) -> AsyncIterator[ConversionResult]:
+    """
+    Convert many str identifiers to a naming convention, cooperatively.
+
+    Results are the same as `convert_many`, in input order. A chunk of identifiers
+    from a slow async source is only converted once full, a smaller `chunksize`
+    lowers the latency of the first results.
+
+    Args:
+        id_strs: An async or sync iterable of identifier strings to convert.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+        chunksize: The number of identifiers converted at once, bounding the time
+            the event loop is blocked without an executor.
+        executor: An executor to convert chunks on, like a `ThreadPoolExecutor`
+            or a `ProcessPoolExecutor`. Chunks are converted in the event loop
+            if None.
+        offload_threshold: The minimum size of the chunks converted on the
+            executor, smaller ones are converted in the event loop.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+
+    Yields:
+        A result for each identifier, in input order.
+    """
+    target = _resolve_convention(nc, _registry_of(conventions))
+    engine = get_engine(conventions)
+    convert: Callable[[list[str]], list[str | None]]
+    if isinstance(executor, ProcessPoolExecutor):
+        convert = partial(_convert_chunk, engine.conventions, target)
+    else:
+        # The event loop and threads share the engine and compiled converters.
+        convert = partial(_convert_all, _converter(engine.detect, target))
+    return _aconvert_many(id_strs, convert, chunksize, executor, offload_threshold)
+
+
+async def _aconvert_many(
+    id_strs: AsyncIterable[str] | Iterable[str],
+    convert: Callable[[list[str]], list[str | None]],
+    chunksize: int,
+    executor: Executor | None,
+    offload_threshold: int,
+) -> AsyncIterator[ConversionResult]:
+    loop = asyncio.get_running_loop()
+    async for chunk in _achunked(id_strs, chunksize):
+        if executor is not None and len(chunk) >= offload_threshold:
+            converted = await loop.run_in_executor(executor, convert, chunk)
+        else:
+            converted = convert(chunk)
+            # Other tasks run between chunks, even if the source never suspends.
+            await asyncio.sleep(0)
+        for id_str, value in zip(chunk, converted, strict=True):
+            if value is None:
+                yield ConversionResult(
+                    id_str, None, UnrecognizedNamingConventionError(id_str)
+                )
+            else:
+                yield ConversionResult(id_str, value, None)
+
+
+async def _achunked(
+    items: AsyncIterable[str] | Iterable[str], size: int
+) -> AsyncIterator[list[str]]:
+    if not isinstance(items, AsyncIterable):
+        for chunk in _chunked(items, size):
+            yield chunk
+        return
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _convert_all(
+    convert: Callable[[str], str | None], id_strs: list[str]
+) -> list[str | None]:
+    return list(map(convert, id_strs))
+
+
+def _convert_chunk(
+    conventions: tuple[NamingConvention, ...],
+    target: NamingConvention,
+    id_strs: list[str],
+) -> list[str | None]:
+    # Module-level, so that it can be sent to process pools with its arguments.
+    # Built-in conventions are unpickled to the same objects, so that workers only
+    # build their converter once.
+    key = (*map(id, conventions), id(target))
+    cached = _worker_converters.get(key)
+    if cached is None:
+        if len(_worker_converters) >= _WORKER_CONVERTERS_MAX_SIZE:
+            _worker_converters.clear()
+        convert = _converter(get_engine(conventions).detect, target)
+        # The conventions are held with their converter, so their ids stay unique.
+        cached = _worker_converters[key] = (conventions, target, convert)
+    return _convert_all(cached[2], id_strs)
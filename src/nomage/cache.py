@@ -0,0 +1,140 @@
+"""
+Nomage - memoization.
+
+This module provides an opt-in, bounded LRU cache for detection and conversion.
+When enabled, `naming` results are cached by identifier string and set of
+conventions, and `Identifier.to` results by components and target convention.
+Workloads converting the same identifiers over and over skip detection, parsing
+and conversion entirely on cache hits. The cache is shared by all threads, and
+guarded by a lock.
+
+Examples:
+    >>> from nomage import naming
+    >>> enable_cache(maxsize=1024)
+    >>> naming("myIdentifier").to("snake")
+    'my_identifier'
+    >>> naming("myIdentifier").to("snake")
+    'my_identifier'
+    >>> cache_info()
+    CacheInfo(hits=2, misses=2, maxsize=1024, currsize=2)
+    >>> disable_cache()
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_MAXSIZE = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class CacheInfo:
+    """
+    Statistics of the detection and conversion cache.
+
+    Attributes:
+        hits: Number of lookups found in the cache.
+        misses: Number of lookups not found in the cache.
+        maxsize: Maximum number of entries, 0 when the cache is disabled.
+        currsize: Current number of entries.
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _LRUCache:
+    """Bounded mapping evicting the least recently used entries, thread-safe."""
+
+    __slots__ = ("_data", "_lock", "hits", "maxsize", "misses")
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        # Without it, an entry evicted by another thread between the lookup and
+        # `move_to_end` of a hit would raise, and counters would lose updates.
+        self._lock = threading.Lock()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:  # noqa: ANN401
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:  # noqa: ANN401
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Shared by the detection and conversion paths, disabled until `enable_cache`.
+_CACHE = _LRUCache()
+
+
+def enable_cache(maxsize: int = DEFAULT_MAXSIZE) -> None:
+    """
+    Enable the detection and conversion cache, or resize it.
+
+    Args:
+        maxsize: Maximum number of cached results, least recently used results
+            are evicted first.
+
+    Raises:
+        ValueError: Raised when `maxsize` is not positive.
+    """
+    if maxsize <= 0:
+        msg = f"cache maxsize must be positive, got {maxsize}"
+        raise ValueError(msg)
+    _CACHE.resize(maxsize)
+
+
+def disable_cache() -> None:
+    """Disable the detection and conversion cache, and clear it."""
+    _CACHE.resize(0)
+    _CACHE.clear()
+
+
+def clear_cache() -> None:
+    """Clear the cached results and reset the hit and miss counters."""
+    _CACHE.clear()
+
+
+def cache_info() -> CacheInfo:
+    """
+    Get the statistics of the detection and conversion cache.
+
+    Returns:
+        The current hit and miss counters and sizes of the cache.
+    """
+    return CacheInfo(
+        hits=_CACHE.hits,
+        misses=_CACHE.misses,
+        maxsize=_CACHE.maxsize,
+        currsize=len(_CACHE),
+    )
@@ -8,7 +8,16 @@ parsing, and transformation of identifiers according to specific naming patterns
 
 import re
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import count
+from typing import Any
+
+from nomage._buffers import NON_ASCII, Buffer, bytes_regex, decode
+
+# Integer ids of the match regexes, conventions with equal regexes share their id.
+_UIDS: dict[tuple[str | bytes, int], int] = {}
+_NEXT_UID = count()
 
 
 @dataclass(frozen=True, slots=True)
@@ -27,12 +36,31 @@ class NamingConvention:
             components in lower case.
         converter: A function that takes a tuple of components and returns an
             identifier formatted according to this convention.
+        uid: An integer id, equal for conventions with equal match regexes and
+            stable for the life of the process, used for hashing and equality.
     """
 
     names: tuple[str, ...]
     match_regex: re.Pattern[str]
     parser: Callable[[str], tuple[str, ...]]
     converter: Callable[[tuple[str, ...]], str]
+    uid: int = field(init=False, repr=False, compare=False)
+    _name_indexes: frozenset[str] = field(init=False, repr=False, compare=False)
+    # Bytes variant of the match regex, compiled on first use by `match_bytes`.
+    _bytes_regex: tuple[re.Pattern[bytes] | None, bool] | None = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        key = (self.match_regex.pattern, self.match_regex.flags)
+        uid = _UIDS.get(key)
+        if uid is None:
+            # `next` is atomic, so concurrent registrations get distinct ids.
+            uid = _UIDS.setdefault(key, next(_NEXT_UID))
+        object.__setattr__(self, "uid", uid)
+        name_indexes = frozenset(map(_name_index, self.names))
+        object.__setattr__(self, "_name_indexes", name_indexes)
+        object.__setattr__(self, "_bytes_regex", None)
 
     @staticmethod
     def get_name_index(name: str) -> str:
@@ -58,14 +86,70 @@ class NamingConvention:
         """
         return self.match_regex.match(id_str) is not None
 
+    def match_bytes(
+        self, data: Buffer, start: int = 0, end: int | None = None, /
+    ) -> bool:
+        """
+        Check if an identifier held in a buffer matches this naming convention.
+
+        The identifier is matched in place by a bytes variant of the match regex,
+        no str is built from it. It is only decoded when it has non-ASCII
+        characters the regex could match, or when the regex has no bytes variant.
+
+        Examples:
+            >>> from nomage import builtins_conventions
+            >>> snake = builtins_conventions()["snake"]
+            >>> snake.match_bytes(b"user_id = userId", 0, 7)
+            True
+            >>> snake.match_bytes(b"user_id = userId", 10)
+            False
+
+        Args:
+            data: The buffer, like bytes, a memoryview or an mmap.
+            start: The offset of the identifier in the buffer.
+            end: The offset of the end of the identifier, the end of the buffer if
+                None.
+
+        Returns:
+            True if the identifier matches the convention's regular expression,
+            False otherwise, or if it is not valid UTF-8.
+        """
+        compiled = self._bytes_regex
+        if compiled is None:
+            compiled = bytes_regex(self.match_regex)
+            object.__setattr__(self, "_bytes_regex", compiled)
+        regex, checked = compiled
+        if end is None:
+            end = len(data)
+        if regex is None or (checked and NON_ASCII.search(data, start, end)):
+            id_str = decode(data, start, end)
+            return id_str is not None and self.match(id_str)
+        return regex.match(data, start, end) is not None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Built-in conventions are pickled by name, and stay unique once unpickled.
+        from nomage._builtins import _builtin_convention  # noqa: PLC0415
+
+        name = self.names[0]
+        if _builtin_convention(name) is self:
+            return _builtin_convention, (name,)
+        return NamingConvention, (
+            self.names,
+            self.match_regex,
+            self.parser,
+            self.converter,
+        )
+
     def __hash__(self) -> int:
-        return hash(self.match_regex)  # pragma: no cover
+        return self.uid
 
     def __eq__(self, value: object, /) -> bool:
         if isinstance(value, NamingConvention):
-            return self.match_regex == value.match_regex
+            return self.uid == value.uid
         if isinstance(value, str):
-            return any(
-                self.get_name_index(value) == self.get_name_index(n) for n in self.names
-            )
+            return _name_index(value) in self._name_indexes
         return False
+
+
+# Convention names are compared over and over, their indexes are memoized.
+_name_index = lru_cache(maxsize=1024)(NamingConvention.get_name_index)
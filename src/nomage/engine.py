@@ -0,0 +1,461 @@
+"""
+Nomage - detection engine.
+
+This module provides a compiled detection engine built from a set of naming
+conventions. Instead of trying each convention's regular expression one after
+the other, the engine combines them into a single alternation so that the first
+matching convention is found in one scan, with the same first-match order.
+
+The engine also holds a character signature index: a cheap signature of the
+identifier (first character case, separators, all lower or upper case) maps to
+the conventions whose regular expression could possibly match it. It narrows
+down the regexes to run when they have to be tried one by one.
+
+Both are built lazily, on first use, so that creating an engine (and importing
+Nomage) does not pay for regular expression compilation and analysis.
+
+With adaptive ordering enabled, see `nomage.adaptive`, the engine also counts the
+identifiers detected in each convention, and periodically recombines the regular
+expressions with the most frequent conventions first, as far as the proven
+disjointness of their languages allows.
+"""
+
+import re
+import threading
+import warnings
+from collections.abc import Iterable, Iterator, Mapping
+from time import perf_counter_ns
+from typing import TypeAlias
+
+from nomage._buffers import NON_ASCII, Buffer, bytes_regex, decode
+from nomage._signature import RegexSignature, analyze, signature
+from nomage.adaptive import _ORDERING
+from nomage.convention import NamingConvention
+from nomage.instrument import _RECORDER
+
+_ENGINES_MAX_SIZE = 64
+_ENGINES: dict[tuple[int, ...], "DetectionEngine"] = {}
+# Guards the eviction and insertion of engines, lookups are lock-free.
+_ENGINES_LOCK = threading.Lock()
+
+# Group references would be shifted by the wrapping groups of the alternation.
+_GROUP_REFERENCE_REGEX = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+# Mark the combined regular expressions as not compiled yet.
+_UNCOMPILED = re.compile("")
+_UNCOMPILED_BYTES = re.compile(b"")
+
+# The combined regex, the convention of each of its groups, and the number of
+# matches of each group, for adaptive ordering. Swapped as a whole.
+_Compiled: TypeAlias = tuple[
+    re.Pattern[str] | None, tuple[NamingConvention, ...], list[int]
+]
+
+
+class DetectionEngine:
+    """
+    Detect the first matching naming convention of a set in a single scan.
+
+    The regular expressions of the conventions are combined into one alternation,
+    each wrapped in its own capturing group, in the order of the given conventions.
+    Because the alternatives of a regular expression are tried from left to right,
+    the detected convention is the same as when matching each convention in turn.
+
+    When the expressions cannot be combined safely (different or verbose flags,
+    bytes patterns, group references), the engine falls back to matching the
+    conventions sequentially. Conventions are then narrowed down by a signature
+    index first: a few string operations build a small bitmask, which maps to the
+    conventions that could possibly match the identifier. Only their regular
+    expressions are run.
+
+    Examples:
+        >>> from nomage.naming import BUILTINS_CONVENTIONS
+        >>> engine = DetectionEngine(BUILTINS_CONVENTIONS)
+        >>> engine.detect("my_identifier").names[0]
+        'snake_case'
+        >>> engine.detect("my__identifier")  # None
+    """
+
+    __slots__ = (
+        "_bytes_checked",
+        "_bytes_compiled",
+        "_candidates",
+        "_compiled",
+        "_conventions",
+        "_precedences",
+        "_signatures",
+    )
+
+    def __init__(self, conventions: Iterable[NamingConvention], /) -> None:
+        # A convention listed twice can never be the first match the second time.
+        self._conventions = tuple({id(nc): nc for nc in conventions}.values())
+        self._compiled: _Compiled = (_UNCOMPILED, (), [])
+        self._bytes_compiled: tuple[
+            re.Pattern[bytes] | None, tuple[NamingConvention, ...]
+        ] = (_UNCOMPILED_BYTES, ())
+        # Whether identifiers with non-ASCII bytes are decoded, not matched in place.
+        self._bytes_checked = True
+        # For each convention, the indexes of the earlier ones it may not pass.
+        self._precedences: tuple[frozenset[int], ...] | None = None
+        self._signatures: dict[int, RegexSignature | None] = dict.fromkeys(
+            map(id, self._conventions)
+        )
+        # Empty identifiers have no signature, they are mapped to the full set.
+        self._candidates = {0: self._conventions}
+
+    @property
+    def conventions(self) -> tuple[NamingConvention, ...]:
+        """The distinct naming conventions of the engine, in detection order."""
+        return self._conventions
+
+    @property
+    def order(self) -> tuple[NamingConvention, ...]:
+        """
+        The naming conventions in the order their regular expressions are tried.
+
+        It is the order of `conventions`, unless adaptive ordering moved frequent
+        conventions ahead. Identifiers are detected the same in both.
+        """
+        regex, groups, _ = self._compiled
+        if regex is None or regex is _UNCOMPILED:
+            return self._conventions
+        return _group_order(groups)
+
+    def detect(self, id_str: str, /) -> NamingConvention | None:
+        """
+        Find the first naming convention matching the given identifier.
+
+        Args:
+            id_str: The identifier string to detect the convention of.
+
+        Returns:
+            The first matching naming convention, or None if none is matching.
+        """
+        compiled = self._compiled
+        regex, groups, counts = compiled
+        if regex is _UNCOMPILED or _RECORDER.enabled:
+            return self._detect_slow(id_str)
+        if regex is None:
+            return self._match(id_str)
+        m = regex.match(id_str)
+        if m is None:
+            return None
+        index = m.lastindex or 0
+        if _ORDERING.enabled:
+            # `_count`, inlined to keep the cost of a detection to an increment.
+            hits = counts[index] + 1
+            counts[index] = hits
+            if hits >= _ORDERING.interval:
+                self._reorder(compiled)
+        return groups[index]
+
+    def detect_bytes(
+        self, data: Buffer, start: int = 0, end: int | None = None, /
+    ) -> NamingConvention | None:
+        """
+        Find the first naming convention matching an identifier held in a buffer.
+
+        The identifier is matched in place by a bytes variant of the combined
+        regular expression, no str is built from it. It is decoded and detected
+        like `detect` does when it has non-ASCII characters the conventions could
+        match, when the engine has no combined regular expression, or when
+        instrumentation is enabled. Identifiers matched in place are not counted
+        by adaptive ordering.
+
+        Examples:
+            >>> from nomage.naming import BUILTINS_CONVENTIONS
+            >>> engine = DetectionEngine(BUILTINS_CONVENTIONS)
+            >>> data = b"user_id = getUserId()"
+            >>> engine.detect_bytes(data, 10, 19).names[0]
+            'camelCase'
+
+        Args:
+            data: The buffer, like bytes, a memoryview or an mmap.
+            start: The offset of the identifier in the buffer.
+            end: The offset of the end of the identifier, the end of the buffer if
+                None.
+
+        Returns:
+            The first matching naming convention, or None if none is matching or
+            the identifier is not valid UTF-8.
+        """
+        regex, groups = self._bytes_compiled
+        if regex is _UNCOMPILED_BYTES:
+            regex, groups = self._bytes_compiled = self._compile_bytes()
+        if end is None:
+            end = len(data)
+        if (
+            regex is None
+            or _RECORDER.enabled
+            or (self._bytes_checked and NON_ASCII.search(data, start, end))
+        ):
+            id_str = decode(data, start, end)
+            return None if id_str is None else self.detect(id_str)
+        m = regex.match(data, start, end)
+        if m is None:
+            return None
+        return groups[m.lastindex or 0]
+
+    def candidates(self, id_str: str, /) -> tuple[NamingConvention, ...]:
+        """
+        List the naming conventions that could possibly match the given identifier.
+
+        Args:
+            id_str: The identifier string.
+
+        Returns:
+            The candidate naming conventions, in detection order.
+        """
+        sig = signature(id_str) if id_str else 0
+        candidates = self._candidates.get(sig)
+        if candidates is None:
+            candidates = self._candidates[sig] = tuple(
+                nc for nc in self._conventions if self._signature(nc).accepts(sig)
+            )
+        return candidates
+
+    def check(self, id_str: str, nc: NamingConvention, /) -> bool:
+        """
+        Check if the identifier matches a naming convention.
+
+        The regular expression of the convention is only run when the signature
+        of the identifier does not already rule the convention out.
+
+        Args:
+            id_str: The identifier string to check.
+            nc: The naming convention to check against.
+
+        Returns:
+            True if the identifier matches the convention, False otherwise.
+        """
+        if id_str and not self._signature(nc).accepts(signature(id_str)):
+            return False
+        return nc.match(id_str)
+
+    def _detect_slow(self, id_str: str) -> NamingConvention | None:
+        # First detection, compiling the engine, or instrumented detection. Threads
+        # racing to compile build equal regexes, the last one is kept.
+        if self._compiled[0] is _UNCOMPILED:
+            self._compiled = self._compile()
+        if not _RECORDER.enabled:
+            return self._match(id_str)
+        start = perf_counter_ns()
+        nc = self._match(id_str)
+        duration_ns = perf_counter_ns() - start
+        candidates = self.candidates(id_str)
+        order = self.order
+        if order != self._conventions:
+            # Attempts follow the adapted order.
+            ids = set(map(id, candidates))
+            candidates = tuple(c for c in order if id(c) in ids)
+        _RECORDER.record_detection(id_str, nc, candidates, duration_ns)
+        return nc
+
+    def _match(self, id_str: str) -> NamingConvention | None:
+        compiled = self._compiled
+        regex, groups, _ = compiled
+        if regex is not None:
+            m = regex.match(id_str)
+            if m is None:
+                return None
+            index = m.lastindex or 0
+            if _ORDERING.enabled:
+                self._count(compiled, index)
+            return groups[index]
+        for nc in self.candidates(id_str):
+            if nc.match(id_str):
+                return nc
+        return None
+
+    def _count(self, compiled: _Compiled, index: int) -> None:
+        # Counters are shared without a lock, increments racing may be lost.
+        counts = compiled[2]
+        hits = counts[index] + 1
+        counts[index] = hits
+        if hits >= _ORDERING.interval:
+            self._reorder(compiled)
+
+    def _reorder(self, compiled: _Compiled) -> None:
+        # Threads racing to reorder compute the same order, the last one is kept.
+        _, groups, counts = compiled
+        hits: dict[int, int] = {}
+        for index in range(1, len(counts)):
+            if counts[index]:
+                key = id(groups[index])
+                hits[key] = hits.get(key, 0) + counts[index]
+        precedences = self._precedences
+        if precedences is None:
+            precedences = self._precedences = _precedences(self._conventions)
+        order = tuple(
+            self._conventions[i]
+            for i in _adaptive_order(self._conventions, precedences, hits)
+        )
+        if order != _group_order(groups):
+            regex, groups = _combine(order)
+            if regex is None:  # pragma: no cover
+                return
+        else:
+            regex = compiled[0]
+        # Counts are halved, so that the order follows changes of the workload.
+        counts = [0] * len(groups)
+        outer: dict[int, int] = {}
+        for index in range(1, len(groups)):
+            # Matches count on the outer group of a convention, its first one.
+            outer.setdefault(id(groups[index]), index)
+        for key, index in outer.items():
+            counts[index] = hits.get(key, 0) >> 1
+        self._compiled = (regex, groups, counts)
+
+    def _compile_bytes(
+        self,
+    ) -> tuple[re.Pattern[bytes] | None, tuple[NamingConvention, ...]]:
+        if self._compiled[0] is _UNCOMPILED:
+            self._compiled = self._compile()
+        regex, groups, _ = self._compiled
+        if regex is None:
+            return None, ()
+        compiled, self._bytes_checked = bytes_regex(regex)
+        return compiled, groups
+
+    def _compile(self) -> _Compiled:
+        regex, groups = _combine(self._conventions)
+        return regex, groups, [0] * len(groups)
+
+    def _signature(self, nc: NamingConvention) -> RegexSignature:
+        nc_signature = self._signatures.get(id(nc))
+        if nc_signature is None:
+            nc_signature = analyze(nc.match_regex)
+            # Only conventions of the engine are kept alive, and their ids stable.
+            if id(nc) in self._signatures:
+                self._signatures[id(nc)] = nc_signature
+        return nc_signature
+
+    def __iter__(self) -> Iterator[NamingConvention]:
+        return iter(self._conventions)
+
+    def __len__(self) -> int:
+        return len(self._conventions)
+
+
+def get_engine(
+    conventions: Iterable[NamingConvention] | Mapping[str, NamingConvention], /
+) -> DetectionEngine:
+    """
+    Get a detection engine for the given naming conventions.
+
+    Engines are cached by the identity of the conventions they are built from,
+    so that passing the same conventions again does not recompile the engine.
+
+    Args:
+        conventions: An iterable of naming conventions, a mapping of naming
+            conventions by name like a `ConventionRegistry`, or a detection engine.
+
+    Returns:
+        The detection engine for the conventions, in the same order.
+    """
+    if isinstance(conventions, DetectionEngine):
+        return conventions
+    # Registries build their engine under their lock, safe from registrations.
+    engine = getattr(conventions, "engine", None)
+    if isinstance(engine, DetectionEngine):
+        return engine
+    # Mappings of conventions by name, like registries, detect with their values.
+    ncs = tuple(
+        conventions.values() if isinstance(conventions, Mapping) else conventions
+    )
+    # The cached engine holds the conventions, so their ids cannot be reused.
+    key = tuple(map(id, ncs))
+    engine = _ENGINES.get(key)
+    if engine is None:
+        with _ENGINES_LOCK:
+            # Another thread may have built it while waiting for the lock.
+            engine = _ENGINES.get(key)
+            if engine is None:
+                if len(_ENGINES) >= _ENGINES_MAX_SIZE:
+                    del _ENGINES[next(iter(_ENGINES))]
+                engine = _ENGINES[key] = DetectionEngine(ncs)
+    return engine
+
+
+def _group_order(
+    groups: tuple[NamingConvention, ...],
+) -> tuple[NamingConvention, ...]:
+    # The first group only pads the indexes, conventions follow in order.
+    return tuple({id(nc): nc for nc in groups[1:]}.values())
+
+
+def _precedences(
+    conventions: tuple[NamingConvention, ...],
+) -> tuple[frozenset[int], ...]:
+    # Only needed once adaptive ordering is enabled, kept off the import time.
+    from nomage._languages import disjoint  # noqa: PLC0415
+
+    # A convention may only pass the earlier ones no identifier can match with it.
+    return tuple(
+        frozenset(
+            i
+            for i, earlier in enumerate(conventions[:j])
+            if not disjoint(earlier.match_regex, nc.match_regex)
+        )
+        for j, nc in enumerate(conventions)
+    )
+
+
+def _adaptive_order(
+    conventions: tuple[NamingConvention, ...],
+    precedences: tuple[frozenset[int], ...],
+    hits: dict[int, int],
+) -> tuple[int, ...]:
+    # Greedily places, among the conventions whose precedences are placed, the one
+    # with the most hits with the conventions held back behind it, ties in the
+    # original order. Any such order detects like the original one: of two
+    # conventions matching an identifier, the earlier one still comes first.
+    followers = [{j} for j in range(len(conventions))]
+    for j in reversed(range(len(conventions))):
+        for i in precedences[j]:
+            followers[i] |= followers[j]
+    weights = [
+        sum(hits.get(id(conventions[j]), 0) for j in indexes) for indexes in followers
+    ]
+    placed: set[int] = set()
+    order: list[int] = []
+    while len(order) < len(conventions):
+        best = max(
+            (
+                i
+                for i in range(len(conventions))
+                if i not in placed and precedences[i] <= placed
+            ),
+            key=lambda i: (weights[i], -i),
+        )
+        placed.add(best)
+        order.append(best)
+    return tuple(order)
+
+
+def _combine(
+    conventions: tuple[NamingConvention, ...],
+) -> tuple[re.Pattern[str] | None, tuple[NamingConvention, ...]]:
+    patterns = [nc.match_regex for nc in conventions]
+    if not patterns or any(
+        not isinstance(p.pattern, str)
+        or p.flags != patterns[0].flags
+        or p.flags & re.VERBOSE
+        or _GROUP_REFERENCE_REGEX.search(p.pattern)
+        for p in patterns
+    ):
+        return None, ()
+
+    group_conventions: list[NamingConvention] = [conventions[0]]
+    for nc in conventions:
+        # The outer group closes last, so its index is the `lastindex` of a match.
+        group_conventions.extend([nc] * (nc.match_regex.groups + 1))
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            regex = re.compile(
+                "|".join(f"({p.pattern})" for p in patterns), patterns[0].flags
+            )
+    except (re.error, DeprecationWarning, FutureWarning):
+        return None, ()
+    return regex, tuple(group_conventions)
@@ -0,0 +1,288 @@
+"""
+Nomage - vectorized conversion of arrays and data frames.
+
+This module converts columns of identifiers at once: NumPy arrays, pandas Series
+and Index, and pyarrow arrays. Columns are dictionary encoded first, so that each
+distinct value is detected and converted once, whatever the number of rows. Values
+are then gathered back with the vectorized `take` of each library.
+
+The libraries are optional dependencies, installed with the `numpy`, `pandas` or
+`arrow` extras. They are only imported when converting a column of their type.
+
+Examples:
+    >>> import pandas as pd  # doctest: +SKIP
+    >>> events = pd.Series(
+    ...     ["userLogin", "userLogout", "bad__name"]
+    ... )  # doctest: +SKIP
+    >>> result = convert_array(events, "snake")  # doctest: +SKIP
+    >>> result.values.tolist()  # doctest: +SKIP
+    ['user_login', 'user_logout', 'bad__name']
+    >>> result.codes.tolist()  # doctest: +SKIP
+    [2, 2, -1]
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, cast
+
+from nomage.convention import NamingConvention
+from nomage.engine import DetectionEngine, get_engine
+from nomage.naming import (
+    BUILTINS_CONVENTIONS,
+    _registry_of,
+    _resolve_convention,
+    _transcoder,
+)
+from nomage.registry import ConventionRegistry
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    import pandas as pd
+    import pyarrow as pa
+
+# Codes of the values which are not identifiers.
+UNRECOGNIZED = -1
+MISSING = -2
+
+_ArrayT = TypeVar("_ArrayT")
+
+
+@dataclass(frozen=True, slots=True)
+class ArrayConversion(Generic[_ArrayT]):
+    """
+    Result of the conversion of a column of identifiers by `convert_array`.
+
+    Attributes:
+        values: The converted values, in a column of the same type as the input.
+            Unrecognized identifiers and missing values are kept as is.
+        codes: For each value, the index of its detected convention in
+            `conventions`, `UNRECOGNIZED` (-1) for unrecognized identifiers, or
+            `MISSING` (-2) for missing and non-string values.
+        conventions: The conventions the codes refer to, in detection order.
+    """
+
+    values: _ArrayT
+    codes: "npt.NDArray[np.int16]"
+    conventions: tuple[NamingConvention, ...]
+
+
+def convert_array(
+    values: _ArrayT,
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+) -> ArrayConversion[_ArrayT]:
+    """
+    Convert a column of identifiers to a naming convention.
+
+    Args:
+        values: A NumPy array of strings or objects, a pandas Series or Index, or a
+            pyarrow string Array or ChunkedArray.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+
+    Raises:
+        TypeError: Raised when `values` is not a column of a supported library.
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+
+    Returns:
+        The converted column, with the detected convention of each value.
+    """
+    target = _resolve_convention(nc, _registry_of(conventions))
+    engine = get_engine(conventions)
+    library = type(values).__module__.partition(".")[0]
+    if library == "pandas":
+        return _convert_pandas(values, target, engine)
+    if library == "pyarrow":
+        return _convert_arrow(values, target, engine)
+    if library == "numpy":
+        return _convert_numpy(cast("npt.NDArray[Any]", values), target, engine)
+    msg = (
+        "expected a NumPy array, a pandas Series or Index, or a pyarrow array, "
+        f"got {type(values).__name__}"
+    )
+    raise TypeError(msg)
+
+
+def rename_columns(
+    frame: "pd.DataFrame",
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+) -> "pd.DataFrame":
+    """
+    Rename the columns of a pandas DataFrame to a naming convention.
+
+    Columns which are not recognized identifiers, or not strings, keep their name.
+
+    Examples:
+        >>> import pandas as pd  # doctest: +SKIP
+        >>> frame = pd.DataFrame(
+        ...     {"userId": [1], "createdAt": [2]}
+        ... )  # doctest: +SKIP
+        >>> rename_columns(frame, "snake").columns.tolist()  # doctest: +SKIP
+        ['user_id', 'created_at']
+
+    Args:
+        frame: The pandas DataFrame.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+
+    Returns:
+        A new DataFrame with renamed columns, built by `DataFrame.rename`.
+    """
+    renamed = convert_array(frame.columns, nc, conventions).values
+    mapping = {
+        old: new
+        for old, new in zip(frame.columns, renamed, strict=True)
+        if isinstance(old, str) and old != new
+    }
+    return frame.rename(columns=mapping)
+
+
+def _convert_uniques(
+    uniques: Sequence[object], target: NamingConvention, engine: DetectionEngine
+) -> tuple[list[object], list[int]]:
+    # Each distinct value is detected and converted once, by the transcoder of
+    # its detected convention.
+    index = {id(nc): i for i, nc in enumerate(engine.conventions)}
+    detect = engine.detect
+    transcode = _transcoder(target)
+    converted: list[object] = []
+    codes: list[int] = []
+    for value in uniques:
+        if not isinstance(value, str):
+            converted.append(value)
+            codes.append(MISSING)
+            continue
+        nc = detect(value)
+        if nc is None:
+            converted.append(value)
+            codes.append(UNRECOGNIZED)
+        else:
+            converted.append(transcode(nc)(value))
+            codes.append(index[id(nc)])
+    return converted, codes
+
+
+def _gather_codes(
+    unique_codes: list[int], indices: "npt.NDArray[np.intp]"
+) -> "npt.NDArray[np.int16]":
+    import numpy as np  # noqa: PLC0415
+
+    # Index -1 picks the trailing MISSING code, for values without a unique.
+    return np.array([*unique_codes, MISSING], dtype=np.int16)[indices]
+
+
+def _gather_values(
+    converted: list[object],
+    indices: "npt.NDArray[np.intp]",
+    codes: "npt.NDArray[np.int16]",
+    values: "npt.NDArray[Any]",
+) -> "npt.NDArray[Any]":
+    import numpy as np  # noqa: PLC0415
+
+    gathered = np.empty(len(converted) + 1, dtype=object)
+    gathered[:] = [*converted, None]
+    result = gathered[indices]
+    # Missing and non-string values are kept as is, even when deduplicated with
+    # equal ones, like 1 and True.
+    missing = codes == MISSING
+    if missing.any():
+        result[missing] = values[missing]
+    return result
+
+
+def _convert_numpy(
+    values: "npt.NDArray[Any]", target: NamingConvention, engine: DetectionEngine
+) -> ArrayConversion[Any]:
+    import numpy as np  # noqa: PLC0415
+
+    flat = values.ravel()
+    if values.dtype.kind == "U":
+        # Hashing the strings is faster than sorting them with `np.unique`.
+        uniques: dict[str, int] = {}
+        indices = np.fromiter(
+            (uniques.setdefault(value, len(uniques)) for value in flat.tolist()),
+            dtype=np.intp,
+            count=len(flat),
+        )
+        converted, unique_codes = _convert_uniques(list(uniques), target, engine)
+        result = np.array(converted, dtype=str)[indices]
+        codes = _gather_codes(unique_codes, indices)
+    else:
+        # Only strings are deduplicated: other values, equal or not, are kept as
+        # is, with the -1 index.
+        positions: dict[tuple[type, str], int] = {}
+        indices = np.fromiter(
+            (
+                positions.setdefault((type(value), value), len(positions))
+                if isinstance(value, str)
+                else -1
+                for value in flat
+            ),
+            dtype=np.intp,
+            count=len(flat),
+        )
+        converted, unique_codes = _convert_uniques(
+            [value for _, value in positions], target, engine
+        )
+        codes = _gather_codes(unique_codes, indices)
+        result = _gather_values(converted, indices, codes, flat)
+        result = result.astype(values.dtype, copy=False)
+    return ArrayConversion(
+        result.reshape(values.shape), codes.reshape(values.shape), engine.conventions
+    )
+
+
+def _convert_pandas(
+    values: "pd.Series[Any] | pd.Index",
+    target: NamingConvention,
+    engine: DetectionEngine,
+) -> ArrayConversion[Any]:
+    import numpy as np  # noqa: PLC0415
+    import pandas as pd  # noqa: PLC0415
+
+    # Missing values have the -1 code, and are not in the uniques.
+    indices, uniques = pd.factorize(values)
+    converted, unique_codes = _convert_uniques(list(uniques), target, engine)
+    codes = _gather_codes(unique_codes, indices)
+    result = _gather_values(converted, indices, codes, np.asarray(values, dtype=object))
+    # Converted values are not in the categories of the input.
+    dtype = None if isinstance(values.dtype, pd.CategoricalDtype) else values.dtype
+    if isinstance(values, pd.Index):
+        result = pd.Index(result, dtype=dtype, name=values.name)
+    else:
+        result = pd.Series(result, index=values.index, dtype=dtype, name=values.name)
+    return ArrayConversion(result, codes, engine.conventions)
+
+
+def _convert_arrow(
+    values: "pa.Array | pa.ChunkedArray",
+    target: NamingConvention,
+    engine: DetectionEngine,
+) -> ArrayConversion[Any]:
+    import pyarrow as pa  # noqa: PLC0415
+
+    array = values.combine_chunks() if isinstance(values, pa.ChunkedArray) else values
+    encoded = array.dictionary_encode()
+    converted, unique_codes = _convert_uniques(
+        encoded.dictionary.to_pylist(), target, engine
+    )
+    # Null indices are taken as nulls.
+    result = pa.array(converted, type=array.type).take(encoded.indices)
+    if isinstance(values, pa.ChunkedArray):
+        result = pa.chunked_array([result], type=values.type)
+    indices = encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+    codes = _gather_codes(unique_codes, indices)
+    return ArrayConversion(result, codes, engine.conventions)
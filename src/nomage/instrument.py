@@ -0,0 +1,308 @@
+"""
+Nomage - instrumentation.
+
+This module provides opt-in instrumentation of the hot paths of Nomage. When
+enabled, the detection, parsing and conversion of identifiers are timed into latency
+histograms, and detections are counted by naming convention. Listeners can also be
+called with each timed event, for tracing.
+
+Instrumentation is disabled by default, and then costs a flag check on the hot
+paths. Converters compiled while it is disabled, like the ones of `convert_many`
+already running, are not timed. When enabled, threads record under a shared lock,
+which serializes them.
+
+Examples:
+    >>> from nomage import naming
+    >>> with instrumented():
+    ...     naming("myIdentifier").to("snake")
+    'my_identifier'
+    >>> report = instrumentation_info()
+    >>> report.timings["detect"].count, report.conventions["camelCase"].hits
+    (1, 1)
+    >>> clear_instrumentation()
+"""
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter_ns
+from typing import Any
+
+from nomage.cache import CacheInfo, cache_info
+from nomage.convention import NamingConvention
+
+# Latencies are counted in power of two buckets of nanoseconds, up to about 4.5 min.
+_BUCKETS = 48
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """
+    Timed step of the processing of an identifier, given to listeners.
+
+    Attributes:
+        phase: The step, "detect", "parse" or "convert".
+        identifier: The identifier string, or the components when converting an
+            `Identifier`.
+        convention: The detected convention when detecting, None if unrecognized,
+            the parsing convention when parsing, or the target when converting.
+        duration_ns: The duration of the step, in nanoseconds.
+    """
+
+    phase: str
+    identifier: str | tuple[str, ...]
+    convention: NamingConvention | None
+    duration_ns: int
+
+
+@dataclass(frozen=True, slots=True)
+class Histogram:
+    """
+    Latency histogram of a step.
+
+    Attributes:
+        count: The number of timed calls.
+        total_ns: The total duration of the calls, in nanoseconds.
+        buckets: The number of calls by duration, bucket `i` counting the calls
+            of `2**(i-1)` ns or more, and of less than `2**i` ns.
+    """
+
+    count: int
+    total_ns: int
+    buckets: tuple[int, ...]
+
+    @property
+    def mean_ns(self) -> float:
+        """The mean duration of the calls, in nanoseconds."""
+        return self.total_ns / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> int:
+        """
+        Estimate a quantile of the durations of the calls.
+
+        Args:
+            q: The quantile, between 0 and 1, like 0.99 for the 99th percentile.
+
+        Returns:
+            The upper bound of the bucket of the quantile, in nanoseconds.
+        """
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return 1 << i
+        return 0
+
+
+@dataclass(frozen=True, slots=True)
+class ConventionStats:
+    """
+    Detection counts of a naming convention.
+
+    Attributes:
+        attempts: The number of detections the convention was tried in. The
+            candidates of an identifier are tried in order until one matches, even
+            when the engine matches them all in a single scan.
+        hits: The number of identifiers detected in the convention.
+    """
+
+    attempts: int
+    hits: int
+
+
+@dataclass(frozen=True, slots=True)
+class Report:
+    """
+    Instrumentation report.
+
+    Attributes:
+        timings: The latency histograms by step, "detect", "parse" and "convert".
+        conventions: The detection counts by first name of convention.
+        unrecognized: The number of identifiers matching no convention.
+        cache: The statistics of the detection and conversion cache.
+    """
+
+    timings: dict[str, Histogram]
+    conventions: dict[str, ConventionStats]
+    unrecognized: int
+    cache: CacheInfo
+
+
+class _Recorder:
+    """Counters and histograms of the instrumented hot paths."""
+
+    __slots__ = (
+        "_conventions",
+        "_histograms",
+        "_lock",
+        "_unrecognized",
+        "enabled",
+        "listeners",
+    )
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.listeners: list[Callable[[Event], None]] = []
+        self._histograms: dict[str, list[int]] = {}
+        # Conventions with their attempts and hits, by identity.
+        self._conventions: dict[int, tuple[NamingConvention, list[int]]] = {}
+        self._unrecognized = 0
+        # Counters are updated by read-modify-write, which threads would race on.
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        phase: str,
+        identifier: str | tuple[str, ...],
+        nc: NamingConvention | None,
+        duration_ns: int,
+    ) -> None:
+        """Add the duration of a step to its histogram, and notify listeners."""
+        with self._lock:
+            histogram = self._histograms.get(phase)
+            if histogram is None:
+                histogram = self._histograms[phase] = [0, 0] + [0] * _BUCKETS
+            histogram[0] += 1
+            histogram[1] += duration_ns
+            histogram[2 + min(duration_ns.bit_length(), _BUCKETS - 1)] += 1
+        # Listeners are called without the lock, they may use Nomage themselves.
+        if self.listeners:
+            event = Event(phase, identifier, nc, duration_ns)
+            for listener in self.listeners:
+                listener(event)
+
+    def record_detection(
+        self,
+        id_str: str,
+        nc: NamingConvention | None,
+        candidates: tuple[NamingConvention, ...],
+        duration_ns: int,
+    ) -> None:
+        """Count the conventions tried and detected for an identifier."""
+        with self._lock:
+            for candidate in candidates:
+                entry = self._conventions.get(id(candidate))
+                if entry is None:
+                    entry = self._conventions[id(candidate)] = (candidate, [0, 0])
+                entry[1][0] += 1
+                if candidate is nc:
+                    entry[1][1] += 1
+                    break
+            if nc is None:
+                self._unrecognized += 1
+        self.record("detect", id_str, nc, duration_ns)
+
+    def call(
+        self,
+        phase: str,
+        func: Callable[[Any], Any],
+        nc: NamingConvention,
+        identifier: Any,  # noqa: ANN401
+        /,
+    ) -> Any:  # noqa: ANN401
+        """Call a parser or a converter, and record its duration."""
+        start = perf_counter_ns()
+        result = func(identifier)
+        self.record(phase, identifier, nc, perf_counter_ns() - start)
+        return result
+
+    def report(self) -> Report:
+        """Build the report of the steps recorded so far."""
+        with self._lock:
+            return Report(
+                timings={
+                    phase: Histogram(values[0], values[1], tuple(values[2:]))
+                    for phase, values in self._histograms.items()
+                },
+                conventions={
+                    nc.names[0]: ConventionStats(*counts)
+                    for nc, counts in self._conventions.values()
+                },
+                unrecognized=self._unrecognized,
+                cache=cache_info(),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._conventions.clear()
+            self._unrecognized = 0
+
+
+# Checked by the hot paths, disabled until `enable_instrumentation`.
+_RECORDER = _Recorder()
+
+
+def enable_instrumentation() -> None:
+    """Enable the instrumentation of detection, parsing and conversion."""
+    _RECORDER.enabled = True
+
+
+def disable_instrumentation() -> None:
+    """Disable the instrumentation, recorded steps are kept until cleared."""
+    _RECORDER.enabled = False
+
+
+def clear_instrumentation() -> None:
+    """Clear the recorded histograms and counters."""
+    _RECORDER.clear()
+
+
+def instrumentation_info() -> Report:
+    """
+    Get the report of the steps recorded since the last clear.
+
+    Returns:
+        The latency histograms and detection counts, with the cache statistics.
+    """
+    return _RECORDER.report()
+
+
+def add_listener(listener: Callable[[Event], None]) -> None:
+    """
+    Call a function with each recorded step, while instrumentation is enabled.
+
+    Args:
+        listener: The function, called with the event of each step.
+    """
+    _RECORDER.listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[Event], None]) -> None:
+    """
+    Stop calling a function added by `add_listener`.
+
+    Args:
+        listener: The function.
+
+    Raises:
+        ValueError: Raised when the function is not a listener.
+    """
+    _RECORDER.listeners.remove(listener)
+
+
+@contextmanager
+def instrumented(
+    listener: Callable[[Event], None] | None = None,
+) -> Iterator[None]:
+    """
+    Enable instrumentation in a `with` block, and restore it afterwards.
+
+    Args:
+        listener: A function to call with each recorded step of the block.
+
+    Yields:
+        Nothing, the steps are reported by `instrumentation_info`.
+    """
+    enabled = _RECORDER.enabled
+    if listener is not None:
+        add_listener(listener)
+    _RECORDER.enabled = True
+    try:
+        yield
+    finally:
+        _RECORDER.enabled = enabled
+        if listener is not None:
+            remove_listener(listener)
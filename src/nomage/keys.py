@@ -0,0 +1,340 @@
+"""
+Nomage - conversion of the keys of nested data.
+
+This module converts the keys of the dicts of JSON-like data, like the bodies of
+API requests and responses, to a naming convention. Dicts and lists are walked
+iteratively, so that deeply nested data does not hit the recursion limit.
+
+Key sets repeat a lot, every record of a response has the same keys. Converted keys
+are kept in a cache shared by all calls with the same conventions and target, so
+that each distinct key is detected and converted once per process.
+
+JSON documents too large to be loaded, and JSON lines, are rewritten as a stream of
+bytes by `rewrite_json`. Strings are found with a regular expression, those followed
+by a `:` are object keys, and every other byte is copied through untouched.
+
+Examples:
+    >>> body = {"user_id": 1, "created_at": "now", "tags": [{"tag_name": "x"}]}
+    >>> convert_keys(body, "camel")
+    {'userId': 1, 'createdAt': 'now', 'tags': [{'tagName': 'x'}]}
+    >>> import io
+    >>> output = io.BytesIO()
+    >>> rewrite_json(io.BytesIO(b'{"userId": "myValue"}'), output, "snake")
+    1
+    >>> output.getvalue()
+    b'{"user_id": "myValue"}'
+"""
+
+import json
+import mmap
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO, TypeVar
+
+from nomage.convention import NamingConvention
+from nomage.engine import DetectionEngine, get_engine
+from nomage.exceptions import UnrecognizedNamingConventionError
+from nomage.naming import (
+    BUILTINS_CONVENTIONS,
+    _registry_of,
+    _resolve_convention,
+    _transcoder,
+)
+from nomage.registry import ConventionRegistry
+
+# Distinct keys remembered by each cache, which is cleared when full.
+_KEY_CACHE_MAX_SIZE = 1 << 16
+# Bytes of JSON read and rewritten at once.
+_JSON_CHUNKSIZE = 1 << 20
+# Strings, with the `:` after them if they are object keys.
+_JSON_STRINGS = re.compile(rb'"([^"\\]*(?:\\.[^"\\]*)*)"(\s*:)?', re.DOTALL)
+_JSON_WHITESPACE = b" \t\r\n"
+
+_T = TypeVar("_T")
+
+# Converted keys by engine, target convention and strictness. Engines are hashed by
+# identity, and kept alive by the key.
+_KEY_CACHES: dict[tuple[DetectionEngine, NamingConvention, bool], dict[str, str]] = {}
+
+
+def convert_keys(
+    obj: _T,
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+    *,
+    strict: bool = False,
+    copy: bool = True,
+) -> _T:
+    """
+    Convert the keys of the dicts of nested dicts and lists to a naming convention.
+
+    Keys are detected and converted like `naming(key).to(nc)` does. Values which are
+    not dicts or lists are kept as is, and so are keys which are not strings. When
+    two keys of a dict convert to the same key, the last one wins.
+
+    Examples:
+        >>> convert_keys([{"userId": 1, "_meta": {}}], "snake")
+        [{'user_id': 1, '_meta': {}}]
+        >>> body = {"createdAt": 1}
+        >>> convert_keys(body, "snake", copy=False) is body
+        True
+        >>> body
+        {'created_at': 1}
+
+    Args:
+        obj: The data, a dict or a list of nested dicts and lists. Data with
+            reference cycles is not supported.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+        strict: If True, raise on keys matching no convention, instead of keeping
+            them as is.
+        copy: If True, return new dicts and lists and leave `obj` untouched.
+            Otherwise, change the keys of the dicts of `obj` in place and return
+            `obj`, which saves memory on large data.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+        UnrecognizedNamingConventionError:
+            Raised when `strict` is True and a key matches no convention. When
+            `copy` is False, the dicts walked before are already converted.
+
+    Returns:
+        The data with converted keys, `obj` itself if `copy` is False.
+    """
+    target = _resolve_convention(nc, _registry_of(conventions))
+    engine = get_engine(conventions)
+    convert = _key_converter(engine, target, strict)
+    if copy:
+        return _convert_copy(obj, convert)
+    _convert_in_place(obj, convert)
+    return obj
+
+
+def rewrite_json(
+    source: str | os.PathLike[str] | BinaryIO,
+    output: BinaryIO,
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+    *,
+    strict: bool = False,
+) -> int:
+    """
+    Rewrite the object keys of a stream of JSON to a naming convention.
+
+    The input is read and written in chunks, so that memory stays constant whatever
+    its size, only bounded by its longest string. Files are memory-mapped. Keys are
+    converted like `convert_keys` does, and share its cache. Values, whitespace and
+    anything else are copied through untouched, so that the input can be a JSON
+    document or JSON lines. It is not validated: invalid JSON is rewritten as well
+    as it can be.
+
+    Args:
+        source: The path of a JSON file, or a binary file object to read.
+        output: The binary file object to write the rewritten JSON to.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+        strict: If True, raise on keys matching no convention, instead of keeping
+            them as is.
+
+    Raises:
+        OSError: Raised when the source cannot be read, or the output written.
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+        UnrecognizedNamingConventionError:
+            Raised when `strict` is True and a key matches no convention. The JSON
+            before the key is already written.
+
+    Returns:
+        The number of rewritten keys.
+    """
+    target = _resolve_convention(nc, _registry_of(conventions))
+    engine = get_engine(conventions)
+    rewriter = _JsonKeyRewriter(_key_converter(engine, target, strict))
+    write = output.write
+    if isinstance(source, str | os.PathLike):
+        with Path(source).open("rb") as file:
+            for chunk in _mapped_chunks(file):
+                write(rewriter.feed(chunk))
+    else:
+        read = source.read
+        while chunk := read(_JSON_CHUNKSIZE):
+            write(rewriter.feed(chunk))
+    write(rewriter.feed(b"", final=True))
+    return rewriter.count
+
+
+def clear_key_cache() -> None:
+    """Clear the converted keys remembered by `convert_keys`."""
+    _KEY_CACHES.clear()
+
+
+def _key_converter(
+    engine: DetectionEngine, target: NamingConvention, strict: bool
+) -> Callable[[Any], Any]:
+    cache = _KEY_CACHES.get((engine, target, strict))
+    if cache is None:
+        # Threads racing to create the cache all get the one inserted first.
+        cache = _KEY_CACHES.setdefault((engine, target, strict), {})
+    get = cache.get
+    detect = engine.detect
+    transcode = _transcoder(target)
+
+    def convert(key: Any) -> Any:  # noqa: ANN401
+        converted = get(key)
+        if converted is not None:
+            return converted
+        if not isinstance(key, str):
+            # Not cached, `1` and `True` are equal keys.
+            return key
+        src_nc = detect(key)
+        if src_nc is not None:
+            converted = transcode(src_nc)(key)
+        elif strict:
+            raise UnrecognizedNamingConventionError(key)
+        else:
+            converted = key
+        if len(cache) >= _KEY_CACHE_MAX_SIZE:
+            cache.clear()
+        cache[key] = converted
+        return converted
+
+    return convert
+
+
+def _convert_copy(obj: _T, convert: Callable[[Any], Any]) -> _T:
+    if not isinstance(obj, dict | list):
+        return obj
+    root: Any = {} if isinstance(obj, dict) else []
+    # Containers to walk, with their copy to fill.
+    stack: list[tuple[Any, Any]] = [(obj, root)]
+    pop, push = stack.pop, stack.append
+    while stack:
+        src, dst = pop()
+        if isinstance(src, dict):
+            for key, value in src.items():
+                if isinstance(value, dict):
+                    child: Any = {}
+                    push((value, child))
+                    value = child  # noqa: PLW2901
+                elif isinstance(value, list):
+                    child = []
+                    push((value, child))
+                    value = child  # noqa: PLW2901
+                dst[convert(key)] = value
+        else:
+            append = dst.append
+            for value in src:
+                if isinstance(value, dict):
+                    child = {}
+                    push((value, child))
+                    value = child  # noqa: PLW2901
+                elif isinstance(value, list):
+                    child = []
+                    push((value, child))
+                    value = child  # noqa: PLW2901
+                append(value)
+    return root  # type: ignore[no-any-return]
+
+
+def _convert_in_place(obj: object, convert: Callable[[Any], Any]) -> None:
+    stack: list[Any] = [obj]
+    pop, push = stack.pop, stack.append
+    while stack:
+        src = pop()
+        if isinstance(src, dict):
+            items = list(src.items())
+            # Keys are all reinserted, in order, to keep the order of the dict.
+            src.clear()
+            for key, value in items:
+                if isinstance(value, dict | list):
+                    push(value)
+                src[convert(key)] = value
+        else:
+            for value in src:
+                if isinstance(value, dict | list):
+                    push(value)
+
+
+def _mapped_chunks(file: BinaryIO) -> Iterator[bytes]:
+    if os.fstat(file.fileno()).st_size == 0:
+        return
+    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for start in range(0, len(data), _JSON_CHUNKSIZE):
+            yield data[start : start + _JSON_CHUNKSIZE]
+
+
+class _JsonKeyRewriter:
+    """Rewrite the object keys of JSON fed chunk by chunk, remembering each key."""
+
+    __slots__ = ("_carry", "_convert", "_keys", "count")
+
+    def __init__(self, convert: Callable[[Any], Any]) -> None:
+        self._convert = convert
+        # Raw keys and their rewrite.
+        self._keys: dict[bytes, bytes] = {}
+        # Bytes of a token cut by the end of the previous chunk.
+        self._carry = b""
+        self.count = 0
+
+    def feed(self, data: bytes, *, final: bool = False) -> bytes:
+        """Rewrite a chunk of JSON, returning what can be written so far."""
+        buf = self._carry + data if self._carry else data
+        keys = self._keys
+        parts = []
+        pos = 0
+        stop = len(buf)
+        # A string followed by whitespace only may be a key cut before its `:`.
+        tail = len(buf.rstrip(_JSON_WHITESPACE))
+        m = None
+        for m in _JSON_STRINGS.finditer(buf):
+            if m[2] is None:
+                if m.end() >= tail and not final:
+                    stop = m.start()
+                    break
+                continue
+            key = m[1]
+            new_key = keys.get(key)
+            if new_key is None:
+                new_key = self._rewrite_key(key)
+            if new_key != key:
+                parts.append(buf[pos : m.start(1)])
+                parts.append(new_key)
+                pos = m.end(1)
+                self.count += 1
+        else:
+            if not final:
+                # Past the last string, a quote can only open a string cut by the
+                # end of the chunk.
+                quote = buf.find(b'"', 0 if m is None else m.end())
+                stop = len(buf) if quote == -1 else quote
+        parts.append(buf[pos:stop])
+        self._carry = buf[stop:]
+        return b"".join(parts)
+
+    def _rewrite_key(self, key: bytes) -> bytes:
+        escaped = b"\\" in key
+        try:
+            # Escaped keys are decoded, and encoded back if converted.
+            id_str = json.loads(b'"' + key + b'"') if escaped else key.decode("utf-8")
+        except ValueError:
+            id_str = None
+        converted: Any = id_str if id_str is None else self._convert(id_str)
+        if converted == id_str:
+            new_key = key
+        elif escaped:
+            new_key = json.dumps(converted, ensure_ascii=False)[1:-1].encode("utf-8")
+        else:
+            new_key = converted.encode("utf-8")
+        if len(self._keys) >= _KEY_CACHE_MAX_SIZE:
+            self._keys.clear()
+        self._keys[key] = new_key
+        return new_key
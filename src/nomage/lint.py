@@ -0,0 +1,433 @@
+"""
+Nomage - naming convention linter for Python sources.
+
+This module checks that the names defined in Python files follow naming conventions,
+depending on their kind. Files are parsed with `ast`, and each name is validated with
+`NamingConvention.match`, leading and trailing underscores aside. The kinds are:
+
+- `class`: class names.
+- `function`: function and method names.
+- `argument`: function, method and lambda argument names.
+- `variable`: names assigned in functions.
+- `global`: names assigned in modules and class bodies.
+
+Only the kinds with a rule are checked. Results can be stored in a cache file keyed
+by the hash of the file contents, so that only changed files are parsed again.
+
+Examples:
+    >>> violations = lint_source(
+    ...     "def getUser(userId): pass", {"function": "snake"}
+    ... )
+    >>> [(v.kind, v.name, v.expected) for v in violations]
+    [('function', 'getUser', 'snake_case')]
+"""
+
+import ast
+import hashlib
+import json
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeAlias
+
+from nomage.convention import NamingConvention
+from nomage.naming import _resolve_convention
+from nomage.rewrite import DEFAULT_EXCLUDE, _write_atomic, find_files
+
+KINDS = ("class", "function", "argument", "variable", "global")
+DEFAULT_RULES = {
+    "class": "pascal",
+    "function": "snake",
+    "argument": "snake",
+    "variable": "snake",
+}
+DEFAULT_INCLUDE = ("*.py",)
+DEFAULT_CHUNKSIZE = 64
+
+_CACHE_VERSION = 1
+# Least recently used cache entries are dropped past this size.
+_CACHE_MAX_ENTRIES = 500_000
+_SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+_Rules: TypeAlias = dict[str, NamingConvention]
+# File to lint: its path, the hash of its contents and its contents.
+_Pending: TypeAlias = tuple[str, str, bytes]
+
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Linter of a worker process, set once by `_init_worker`.
+_worker_rules: _Rules
+
+
+@dataclass(frozen=True, slots=True)
+class Violation:
+    """
+    A name not following the naming convention of its kind.
+
+    Attributes:
+        line: The line of the definition, starting at 1.
+        column: The column of the definition, starting at 1.
+        kind: The kind of name, one of `KINDS`.
+        name: The name.
+        expected: The name of the expected naming convention.
+    """
+
+    line: int
+    column: int
+    kind: str
+    name: str
+    expected: str
+
+
+@dataclass(frozen=True, slots=True)
+class FileLint:
+    """
+    Result of the lint of a file.
+
+    Attributes:
+        path: The path of the file.
+        violations: The violations found in the file, in source order.
+        error: The reason the file could not be read or parsed, if any.
+        cached: Whether the result was read from the cache.
+    """
+
+    path: str
+    violations: tuple[Violation, ...] = ()
+    error: str | None = None
+    cached: bool = False
+
+
+def _collect_names(tree: ast.AST) -> Iterator[tuple[ast.AST, str, str]]:
+    # Iterative walk, much cheaper than `ast.NodeVisitor` dispatch on large files.
+    stack: list[tuple[ast.AST, bool]] = [(tree, False)]
+    while stack:
+        node, in_function = stack.pop()
+        node_type = type(node)
+        if node_type is ast.Name:
+            if type(node.ctx) is ast.Store:  # type: ignore[attr-defined]
+                kind = "variable" if in_function else "global"
+                yield node, kind, node.id  # type: ignore[attr-defined]
+            continue
+        if node_type is ast.arg:
+            yield node, "argument", node.arg  # type: ignore[attr-defined]
+        elif node_type in _FUNCTION_NODES:
+            yield node, "function", node.name  # type: ignore[attr-defined]
+            in_function = True
+        elif node_type is ast.ClassDef:
+            yield node, "class", node.name  # type: ignore[attr-defined]
+            in_function = False
+        elif node_type is ast.Lambda:
+            in_function = True
+        stack.extend((child, in_function) for child in ast.iter_child_nodes(node))
+
+
+def lint_source(
+    source: str | bytes, rules: Mapping[str, str | NamingConvention]
+) -> list[Violation]:
+    """
+    Check the names defined in a Python source.
+
+    Args:
+        source: The Python source code.
+        rules: The naming convention of each kind of name, name or obj.
+
+    Raises:
+        SyntaxError: Raised when the source is not valid Python.
+        ValueError: Raised when a kind is unknown, see `KINDS`.
+        UnknownNamingConventionError:
+            Raised when a name is given and no matching naming convention found.
+
+    Returns:
+        The violations, in source order.
+    """
+    return _lint_source(source, resolve_rules(rules))
+
+
+def resolve_rules(rules: Mapping[str, str | NamingConvention]) -> _Rules:
+    """
+    Resolve the naming conventions of lint rules.
+
+    Args:
+        rules: The naming convention of each kind of name, name or obj.
+
+    Raises:
+        ValueError: Raised when a kind is unknown, see `KINDS`.
+        UnknownNamingConventionError:
+            Raised when a name is given and no matching naming convention found.
+
+    Returns:
+        The naming convention of each kind of name.
+    """
+    for kind in rules:
+        if kind not in KINDS:
+            msg = f"unknown kind of name '{kind}', expected one of {', '.join(KINDS)}"
+            raise ValueError(msg)
+    return {kind: _resolve_convention(nc) for kind, nc in rules.items()}
+
+
+def lint_paths(  # noqa: PLR0913
+    paths: Iterable[str],
+    rules: Mapping[str, str | NamingConvention] = DEFAULT_RULES,
+    /,
+    *,
+    include: Iterable[str] = DEFAULT_INCLUDE,
+    exclude: Iterable[str] = DEFAULT_EXCLUDE,
+    jobs: int = 1,
+    cache: str | None = None,
+) -> Iterator[FileLint]:
+    """
+    Check the names defined in Python files and directory trees.
+
+    Args:
+        paths: The files and directories to check.
+        rules: The naming convention of each kind of name, name or obj.
+            Defaults to PEP 8 names: PascalCase classes, snake_case others.
+        include: Patterns of the files to check, see `nomage.rewrite.find_files`.
+        exclude: Patterns of the files and directories to skip.
+        jobs: The number of worker processes, 0 for one per CPU.
+        cache: The path of the cache file, no cache if None. It is created if
+            missing, and written once all files are checked.
+
+    Raises:
+        ValueError: Raised when a kind is unknown, see `KINDS`.
+        UnknownNamingConventionError:
+            Raised when a name is given and no matching naming convention found.
+
+    Yields:
+        The result of each file, in the order of `find_files`.
+    """
+    resolved = resolve_rules(rules)
+    files = find_files(paths, include=include, exclude=exclude)
+    lint_cache = None if cache is None else _Cache(cache, resolved)
+    return _lint_files(files, resolved, jobs, lint_cache)
+
+
+def sarif_report(
+    results: Iterable[FileLint], rules: Mapping[str, str]
+) -> dict[str, Any]:
+    """
+    Build a SARIF 2.1.0 log of lint results.
+
+    Args:
+        results: The lint results.
+        rules: The name of the naming convention of each kind of name.
+
+    Returns:
+        The SARIF log, to be serialized as JSON.
+    """
+    sarif_results: list[dict[str, Any]] = []
+    notifications: list[dict[str, Any]] = []
+    for result in results:
+        location = {"artifactLocation": {"uri": Path(result.path).as_posix()}}
+        if result.error is not None:
+            notifications.append(
+                {
+                    "level": "error",
+                    "message": {"text": result.error},
+                    "locations": [{"physicalLocation": location}],
+                }
+            )
+        sarif_results.extend(
+            {
+                "ruleId": f"nomage/{v.kind}",
+                "level": "error",
+                "message": {"text": _message(v)},
+                "locations": [
+                    {
+                        "physicalLocation": {
+                            **location,
+                            "region": {"startLine": v.line, "startColumn": v.column},
+                        }
+                    }
+                ],
+            }
+            for v in result.violations
+        )
+    sarif_rules = [
+        {
+            "id": f"nomage/{kind}",
+            "shortDescription": {"text": f"{kind.capitalize()} names are {name}"},
+        }
+        for kind, name in rules.items()
+    ]
+    return {
+        "$schema": _SARIF_SCHEMA,
+        "version": "2.1.0",
+        "runs": [
+            {
+                "tool": {"driver": {"name": "nomage", "rules": sarif_rules}},
+                "invocations": [
+                    {
+                        "executionSuccessful": not notifications,
+                        "toolExecutionNotifications": notifications,
+                    }
+                ],
+                "results": sarif_results,
+            }
+        ],
+    }
+
+
+def format_violation(path: str, violation: Violation) -> str:
+    """
+    Format a violation as a line of text.
+
+    Args:
+        path: The path of the file.
+        violation: The violation.
+
+    Returns:
+        The formatted violation, as `path:line:column: message`.
+    """
+    return f"{path}:{violation.line}:{violation.column}: {_message(violation)}"
+
+
+def _message(violation: Violation) -> str:
+    return f"{violation.kind} '{violation.name}' is not {violation.expected}"
+
+
+def _lint_source(source: str | bytes, rules: _Rules) -> list[Violation]:
+    violations = []
+    for node, kind, name in _collect_names(ast.parse(source)):
+        nc = rules.get(kind)
+        stripped = name.strip("_")
+        if nc is None or not stripped or nc.match(stripped):
+            continue
+        line, column = getattr(node, "lineno", 0), getattr(node, "col_offset", -1)
+        violations.append(Violation(line, column + 1, kind, name, nc.names[0]))
+    violations.sort(key=lambda v: (v.line, v.column))
+    return violations
+
+
+def _lint_file(path: str, source: bytes, rules: _Rules) -> FileLint:
+    try:
+        violations = _lint_source(source, rules)
+    except (SyntaxError, ValueError) as err:
+        return FileLint(path, error=f"could not parse: {err}")
+    return FileLint(path, tuple(violations))
+
+
+def _lint_pending(pending: Iterable[_Pending], rules: _Rules) -> list[FileLint]:
+    return [_lint_file(path, source, rules) for path, _, source in pending]
+
+
+def _lint_files(
+    files: Iterable[str], rules: _Rules, jobs: int, cache: "_Cache | None"
+) -> Iterator[FileLint]:
+    # Only loaded when linting, process pools are slow to import.
+    from nomage.parallel import _chunked, _imap_ordered  # noqa: PLC0415
+
+    chunks = (
+        [_prepare(path, cache) for path in paths]
+        for paths in _chunked(files, DEFAULT_CHUNKSIZE)
+    )
+    if jobs == 1:
+        done: Iterable[tuple[list[FileLint | _Pending], list[FileLint]]] = (
+            (chunk, _lint_pending(_pending(chunk), rules)) for chunk in chunks
+        )
+    else:
+        done = _imap_ordered(
+            _lint_chunk,
+            chunks,
+            jobs=jobs or None,
+            initializer=_init_worker,
+            initargs=(rules,),
+        )
+    try:
+        for chunk, linted in done:
+            results = iter(linted)
+            for entry in chunk:
+                if isinstance(entry, FileLint):
+                    yield entry
+                    continue
+                result = next(results)
+                if cache is not None and result.error is None:
+                    cache.set(entry[1], result.violations)
+                yield result
+    finally:
+        if cache is not None:
+            cache.save()
+
+
+def _prepare(path: str, cache: "_Cache | None") -> FileLint | _Pending:
+    try:
+        source = Path(path).read_bytes()
+    except OSError as err:
+        return FileLint(path, error=f"could not read: {err}")
+    digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+    if cache is not None:
+        violations = cache.get(digest)
+        if violations is not None:
+            return FileLint(path, violations, cached=True)
+    return path, digest, source
+
+
+def _pending(chunk: list[FileLint | _Pending]) -> Iterator[_Pending]:
+    return (entry for entry in chunk if not isinstance(entry, FileLint))
+
+
+def _init_worker(rules: _Rules) -> None:
+    global _worker_rules  # noqa: PLW0603
+    _worker_rules = rules
+
+
+def _lint_chunk(chunk: list[FileLint | _Pending]) -> list[FileLint]:
+    return _lint_pending(_pending(chunk), _worker_rules)
+
+
+class _Cache:
+    """Lint results stored in a JSON file, keyed by the hash of file contents."""
+
+    def __init__(self, path: str, rules: _Rules) -> None:
+        self.path = Path(path)
+        self._rules = rules
+        # Results are only valid for the same rules, and the same Python grammar.
+        key = [
+            _CACHE_VERSION,
+            sys.version_info[:2],
+            sorted((k, nc.names[0], nc.match_regex.pattern) for k, nc in rules.items()),
+        ]
+        self._key = hashlib.blake2b(json.dumps(key).encode()).hexdigest()
+        self._entries: dict[str, list[list[Any]]] = {}
+        self._changed = False
+        try:
+            data = json.loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("key") == self._key:
+            self._entries = data.get("files", {})
+
+    def get(self, digest: str) -> tuple[Violation, ...] | None:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return None
+        # Moved last, so that least recently used entries come first.
+        self._entries[digest] = entry
+        return tuple(
+            Violation(line, column, kind, name, self._rules[kind].names[0])
+            for line, column, kind, name in entry
+        )
+
+    def set(self, digest: str, violations: Iterable[Violation]) -> None:
+        self._entries.pop(digest, None)
+        self._entries[digest] = [[v.line, v.column, v.kind, v.name] for v in violations]
+        self._changed = True
+
+    def save(self) -> None:
+        if not self._changed:
+            return
+        entries = self._entries
+        if len(entries) > _CACHE_MAX_ENTRIES:
+            entries = dict(list(entries.items())[-_CACHE_MAX_ENTRIES:])
+        data = {"key": self._key, "files": entries}
+        try:
+            if not self.path.parent.exists():
+                self.path.parent.mkdir(parents=True)
+                # Like other tool caches, the cache directory ignores itself.
+                (self.path.parent / ".gitignore").write_text("*\n")
+            _write_atomic(str(self.path), json.dumps(data).encode())
+        except OSError:
+            # The cache only saves time, failing to write it is not an error.
+            pass
+        self._changed = False
@@ -5,18 +5,27 @@ This module provides the core functionality for working with naming conventions,
 including parsing identifiers and transforming them between different conventions.
 """
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
+from functools import partial
 
-from nomage._builtins import builtins_conventions
+from nomage._builtins import _case_components, _Joiner, builtins_conventions
+from nomage._transcoders import specialize
+from nomage.cache import _CACHE
 from nomage.convention import NamingConvention
+from nomage.engine import get_engine
 from nomage.exceptions import (
     UnknownNamingConventionError,
     UnrecognizedNamingConventionError,
 )
+from nomage.instrument import _RECORDER
+from nomage.registry import ConventionRegistry
 
 _BUILTINS_CONVENTIONS = builtins_conventions()
 BUILTINS_CONVENTIONS = tuple(_BUILTINS_CONVENTIONS.values())
+_BUILTINS_ENGINE = get_engine(BUILTINS_CONVENTIONS)
+_BUILTINS_DISTINCT_CONVENTIONS = _BUILTINS_ENGINE.conventions
+_MISSING = object()
 
 
 @dataclass(frozen=True, slots=True)
@@ -35,12 +44,19 @@ class Identifier:
     components: tuple[str, ...]
     convention: NamingConvention
 
-    def to(self, nc: str | NamingConvention, /) -> str:
+    def to(
+        self,
+        nc: str | NamingConvention,
+        /,
+        registry: ConventionRegistry | None = None,
+    ) -> str:
         """
         Transform the identifier to another naming convention.
 
         Args:
             nc: Either a string name of a convention or a NamingConvention obj.
+            registry: The registry to look names up in.
+                Defaults to the built-in conventions.
 
         Raises:
             UnknownNamingConventionError:
@@ -51,27 +67,96 @@ class Identifier:
             convention is not found (when using a string name), returns the
             string representation of the current identifier.
         """
-        if isinstance(nc, str):
-            _nc = _BUILTINS_CONVENTIONS.get(nc)
-            if _nc is None:
-                raise UnknownNamingConventionError(nc)
-            nc = _nc
-        return nc.converter(self.components)
+        target = (
+            nc
+            if isinstance(nc, NamingConvention)
+            else _resolve_convention(nc, registry)
+        )
+        converter = target.converter
+        if not (_CACHE.maxsize or _RECORDER.enabled):
+            return converter(self.components)
+        if _RECORDER.enabled:
+            converter = partial(_RECORDER.call, "convert", converter, target)
+        if not _CACHE.maxsize:
+            return converter(self.components)
+        # Converters are hashed by identity, and kept alive by the key.
+        key = (self.components, target.converter)
+        converted: str | None = _CACHE.get(key)
+        if converted is None:
+            converted = converter(self.components)
+            _CACHE.put(key, converted)
+        return converted
+
+    def to_all(
+        self,
+        ncs: Iterable[str | NamingConvention] | None = None,
+        /,
+        registry: ConventionRegistry | None = None,
+    ) -> dict[str, str]:
+        """
+        Transform the identifier to several naming conventions at once.
+
+        Work is shared between conventions: the upper-cased and capitalized
+        variants of the components are computed once for all built-in conventions.
+
+        Examples:
+            >>> naming("myIdentifier").to_all(["snake", "CONSTANT_CASE"])
+            {'snake_case': 'my_identifier', 'ALL_CAPS': 'MY_IDENTIFIER'}
+
+        Args:
+            ncs: Names of conventions or NamingConvention objs.
+                Defaults to all the conventions of the registry.
+            registry: The registry to look names up in.
+                Defaults to the built-in conventions.
+
+        Raises:
+            UnknownNamingConventionError:
+                Raised when a name is given and no matching naming convention found.
+
+        Returns:
+            A mapping of the first name of each convention to the identifier
+            transformed to this convention, in the given order.
+        """
+        if ncs is None:
+            targets = (
+                _BUILTINS_DISTINCT_CONVENTIONS
+                if registry is None
+                else registry.conventions
+            )
+        else:
+            targets = tuple(_resolve_convention(nc, registry) for nc in ncs)
+        cased = _case_components(self.components)
+        return {
+            nc.names[0]: (
+                nc.converter.render(self.components, cased)
+                if isinstance(nc.converter, _Joiner)
+                else nc.converter(self.components)
+            )
+            for nc in targets
+        }
 
     def __str__(self) -> str:
         return self.convention.converter(self.components)
 
 
 def naming(
-    id_str: str, /, conventions: Iterable[NamingConvention] = BUILTINS_CONVENTIONS
+    id_str: str,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
 ) -> Identifier:
     """
     Parse an str identifier and return an Identifier obj if it matches a convention.
 
+    The conventions are tried in order and the first matching one is used. The
+    detection runs through a compiled engine (see `nomage.engine.DetectionEngine`),
+    which is built once per set of conventions and then finds the match in one scan.
+    Results are memoized when the cache is enabled (see `nomage.cache`).
+
     Args:
         id_str: The identifier string to parse.
-        conventions: An iterable of naming conventions to try matching against.
-            Defaults to the built-in conventions.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry`. Defaults to the built-in conventions. A
+            `DetectionEngine` can be passed to skip the engine lookup.
 
     Raises:
         UnrecognizedNamingConventionError:
@@ -80,8 +165,251 @@ def naming(
     Returns:
         An Identifier obj if the identifier matches any of the conventions.
     """
-    for nc in conventions:
-        if nc.match(id_str):
-            return Identifier(convention=nc, components=nc.parser(id_str))
+    if conventions is BUILTINS_CONVENTIONS:
+        engine = _BUILTINS_ENGINE
+    elif isinstance(conventions, ConventionRegistry):
+        engine = conventions.engine
+    else:
+        engine = get_engine(conventions)
+    if not _CACHE.maxsize:
+        nc = engine.detect(id_str)
+        if nc is None:
+            raise UnrecognizedNamingConventionError(id_str)
+        if _RECORDER.enabled:
+            return Identifier(convention=nc, components=_parse(nc, id_str))
+        return Identifier(convention=nc, components=nc.parser(id_str))
+
+    # Engines are hashed by identity, and kept alive by the key.
+    key = (id_str, engine)
+    id_naming: Identifier | None = _CACHE.get(key, _MISSING)
+    if id_naming is _MISSING:
+        nc = engine.detect(id_str)
+        id_naming = None
+        if nc is not None:
+            id_naming = Identifier(convention=nc, components=_parse(nc, id_str))
+        _CACHE.put(key, id_naming)
+    if id_naming is None:
+        raise UnrecognizedNamingConventionError(id_str)
+    return id_naming
+
+
+@dataclass(frozen=True, slots=True)
+class NamingResult:
+    """
+    Result of the detection of an identifier by `naming_many`.
+
+    Attributes:
+        id_str: The identifier string.
+        identifier: The parsed identifier, or None if unrecognized.
+        error: The detection error, or None if recognized.
+    """
+
+    id_str: str
+    identifier: Identifier | None
+    error: UnrecognizedNamingConventionError | None
+
+
+@dataclass(frozen=True, slots=True)
+class ConversionResult:
+    """
+    Result of the conversion of an identifier by `convert_many`.
+
+    Attributes:
+        id_str: The identifier string.
+        converted: The converted identifier, or None if unrecognized.
+        error: The detection error, or None if recognized.
+    """
+
+    id_str: str
+    converted: str | None
+    error: UnrecognizedNamingConventionError | None
+
+
+def naming_many(
+    id_strs: Iterable[str],
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+) -> Iterator[NamingResult]:
+    """
+    Parse many str identifiers lazily, like `naming` does for one identifier.
+
+    The detection engine is resolved once for all identifiers, and results are
+    yielded one by one, so memory stays flat on huge inputs. Unrecognized
+    identifiers do not raise, they are reported in their result.
+
+    Examples:
+        >>> [r.identifier.components for r in naming_many(["myId", "my_id"])]
+        [('my', 'id'), ('my', 'id')]
+        >>> next(naming_many(["my__id"])).error
+        UnrecognizedNamingConventionError("no matching naming convention, ...")
+
+    Args:
+        id_strs: An iterable of identifier strings to parse.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry`. Defaults to the built-in conventions.
+
+    Yields:
+        A result for each identifier, in input order.
+    """
+    detect = get_engine(conventions).detect
+    for id_str in id_strs:
+        nc = detect(id_str)
+        if nc is None:
+            yield NamingResult(id_str, None, UnrecognizedNamingConventionError(id_str))
+        else:
+            yield NamingResult(id_str, Identifier(nc.parser(id_str), nc), None)
+
+
+def convert_many(
+    id_strs: Iterable[str],
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+) -> Iterator[ConversionResult]:
+    """
+    Convert many str identifiers lazily to a naming convention.
+
+    The target convention and the detection engine are resolved once for all
+    identifiers, and no intermediate `Identifier` is created. Results are yielded
+    one by one, so memory stays flat on huge inputs. Unrecognized identifiers do
+    not raise, they are reported in their result.
+
+    Examples:
+        >>> [r.converted for r in convert_many(["myId", "MyId", "my_Id"], "kebab")]
+        ['my-id', 'my-id', 'my-id']
+
+    Args:
+        id_strs: An iterable of identifier strings to convert.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+
+    Yields:
+        A result for each identifier, in input order.
+    """
+    target = _resolve_convention(nc, _registry_of(conventions))
+    detect = get_engine(conventions).detect
+    return _convert_many(id_strs, target, detect)
+
+
+def _convert_many(
+    id_strs: Iterable[str],
+    target: NamingConvention,
+    detect: Callable[[str], NamingConvention | None],
+) -> Iterator[ConversionResult]:
+    transcode = _transcoder(target)
+    for id_str in id_strs:
+        src_nc = detect(id_str)
+        if src_nc is None:
+            yield ConversionResult(
+                id_str, None, UnrecognizedNamingConventionError(id_str)
+            )
+        else:
+            yield ConversionResult(id_str, transcode(src_nc)(id_str), None)
+
+
+def compile_converter(
+    source: str | NamingConvention,
+    target: str | NamingConvention,
+    /,
+    registry: ConventionRegistry | None = None,
+) -> Callable[[str], str]:
+    """
+    Compile a function converting identifiers from a naming convention to another.
+
+    Between built-in conventions, the function converts identifiers directly with
+    a few string operations, like a single `str.replace` from snake_case to
+    kebab-case. Otherwise, it parses identifiers into components and renders them,
+    like `Identifier.to`. Identifiers must match the source convention, which is
+    not checked.
+
+    Examples:
+        >>> to_kebab = compile_converter("snake", "kebab")
+        >>> to_kebab("my_identifier")
+        'my-identifier'
+        >>> compile_converter("camel", "CONSTANT_CASE")("myHttpServer")
+        'MY_HTTP_SERVER'
+
+    Args:
+        source: The name of the convention of the identifiers, or the convention.
+        target: The name of the convention to convert to, or the convention.
+        registry: The registry to look names up in.
+            Defaults to the built-in conventions.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when a name is given and no matching naming convention found.
+
+    Returns:
+        A function converting an identifier matching `source` to `target`.
+    """
+    source_nc = _resolve_convention(source, registry)
+    target_nc = _resolve_convention(target, registry)
+    transcoder = specialize(source_nc, target_nc)
+    if transcoder is None:
+        transcoder = partial(_transcode, source_nc.parser, target_nc.converter)
+    if _RECORDER.enabled:
+        return partial(_RECORDER.call, "convert", transcoder, target_nc)
+    return transcoder
+
+
+def _parse(nc: NamingConvention, id_str: str) -> tuple[str, ...]:
+    if _RECORDER.enabled:
+        return _RECORDER.call("parse", nc.parser, nc, id_str)  # type: ignore[no-any-return]
+    return nc.parser(id_str)
+
+
+def _transcode(
+    parser: Callable[[str], tuple[str, ...]],
+    converter: Callable[[tuple[str, ...]], str],
+    id_str: str,
+    /,
+) -> str:
+    return converter(parser(id_str))
+
+
+def _transcoder(
+    target: NamingConvention,
+) -> Callable[[NamingConvention], Callable[[str], str]]:
+    # Transcoders to the target, compiled once per detected source convention.
+    # Sources are held by the engine detecting them, so their ids are stable.
+    transcoders: dict[int, Callable[[str], str]] = {}
+
+    def transcode(source: NamingConvention) -> Callable[[str], str]:
+        transcoder = transcoders.get(id(source))
+        if transcoder is None:
+            transcoder = transcoders[id(source)] = compile_converter(source, target)
+        return transcoder
+
+    return transcode
+
+
+def _resolve_convention(
+    nc: str | NamingConvention, registry: ConventionRegistry | None = None
+) -> NamingConvention:
+    if isinstance(nc, str):
+        _nc = (_BUILTINS_CONVENTIONS if registry is None else registry).get(nc)
+        if _nc is None:
+            raise UnknownNamingConventionError(nc)
+        return _nc
+    return nc
+
+
+def _registry_of(
+    conventions: Iterable[NamingConvention] | ConventionRegistry,
+) -> ConventionRegistry | None:
+    # Names are looked up in the registry conventions come from, if any.
+    return conventions if isinstance(conventions, ConventionRegistry) else None
+
 
-    raise UnrecognizedNamingConventionError(id_str)
+def _conventions_of(
+    conventions: Iterable[NamingConvention] | ConventionRegistry,
+) -> Iterable[NamingConvention]:
+    if isinstance(conventions, ConventionRegistry):
+        return conventions.values()
+    return conventions
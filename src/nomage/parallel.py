@@ -0,0 +1,259 @@
+"""
+Nomage - parallel bulk conversion.
+
+This module provides process-pool and thread-pool variants of `convert_many`, for
+converting very large numbers of identifiers on many cores. Input is split into
+chunks, which are converted by workers, and results are yielded in input order.
+
+Threads share the conventions, engines and compiled converters of the process, so
+they start instantly and send nothing between workers. They only run on many cores
+on free-threaded builds of Python (3.13t and later), with the GIL disabled.
+
+Conventions are shipped to the workers once, when they start: built-in conventions
+are sent by name, and custom conventions are pickled, which requires their parser
+and converter to be picklable, like `nomage.tokenizer` tokenizers or module-level
+functions (not lambdas).
+
+Examples:
+    >>> results = convert_many_parallel(
+    ...     ["myId", "MyId", "my__id"], "snake", jobs=2
+    ... )
+    >>> [r.converted for r in results]
+    ['my_id', 'my_id', None]
+"""
+
+import os
+import sys
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, TypeVar
+
+from nomage.convention import NamingConvention
+from nomage.engine import get_engine
+from nomage.exceptions import UnrecognizedNamingConventionError
+from nomage.naming import (
+    BUILTINS_CONVENTIONS,
+    ConversionResult,
+    _convert_many,
+    _registry_of,
+    _resolve_convention,
+    _transcoder,
+)
+from nomage.registry import ConventionRegistry
+
+DEFAULT_CHUNKSIZE = 1024
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+# Conversion function of a worker process, set once by `_init_worker`.
+_worker_convert: Callable[[str], str | None]
+
+
+def convert_many_parallel(
+    id_strs: Iterable[str],
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+    *,
+    jobs: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[ConversionResult]:
+    """
+    Convert many str identifiers to a naming convention, on a pool of processes.
+
+    Results are the same as `convert_many`, in input order. Input is consumed
+    lazily, only a few chunks per worker are in flight at any time, so memory
+    stays bounded on huge inputs.
+
+    Args:
+        id_strs: An iterable of identifier strings to convert.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+        jobs: The number of worker processes, defaults to the number of CPUs.
+        chunksize: The number of identifiers sent to a worker at once.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+
+    Yields:
+        A result for each identifier, in input order.
+    """
+    target = _resolve_convention(nc, _registry_of(conventions))
+    ncs = get_engine(conventions).conventions
+    return _convert_many_parallel(id_strs, target, ncs, jobs, chunksize)
+
+
+def convert_many_threaded(
+    id_strs: Iterable[str],
+    nc: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+    *,
+    jobs: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[ConversionResult]:
+    """
+    Convert many str identifiers to a naming convention, on a pool of threads.
+
+    Results are the same as `convert_many`, in input order, and input is consumed
+    lazily like `convert_many_parallel`. Custom conventions need not be picklable.
+
+    With the GIL, a single thread runs Python code at a time, so threads cannot
+    convert faster than the calling thread alone: by default, identifiers are then
+    converted in the calling thread, like `convert_many`.
+
+    Examples:
+        >>> results = convert_many_threaded(["myId", "my__id"], "kebab", jobs=2)
+        >>> [r.converted for r in results]
+        ['my-id', None]
+
+    Args:
+        id_strs: An iterable of identifier strings to convert.
+        nc: Either a string name of a convention or a NamingConvention obj.
+        conventions: An iterable of naming conventions to try matching against,
+            or a `ConventionRegistry` to also look `nc` up in.
+            Defaults to the built-in conventions.
+        jobs: The number of worker threads. Defaults to the number of CPUs when
+            the GIL is disabled, and to 1, converting in the calling thread,
+            otherwise.
+        chunksize: The number of identifiers given to a thread at once.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when `nc` is an str and no matching naming convention found.
+
+    Yields:
+        A result for each identifier, in input order.
+    """
+    target = _resolve_convention(nc, _registry_of(conventions))
+    detect = get_engine(conventions).detect
+    if jobs is None:
+        jobs = 1 if gil_enabled() else os.cpu_count() or 1
+    if jobs <= 1:
+        return _convert_many(id_strs, target, detect)
+    # A single converter is shared by the threads, with its compiled transcoders.
+    convert = _converter(detect, target)
+    results = _imap_ordered(
+        partial(_convert_list, convert),
+        _chunked(id_strs, chunksize),
+        jobs=jobs,
+        executor_class=ThreadPoolExecutor,
+    )
+    return _results(results)
+
+
+def gil_enabled() -> bool:
+    """
+    Tell if the GIL is enabled, which prevents threads from running in parallel.
+
+    Returns:
+        False on free-threaded builds of Python running without the GIL, True
+        otherwise.
+    """
+    is_gil_enabled: Callable[[], bool] | None = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def _convert_many_parallel(
+    id_strs: Iterable[str],
+    target: NamingConvention,
+    conventions: tuple[NamingConvention, ...],
+    jobs: int | None,
+    chunksize: int,
+) -> Iterator[ConversionResult]:
+    chunks = _chunked(id_strs, chunksize)
+    results = _imap_ordered(
+        _convert_chunk,
+        chunks,
+        jobs=jobs,
+        initializer=_init_worker,
+        initargs=(conventions, target),
+    )
+    return _results(results)
+
+
+def _results(
+    results: Iterable[tuple[list[str], list[str | None]]],
+) -> Iterator[ConversionResult]:
+    for chunk, converted in results:
+        for id_str, value in zip(chunk, converted, strict=True):
+            if value is None:
+                yield ConversionResult(
+                    id_str, None, UnrecognizedNamingConventionError(id_str)
+                )
+            else:
+                yield ConversionResult(id_str, value, None)
+
+
+def _imap_ordered(  # noqa: PLR0913
+    func: Callable[[_T], _R],
+    items: Iterable[_T],
+    *,
+    jobs: int | None = None,
+    initializer: Callable[..., object] | None = None,
+    initargs: tuple[Any, ...] = (),
+    executor_class: type[ProcessPoolExecutor | ThreadPoolExecutor] = (
+        ProcessPoolExecutor
+    ),
+) -> Iterator[tuple[_T, _R]]:
+    # Unlike `Executor.map`, items are submitted as results are consumed, with at
+    # most two items per worker in flight.
+    jobs = jobs or os.cpu_count() or 1
+    executor = executor_class(
+        max_workers=jobs, initializer=initializer, initargs=initargs
+    )
+    window = 2 * jobs
+    pending: deque[tuple[_T, Future[_R]]] = deque()
+    try:
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= window:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _chunked(items: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _init_worker(
+    conventions: tuple[NamingConvention, ...], target: NamingConvention
+) -> None:
+    global _worker_convert  # noqa: PLW0603
+    _worker_convert = _converter(get_engine(conventions).detect, target)
+
+
+def _converter(
+    detect: Callable[[str], NamingConvention | None], target: NamingConvention
+) -> Callable[[str], str | None]:
+    transcode = _transcoder(target)
+
+    def convert(id_str: str) -> str | None:
+        nc = detect(id_str)
+        return None if nc is None else transcode(nc)(id_str)
+
+    return convert
+
+
+def _convert_chunk(id_strs: list[str]) -> list[str | None]:
+    return list(map(_worker_convert, id_strs))
+
+
+def _convert_list(
+    convert: Callable[[str], str | None], id_strs: list[str]
+) -> list[str | None]:
+    return list(map(convert, id_strs))
@@ -0,0 +1,223 @@
+r"""
+Nomage - naming convention registry.
+
+This module provides `ConventionRegistry`, a mapping of naming conventions by name,
+where custom conventions can be registered next to or instead of the built-in ones.
+
+Names are looked up like the built-in conventions: lookups are not case-sensitive,
+and ignore the "case" word, hyphens, underscores and spaces. The normalized form of
+each looked up name is memoized, so that repeated lookups of the same name are a
+single dict access.
+
+Registries can be shared by threads: lookups and detection are lock-free, while
+registrations are serialized by a lock of the registry. Iterating a registry while
+another thread registers in it is not supported, like for any dict.
+
+A registry can be passed to `naming`, `Identifier.to`, `convert_many` and the other
+functions taking conventions, which then detect identifiers with the conventions of
+the registry, and resolve names in it.
+
+Examples:
+    >>> import re
+    >>> from nomage import NamingConvention, builtins_conventions, naming
+    >>> from nomage.tokenizer import Tokenizer
+    >>> registry = builtins_conventions().copy()
+    >>> registry.register(
+    ...     NamingConvention(
+    ...         names=("dot.case",),
+    ...         match_regex=re.compile(r"^[a-z]+(\.[a-z]+)+$"),
+    ...         parser=Tokenizer("."),
+    ...         converter=".".join,
+    ...     )
+    ... )
+    NamingConvention(names=('dot.case',), ...)
+    >>> naming("my.id", registry).to("snake")
+    'my_id'
+    >>> naming("myId").to("Dot.Case", registry)
+    'my.id'
+"""
+
+import threading
+from collections.abc import Iterable, Iterator, Mapping
+from typing import TypeVar, overload
+
+from nomage.convention import NamingConvention
+from nomage.engine import DetectionEngine, get_engine
+
+_T = TypeVar("_T")
+
+# Bounds the memo of looked up names, which can come from user input.
+_LOOKUPS_MAX_SIZE = 1024
+
+
+class ConventionRegistry(Mapping[str, NamingConvention]):
+    """
+    Mapping of naming conventions by name, supporting custom conventions.
+
+    The mapping has a key for each name of each convention, in registration order,
+    and its length is the number of conventions, like the mapping of the built-in
+    conventions. Conventions are also listed once each, in registration order, by
+    the `conventions` property, and detection tries them in that order.
+    """
+
+    __slots__ = (
+        "_conventions",
+        "_engine",
+        "_index",
+        "_lock",
+        "_lookups",
+        "_names",
+        "_shared",
+    )
+
+    def __init__(self, conventions: Iterable[NamingConvention] = (), /) -> None:
+        """
+        Create a registry of naming conventions.
+
+        Args:
+            conventions: The naming conventions to register, in order.
+
+        Raises:
+            ValueError: Raised when two conventions have the same name.
+        """
+        self._conventions: dict[int, NamingConvention] = {}
+        self._names: dict[str, NamingConvention] = {}
+        self._index: dict[str, NamingConvention] = {}
+        self._lookups: dict[str, NamingConvention] = {}
+        self._engine: DetectionEngine | None = None
+        self._shared = False
+        self._lock = threading.RLock()
+        for nc in conventions:
+            self.register(nc)
+
+    @classmethod
+    def _shared_registry(
+        cls, conventions: Iterable[NamingConvention], /
+    ) -> "ConventionRegistry":
+        # Registries shared by the whole process, like the built-in conventions,
+        # must not change under their users.
+        registry = cls(conventions)
+        registry._shared = True
+        return registry
+
+    @property
+    def conventions(self) -> tuple[NamingConvention, ...]:
+        """The registered naming conventions, once each, in registration order."""
+        return tuple(self._conventions.values())
+
+    @property
+    def engine(self) -> DetectionEngine:
+        """The detection engine of the registered conventions, built on first use."""
+        engine = self._engine
+        if engine is None:
+            with self._lock:
+                # Same key as an iterable of the conventions of each name, like
+                # `BUILTINS_CONVENTIONS`, so that their engine is shared.
+                engine = self._engine = get_engine(tuple(self._names.values()))
+        return engine
+
+    def register(
+        self, nc: NamingConvention, /, *, replace: bool = False
+    ) -> NamingConvention:
+        """
+        Register a naming convention, after the registered ones.
+
+        Registering a convention already registered does nothing.
+
+        Args:
+            nc: The naming convention to register.
+            replace: If True, the registered conventions sharing a name with `nc`
+                are unregistered first.
+
+        Raises:
+            TypeError: Raised when the registry is shared, like the built-in one.
+            ValueError: Raised when a name of `nc` is already registered for another
+                convention, unless `replace` is True.
+
+        Returns:
+            The registered naming convention, so that it can be used inline.
+        """
+        if self._shared:
+            msg = "shared registries cannot be changed, register in a copy"
+            raise TypeError(msg)
+        with self._lock:
+            if id(nc) in self._conventions:
+                return nc
+            for name in nc.names:
+                registered = self._index.get(NamingConvention.get_name_index(name))
+                if registered is None:
+                    continue
+                if not replace:
+                    msg = f"naming convention name '{name}' is already registered"
+                    raise ValueError(msg)
+                self._unregister(registered)
+            self._conventions[id(nc)] = nc
+            for name in nc.names:
+                self._names[name] = nc
+                self._index[NamingConvention.get_name_index(name)] = nc
+            self._engine = None
+        return nc
+
+    def copy(self) -> "ConventionRegistry":
+        """
+        Copy the registry, to register conventions without changing the original.
+
+        Returns:
+            A new registry with the same conventions.
+        """
+        with self._lock:
+            return ConventionRegistry(tuple(self._conventions.values()))
+
+    def _unregister(self, nc: NamingConvention) -> None:
+        del self._conventions[id(nc)]
+        for name in nc.names:
+            del self._names[name]
+            del self._index[NamingConvention.get_name_index(name)]
+        # Replaced rather than cleared, so that a lookup racing with this one
+        # memoizes the unregistered convention in the dropped memo.
+        self._lookups = {}
+
+    def __getitem__(self, key: str) -> NamingConvention:
+        lookups = self._lookups
+        try:
+            return lookups[key]
+        except KeyError:
+            pass
+        nc = self._index[NamingConvention.get_name_index(key)]
+        if len(lookups) < _LOOKUPS_MAX_SIZE:
+            lookups[key] = nc
+        return nc
+
+    @overload
+    def get(self, key: str, /) -> NamingConvention | None: ...
+
+    @overload
+    def get(
+        self, key: str, /, default: NamingConvention | _T
+    ) -> NamingConvention | _T: ...
+
+    def get(self, key: str, /, default: object = None) -> object:
+        """Get a naming convention by name, or `default` if not registered."""
+        lookups = self._lookups
+        nc = lookups.get(key)
+        if nc is not None:
+            return nc
+        nc = self._index.get(NamingConvention.get_name_index(key))
+        if nc is None:
+            return default
+        if len(lookups) < _LOOKUPS_MAX_SIZE:
+            lookups[key] = nc
+        return nc
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._conventions)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __repr__(self) -> str:
+        names = ", ".join(repr(nc.names[0]) for nc in self._conventions.values())
+        return f"ConventionRegistry([{names}])"
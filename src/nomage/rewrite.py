@@ -0,0 +1,366 @@
+"""
+Nomage - convention migration of source trees.
+
+This module rewrites the identifiers of a naming convention to another one, across
+files and directory trees. Identifiers are extracted from the text with a simple
+word pattern, so identifiers in code, strings and comments alike are rewritten.
+
+An identifier is rewritten when it is detected by `naming` as being in the source
+convention. Identifiers matching several conventions are only rewritten when the
+source is the first one matching them: single lower case words like `user` are
+flatcase, not camelCase.
+
+Files are read through memory-mapped buffers, and only written back when they
+change. Files holding NUL bytes are considered binary, and skipped.
+
+Examples:
+    >>> rewrite_text("userId = getUserId(user)", "camel", "snake")
+    'user_id = get_user_id(user)'
+"""
+
+import contextlib
+import difflib
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from fnmatch import translate
+from itertools import chain
+from pathlib import Path
+
+from nomage._signature import HYPHEN, analyze
+from nomage.convention import NamingConvention
+from nomage.engine import get_engine
+from nomage.naming import BUILTINS_CONVENTIONS, _resolve_convention, compile_converter
+
+DEFAULT_EXCLUDE = (".git", ".hg", ".svn")
+DEFAULT_CHUNKSIZE = 64
+
+# Files with a NUL byte in their first block are considered binary.
+_BINARY_SNIFF_SIZE = 8192
+# Bytes `\w` is ASCII only, bytes of non-ASCII UTF-8 characters are word bytes too,
+# so that words are never split in the middle of one.
+_WORD_REGEX = rb"(?<![\w\x80-\xff])[A-Za-z_\x80-\xff][\w\x80-\xff]*"
+# A hyphen before a word joins it to the previous one, in hyphenated conventions.
+_HYPHENATED_WORD_REGEX = (
+    rb"(?<![\w\x80-\xff-])[A-Za-z_\x80-\xff][\w\x80-\xff]*(?:-[\w\x80-\xff]+)*"
+)
+
+# Rewriter of a worker process, set once by `_init_worker`.
+_worker_rewriter: "_Rewriter"
+
+
+@dataclass(frozen=True, slots=True)
+class FileRewrite:
+    """
+    Result of the rewrite of a file.
+
+    Attributes:
+        path: The path of the file.
+        replacements: The number of rewritten identifiers.
+        diff: The unified diff of the changes for dry runs, None otherwise.
+        error: The error which prevented reading or writing the file, if any.
+    """
+
+    path: str
+    replacements: int
+    diff: str | None = None
+    error: OSError | None = None
+
+
+class _Rewriter:
+    """Rewrite identifiers of a convention in bytes, remembering each identifier."""
+
+    def __init__(
+        self,
+        source: NamingConvention,
+        target: NamingConvention,
+        conventions: tuple[NamingConvention, ...],
+    ) -> None:
+        self.source = source
+        self.target = target
+        self._detect = get_engine(conventions).detect_bytes
+        self._convert = compile_converter(source, target)
+        hyphenated = analyze(source.match_regex).alphabet & HYPHEN
+        self._words = re.compile(_HYPHENATED_WORD_REGEX if hyphenated else _WORD_REGEX)
+        # Identifiers repeat a lot across files, conversions are computed once.
+        self._replacements: dict[bytes, bytes | None] = {}
+
+    def replacements(self, data: bytes | mmap.mmap) -> dict[bytes, bytes]:
+        """Find the identifiers to rewrite in data, with their replacement."""
+        found = {}
+        for word in set(self._words.findall(data)):
+            replacement = self._replacement(word)
+            if replacement is not None:
+                found[word] = replacement
+        return found
+
+    def rewrite(self, data: bytes | mmap.mmap) -> tuple[bytes | None, int]:
+        """Rewrite identifiers in data, None if unchanged, and their count."""
+        replacements = self.replacements(data)
+        if not replacements:
+            return None, 0
+        count = 0
+
+        def replace(m: re.Match[bytes]) -> bytes:
+            nonlocal count
+            replacement = replacements.get(m[0])
+            if replacement is None:
+                return m[0]
+            count += 1
+            return replacement
+
+        return self._words.sub(replace, data), count
+
+    def rewrite_file(self, path: str, *, dry_run: bool) -> FileRewrite:
+        """Rewrite identifiers of a file, or compute the diff for dry runs."""
+        try:
+            with Path(path).open("rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return FileRewrite(path, 0)
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if b"\0" in data[:_BINARY_SNIFF_SIZE]:
+                        return FileRewrite(path, 0)
+                    rewritten, count = self.rewrite(data)
+                    original = data[:] if dry_run and rewritten is not None else b""
+            if rewritten is None:
+                return FileRewrite(path, 0)
+            if dry_run:
+                return FileRewrite(path, count, _diff(path, original, rewritten))
+            _write_atomic(path, rewritten)
+        except OSError as err:
+            return FileRewrite(path, 0, error=err)
+        return FileRewrite(path, count)
+
+    def _replacement(self, word: bytes) -> bytes | None:
+        try:
+            return self._replacements[word]
+        except KeyError:
+            pass
+        replacement = None
+        # Most words are not in the source convention, only the others are decoded.
+        if self.source.match_bytes(word) and self._detect(word) is self.source:
+            # Words matching a convention are valid UTF-8.
+            id_str = word.decode("utf-8")
+            converted = self._convert(id_str)
+            if converted != id_str:
+                replacement = converted.encode("utf-8")
+        self._replacements[word] = replacement
+        return replacement
+
+
+def rewrite_text(
+    text: str,
+    source: str | NamingConvention,
+    target: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] = BUILTINS_CONVENTIONS,
+) -> str:
+    """
+    Rewrite the identifiers of a convention in a text to another convention.
+
+    Args:
+        text: The text to rewrite.
+        source: The convention of the identifiers to rewrite, name or obj.
+        target: The convention to rewrite identifiers to, name or obj.
+        conventions: The naming conventions used to detect identifiers.
+            Defaults to the built-in conventions.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when a name is given and no matching naming convention found.
+
+    Returns:
+        The rewritten text.
+    """
+    rewriter = _Rewriter(
+        _resolve_convention(source), _resolve_convention(target), tuple(conventions)
+    )
+    data = text.encode("utf-8", errors="surrogateescape")
+    rewritten, _ = rewriter.rewrite(data)
+    if rewritten is None:
+        return text
+    return rewritten.decode("utf-8", errors="surrogateescape")
+
+
+def find_files(
+    paths: Iterable[str],
+    *,
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = DEFAULT_EXCLUDE,
+) -> Iterator[str]:
+    """
+    List the files of directory trees, filtered by glob patterns.
+
+    Patterns are matched against file and directory names, and against their path
+    relative to the searched directory. Excluded directories are not walked into.
+
+    Args:
+        paths: The files and directories to search.
+        include: Patterns of the files to keep, all files if empty.
+        exclude: Patterns of the files and directories to skip.
+
+    Yields:
+        The paths of the files, directory by directory in sorted order.
+    """
+    included = _compile_globs(include) if include else None
+    excluded = _compile_globs(exclude)
+
+    def is_selected(name: str, relative: str) -> bool:
+        if excluded and (excluded(name) or excluded(relative)):
+            return False
+        return included is None or bool(included(name) or included(relative))
+
+    for path in paths:
+        if not Path(path).is_dir():
+            if is_selected(Path(path).name, path):
+                yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            relative_root = os.path.relpath(root, path)
+            prefix = "" if relative_root == "." else relative_root + os.sep
+            if excluded:
+                dirs[:] = [
+                    d for d in dirs if not excluded(d) and not excluded(prefix + d)
+                ]
+            dirs.sort()
+            for name in sorted(files):
+                if is_selected(name, prefix + name):
+                    yield str(Path(root, name))
+
+
+def rewrite_tree(  # noqa: PLR0913
+    paths: Iterable[str],
+    source: str | NamingConvention,
+    target: str | NamingConvention,
+    /,
+    conventions: Iterable[NamingConvention] = BUILTINS_CONVENTIONS,
+    *,
+    include: Iterable[str] = (),
+    exclude: Iterable[str] = DEFAULT_EXCLUDE,
+    dry_run: bool = False,
+    jobs: int = 1,
+) -> Iterator[FileRewrite]:
+    """
+    Rewrite the identifiers of a convention to another one, across files.
+
+    Args:
+        paths: The files and directories to rewrite.
+        source: The convention of the identifiers to rewrite, name or obj.
+        target: The convention to rewrite identifiers to, name or obj.
+        conventions: The naming conventions used to detect identifiers.
+            Defaults to the built-in conventions.
+        include: Patterns of the files to rewrite, all files if empty.
+        exclude: Patterns of the files and directories to skip.
+        dry_run: If True, files are not written, and diffs are computed.
+        jobs: The number of worker processes, 0 for one per CPU.
+
+    Raises:
+        UnknownNamingConventionError:
+            Raised when a name is given and no matching naming convention found.
+
+    Yields:
+        The results of the files with identifiers to rewrite or with errors,
+        in the order of `find_files`.
+    """
+    rewriter_args = (
+        _resolve_convention(source),
+        _resolve_convention(target),
+        tuple(conventions),
+    )
+    files = find_files(paths, include=include, exclude=exclude)
+    return _rewrite_files(files, rewriter_args, dry_run, jobs)
+
+
+def _rewrite_files(
+    files: Iterable[str],
+    rewriter_args: tuple[
+        NamingConvention, NamingConvention, tuple[NamingConvention, ...]
+    ],
+    dry_run: bool,
+    jobs: int,
+) -> Iterator[FileRewrite]:
+    if jobs == 1:
+        rewriter = _Rewriter(*rewriter_args)
+        results: Iterable[FileRewrite] = (
+            rewriter.rewrite_file(path, dry_run=dry_run) for path in files
+        )
+    else:
+        # Only loaded for parallel runs, process pools are slow to import.
+        from nomage.parallel import _chunked, _imap_ordered  # noqa: PLC0415
+
+        chunks = _imap_ordered(
+            _rewrite_chunk,
+            ((paths, dry_run) for paths in _chunked(files, DEFAULT_CHUNKSIZE)),
+            jobs=jobs or None,
+            initializer=_init_worker,
+            initargs=rewriter_args,
+        )
+        results = chain.from_iterable(chunk for _, chunk in chunks)
+    for result in results:
+        if result.replacements or result.error:
+            yield result
+
+
+def _init_worker(
+    source: NamingConvention,
+    target: NamingConvention,
+    conventions: tuple[NamingConvention, ...],
+) -> None:
+    global _worker_rewriter  # noqa: PLW0603
+    _worker_rewriter = _Rewriter(source, target, conventions)
+
+
+def _rewrite_chunk(chunk: tuple[list[str], bool]) -> list[FileRewrite]:
+    paths, dry_run = chunk
+    return [_worker_rewriter.rewrite_file(path, dry_run=dry_run) for path in paths]
+
+
+def _compile_globs(patterns: Iterable[str]) -> Callable[[str], object] | None:
+    regexes = [translate(pattern) for pattern in patterns]
+    if not regexes:
+        return None
+    return re.compile("|".join(regexes)).match
+
+
+def _diff(path: str, original: bytes, rewritten: bytes) -> str:
+    return "".join(
+        difflib.unified_diff(
+            original.decode("utf-8", errors="surrogateescape").splitlines(True),
+            rewritten.decode("utf-8", errors="surrogateescape").splitlines(True),
+            fromfile=f"a/{path}",
+            tofile=f"b/{path}",
+        )
+    )
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    # Written next to the file then renamed, so that it is never left half written.
+    # Symbolic links are followed, the target is rewritten and the link kept.
+    path = os.path.realpath(path)
+    fd, tmp_path = tempfile.mkstemp(dir=Path(path).parent, prefix=".nomage-")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        if Path(path).exists():
+            shutil.copymode(path, tmp_path)
+            _copy_owner(path, tmp_path)
+        Path(tmp_path).replace(path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _copy_owner(source: str, destination: str) -> None:
+    if not hasattr(os, "chown"):  # pragma: no cover
+        return
+    stat = Path(source).stat()
+    try:
+        os.chown(destination, stat.st_uid, stat.st_gid)
+    except PermissionError:
+        # Only privileged users can give files away, the group may still be kept.
+        with contextlib.suppress(PermissionError):
+            os.chown(destination, -1, stat.st_gid)
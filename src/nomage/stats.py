@@ -0,0 +1,311 @@
+"""
+Nomage - naming convention census.
+
+This module streams identifiers and counts, for each naming convention, how many of
+them are detected in it and how many distinct ones there are. It also counts the
+ambiguous identifiers, matching more than one convention (like `user`, which is
+both flatcase and camelCase and is detected as the first one), and the
+unrecognized identifiers.
+
+Identifiers are consumed one by one. The detection of each distinct identifier is
+remembered, since identifiers repeat a lot in real corpora. For unbounded streams,
+the `approximate` mode keeps memory constant: distinct identifiers are estimated with
+HyperLogLog sketches, and the detection memo is bounded. Sample identifiers of each
+convention can be kept with reservoir sampling, in constant memory too.
+
+Examples:
+    >>> report = census(["user", "myUser", "my_user", "my_user", "my__user"])
+    >>> report.conventions["snake_case"]
+    ConventionCount(count=2, distinct=1, samples=())
+    >>> report.ambiguous, report.unrecognized.count
+    (1, 1)
+    >>> report.overlaps
+    {('flatcase', 'camelCase', 'snake_case', 'camel_Snake_Case', 'kebab-case'): 1}
+"""
+
+import math
+import random
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from nomage.convention import NamingConvention
+from nomage.engine import DetectionEngine, get_engine
+from nomage.naming import BUILTINS_CONVENTIONS
+from nomage.registry import ConventionRegistry
+
+# Distinct identifiers whose detection is remembered in the approximate mode.
+_MEMO_MAX_SIZE = 1 << 16
+# HyperLogLog sketches have 2**14 registers, for a standard error of about 0.8%.
+_HLL_PRECISION = 14
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_HASH_REST_BITS = _HASH_BITS - _HLL_PRECISION
+_HASH_REST_MASK = (1 << _HASH_REST_BITS) - 1
+
+
+@dataclass(frozen=True, slots=True)
+class ConventionCount:
+    """
+    Counts of the identifiers detected in a naming convention.
+
+    Attributes:
+        count: The number of identifiers, repeated ones included.
+        distinct: The number of distinct identifiers, estimated in the
+            approximate mode.
+        samples: Identifiers sampled uniformly among all of them, if requested.
+    """
+
+    count: int
+    distinct: int
+    samples: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Census:
+    """
+    Census of the naming conventions of a stream of identifiers.
+
+    Attributes:
+        total: The number of identifiers, repeated ones included.
+        conventions: The counts of each convention by first name, in detection
+            order. Identifiers are counted in the first convention they match.
+        unrecognized: The counts of the identifiers matching no convention.
+        ambiguous: The number of identifiers matching more than one convention.
+        overlaps: The number of ambiguous identifiers by the first names of the
+            conventions they match, most frequent first.
+        approximate: True if distinct counts are estimates.
+    """
+
+    total: int
+    conventions: dict[str, ConventionCount]
+    unrecognized: ConventionCount
+    ambiguous: int
+    overlaps: dict[tuple[str, ...], int]
+    approximate: bool = False
+
+    @property
+    def distinct(self) -> int:
+        """The number of distinct identifiers."""
+        return self.unrecognized.distinct + sum(
+            count.distinct for count in self.conventions.values()
+        )
+
+    @property
+    def ambiguous_rate(self) -> float:
+        """The share of identifiers matching more than one convention."""
+        return self.ambiguous / self.total if self.total else 0.0
+
+    @property
+    def unrecognized_rate(self) -> float:
+        """The share of identifiers matching no convention."""
+        return self.unrecognized.count / self.total if self.total else 0.0
+
+
+def census(
+    id_strs: Iterable[str],
+    /,
+    conventions: Iterable[NamingConvention] | ConventionRegistry = BUILTINS_CONVENTIONS,
+    *,
+    approximate: bool = False,
+    sample_size: int = 0,
+    seed: int | None = None,
+) -> Census:
+    """
+    Count the naming conventions of a stream of identifiers.
+
+    Identifiers are detected like `naming` does, and also matched against all the
+    other conventions to find the ambiguous ones. Memory grows with the number of
+    distinct identifiers, unless `approximate` is True.
+
+    Args:
+        id_strs: An iterable of identifier strings, consumed once.
+        conventions: An iterable of naming conventions to detect identifiers with,
+            or a `ConventionRegistry`. Defaults to the built-in conventions.
+        approximate: If True, distinct identifiers are estimated with HyperLogLog
+            sketches, and memory stays constant on unbounded streams.
+        sample_size: The number of identifiers to sample for each convention.
+        seed: The seed of the sampling random generator, for reproducible samples.
+
+    Raises:
+        ValueError: Raised when `sample_size` is negative.
+
+    Returns:
+        The census of the identifiers.
+    """
+    if sample_size < 0:
+        msg = "sample_size must not be negative"
+        raise ValueError(msg)
+    counter = _Counter(get_engine(conventions), approximate, sample_size, seed)
+    for id_str in id_strs:
+        counter.add(id_str)
+    return counter.report()
+
+
+class _Counter:
+    """Counters of a census, for each convention and unrecognized identifiers."""
+
+    __slots__ = (
+        "_approximate",
+        "_counts",
+        "_distinct",
+        "_engine",
+        "_index",
+        "_memo",
+        "_overlaps",
+        "_reservoirs",
+        "_sketches",
+    )
+
+    def __init__(
+        self,
+        engine: DetectionEngine,
+        approximate: bool,
+        sample_size: int,
+        seed: int | None,
+    ) -> None:
+        self._engine = engine
+        self._index = {id(nc): i for i, nc in enumerate(engine.conventions)}
+        # Unrecognized identifiers are counted after the conventions.
+        size = len(engine.conventions) + 1
+        self._approximate = approximate
+        self._counts = [0] * size
+        self._distinct = [0] * size
+        self._sketches = [_HyperLogLog() for _ in range(size)] if approximate else []
+        rng = random.Random(seed)  # noqa: S311
+        self._reservoirs = (
+            [_Reservoir(sample_size, rng) for _ in range(size)] if sample_size else []
+        )
+        self._overlaps: dict[tuple[int, ...], int] = {}
+        # Detected convention and matching conventions if ambiguous, by identifier.
+        self._memo: dict[str, tuple[int, tuple[int, ...] | None]] = {}
+
+    def add(self, id_str: str) -> None:
+        """Count an identifier."""
+        entry = self._memo.get(id_str)
+        if entry is None:
+            entry = self._detect(id_str)
+            if not self._approximate:
+                # Every distinct identifier is remembered, the memo is exact.
+                self._memo[id_str] = entry
+                self._distinct[entry[0]] += 1
+            elif len(self._memo) < _MEMO_MAX_SIZE:
+                self._memo[id_str] = entry
+        index, overlap = entry
+        self._counts[index] += 1
+        if overlap is not None:
+            self._overlaps[overlap] = self._overlaps.get(overlap, 0) + 1
+        if self._sketches:
+            self._sketches[index].add(id_str)
+        if self._reservoirs:
+            self._reservoirs[index].add(id_str)
+
+    def _detect(self, id_str: str) -> tuple[int, tuple[int, ...] | None]:
+        index = self._index
+        matches = tuple(
+            index[id(nc)] for nc in self._engine.candidates(id_str) if nc.match(id_str)
+        )
+        if not matches:
+            return len(index), None
+        return matches[0], matches if len(matches) > 1 else None
+
+    def report(self) -> Census:
+        """Build the census of the identifiers counted so far."""
+        distinct = (
+            [sketch.estimate() for sketch in self._sketches]
+            if self._approximate
+            else self._distinct
+        )
+        samples: list[tuple[str, ...]] = [()] * len(self._counts)
+        if self._reservoirs:
+            samples = [tuple(reservoir.items) for reservoir in self._reservoirs]
+        counts = [
+            ConventionCount(*values)
+            for values in zip(self._counts, distinct, samples, strict=True)
+        ]
+        names = [nc.names[0] for nc in self._engine.conventions]
+        overlaps = sorted(self._overlaps.items(), key=lambda item: -item[1])
+        return Census(
+            total=sum(self._counts),
+            conventions=dict(zip(names, counts, strict=False)),
+            unrecognized=counts[-1],
+            ambiguous=sum(self._overlaps.values()),
+            overlaps={tuple(names[i] for i in key): n for key, n in overlaps},
+            approximate=self._approximate,
+        )
+
+
+class _HyperLogLog:
+    """
+    HyperLogLog sketch, estimating the number of distinct strings added to it.
+
+    Strings are hashed with the built-in `hash`, which is randomized for each
+    process: estimates are only consistent within a process, and sketches of
+    different processes cannot be merged.
+    """
+
+    __slots__ = ("_registers",)
+
+    def __init__(self) -> None:
+        self._registers = bytearray(1 << _HLL_PRECISION)
+
+    def add(self, value: str) -> None:
+        """Add a string to the sketch."""
+        h = hash(value) & _HASH_MASK
+        index = h >> _HASH_REST_BITS
+        # Position of the first set bit in the rest of the hash, from the left.
+        rank = _HASH_REST_BITS - (h & _HASH_REST_MASK).bit_length() + 1
+        self._registers[index] = max(rank, self._registers[index])
+
+    def estimate(self) -> int:
+        """Estimate the number of distinct strings added to the sketch."""
+        m = len(self._registers)
+        zeros = self._registers.count(0)
+        if zeros == m:
+            return 0
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0**-rank for rank in self._registers)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+
+class _Reservoir:
+    """
+    Uniform sample of a stream of strings, with the reservoir sampling algorithm L.
+
+    Instead of drawing a random number for each string, the number of strings to
+    skip before the next replacement is drawn, so that sampling costs almost nothing
+    once the reservoir is full.
+    """
+
+    __slots__ = ("_next", "_rng", "_seen", "_size", "_weight", "items")
+
+    def __init__(self, size: int, rng: random.Random) -> None:
+        self.items: list[str] = []
+        self._size = size
+        self._rng = rng
+        self._seen = 0
+        self._next = 0
+        self._weight = 1.0
+
+    def add(self, value: str) -> None:
+        """Offer a string to the sample."""
+        self._seen += 1
+        if len(self.items) < self._size:
+            self.items.append(value)
+            if len(self.items) == self._size:
+                self._skip()
+        elif self._seen == self._next:
+            self.items[self._rng.randrange(self._size)] = value
+            self._skip()
+
+    def _skip(self) -> None:
+        # `1 - random()` is in (0, 1], so that its logarithm is defined.
+        rng = self._rng
+        self._weight *= math.exp(math.log(1.0 - rng.random()) / self._size)
+        if self._weight >= 1.0:
+            self._next = self._seen + 1
+            return
+        skip = math.floor(math.log(1.0 - rng.random()) / math.log1p(-self._weight))
+        self._next = self._seen + skip + 1
@@ -0,0 +1,288 @@
+"""
+Nomage - columnar identifier storage.
+
+This module provides memory-lean representations of parsed identifiers, for
+symbol tables holding millions of them:
+
+- `CompactIdentifier` stores one identifier as a single backing string plus the
+  end offsets of its components, instead of a tuple of strings.
+- `IdentifierTable` stores many identifiers in columns: components are interned
+  in a shared vocabulary and identifiers are flat arrays of integers.
+
+Examples:
+    >>> table = IdentifierTable.from_strings(["userId", "user_name", "USER_ID"])
+    >>> len(table)
+    3
+    >>> table[0].components
+    ('user', 'id')
+    >>> table[1].to("camel")
+    'userName'
+    >>> str(table[2])
+    'USER_ID'
+    >>> table.vocabulary
+    ('user', 'id', 'name')
+    >>> compact = CompactIdentifier.from_identifier(table[1])
+    >>> compact.components
+    ('user', 'name')
+    >>> compact.to("kebab")
+    'user-name'
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import overload
+
+from nomage.convention import NamingConvention
+from nomage.naming import BUILTINS_CONVENTIONS, Identifier, naming
+
+# Above this length, offsets do not fit in one byte each.
+_MAX_BYTE_OFFSET = 255
+
+
+@dataclass(frozen=True, slots=True)
+class CompactIdentifier:
+    """
+    An identifier stored as one backing string and the offsets of its components.
+
+    API-compatible with `Identifier`: the components are sliced from the backing
+    string on access. The backing string is interned, so equal identifiers share
+    it, and offsets take one byte per component for identifiers up to 255
+    characters long.
+
+    Attributes:
+        text: The concatenated components of the identifier.
+        ends: The end offset of each component in `text`, packed in bytes.
+        convention: The naming convention that was used to parse the identifier.
+    """
+
+    text: str
+    ends: bytes
+    convention: NamingConvention
+
+    @classmethod
+    def from_identifier(cls, identifier: Identifier, /) -> "CompactIdentifier":
+        """
+        Create a compact identifier from an identifier.
+
+        Args:
+            identifier: The identifier to compact.
+
+        Returns:
+            The compact representation of the identifier.
+        """
+        components = identifier.components
+        text = sys.intern("".join(components))
+        ends = list(accumulate(map(len, components)))
+        packed = (
+            bytes(ends) if len(text) <= _MAX_BYTE_OFFSET else array("I", ends).tobytes()
+        )
+        return cls(text, packed, identifier.convention)
+
+    @property
+    def components(self) -> tuple[str, ...]:
+        """The parsed components of the identifier in lower case."""
+        text = self.text
+        ends: Sequence[int] = (
+            self.ends
+            if len(text) <= _MAX_BYTE_OFFSET
+            else memoryview(self.ends).cast("I")
+        )
+        start = 0
+        components = []
+        for end in ends:
+            components.append(text[start:end])
+            start = end
+        return tuple(components)
+
+    def identifier(self) -> Identifier:
+        """
+        Expand the compact identifier.
+
+        Returns:
+            The equivalent `Identifier` obj.
+        """
+        return Identifier(self.components, self.convention)
+
+    def to(self, nc: str | NamingConvention, /) -> str:
+        """
+        Transform the identifier to another naming convention.
+
+        Args:
+            nc: Either a string name of a convention or a NamingConvention obj.
+
+        Raises:
+            UnknownNamingConventionError:
+                Raised when `nc` is an str and no matching naming convention found.
+
+        Returns:
+            The identifier transformed to the target convention.
+        """
+        return self.identifier().to(nc)
+
+    def __str__(self) -> str:
+        return self.convention.converter(self.components)
+
+
+class IdentifierTable(Sequence[Identifier]):
+    """
+    Columnar storage of parsed identifiers, with interned components.
+
+    Every distinct component (`id`, `user`, `name`...) is stored once in the
+    vocabulary. Each identifier then costs a few bytes: one integer per component
+    referencing the vocabulary, one offset, and one naming convention code.
+
+    Items are materialized as `Identifier` objs when accessed, so the table
+    is API-compatible with a sequence of identifiers.
+
+    The memory taken by the table is given by `nbytes`. For typical identifiers of
+    two or three components, it is around 20 bytes per identifier, compared to
+    several hundred bytes for a list of `Identifier` objs.
+    """
+
+    __slots__ = (
+        "_component_ids",
+        "_convention_codes",
+        "_convention_index",
+        "_conventions",
+        "_offsets",
+        "_vocabulary",
+        "_vocabulary_index",
+    )
+
+    def __init__(self, identifiers: Iterable[Identifier] = (), /) -> None:
+        self._vocabulary: list[str] = []
+        self._vocabulary_index: dict[str, int] = {}
+        self._conventions: list[NamingConvention] = []
+        self._convention_index: dict[int, int] = {}
+        self._component_ids = array("I")
+        self._offsets = array("Q", [0])
+        self._convention_codes = array("H")
+        self.extend(identifiers)
+
+    @classmethod
+    def from_strings(
+        cls,
+        id_strs: Iterable[str],
+        /,
+        conventions: Iterable[NamingConvention] = BUILTINS_CONVENTIONS,
+    ) -> "IdentifierTable":
+        """
+        Create a table by parsing str identifiers.
+
+        Args:
+            id_strs: The identifier strings to parse.
+            conventions: An iterable of naming conventions to try matching against.
+                Defaults to the built-in conventions.
+
+        Raises:
+            UnrecognizedNamingConventionError:
+                Raised when no matching convention for an identifier.
+
+        Returns:
+            A table with the parsed identifiers, in order.
+        """
+        return cls(naming(id_str, conventions) for id_str in id_strs)
+
+    @property
+    def vocabulary(self) -> tuple[str, ...]:
+        """The distinct components of the identifiers, in order of appearance."""
+        return tuple(self._vocabulary)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the table, in bytes."""
+        return (
+            sys.getsizeof(self._component_ids)
+            + sys.getsizeof(self._offsets)
+            + sys.getsizeof(self._convention_codes)
+            + sys.getsizeof(self._vocabulary)
+            + sys.getsizeof(self._vocabulary_index)
+            + sum(map(sys.getsizeof, self._vocabulary))
+        )
+
+    def append(self, identifier: Identifier, /) -> None:
+        """
+        Add an identifier at the end of the table.
+
+        Args:
+            identifier: The identifier to add.
+        """
+        vocabulary, index = self._vocabulary, self._vocabulary_index
+        for component in identifier.components:
+            component_id = index.get(component)
+            if component_id is None:
+                component_id = index[component] = len(vocabulary)
+                vocabulary.append(component)
+            self._component_ids.append(component_id)
+        self._offsets.append(len(self._component_ids))
+
+        nc = identifier.convention
+        code = self._convention_index.get(id(nc))
+        if code is None:
+            code = self._convention_index[id(nc)] = len(self._conventions)
+            self._conventions.append(nc)
+        self._convention_codes.append(code)
+
+    def extend(self, identifiers: Iterable[Identifier], /) -> None:
+        """
+        Add identifiers at the end of the table.
+
+        Args:
+            identifiers: The identifiers to add.
+        """
+        for identifier in identifiers:
+            self.append(identifier)
+
+    def components(self, index: int, /) -> tuple[str, ...]:
+        """
+        Get the components of an identifier, without materializing it.
+
+        Args:
+            index: The index of the identifier in the table.
+
+        Returns:
+            The components of the identifier, shared with the vocabulary.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = "identifier table index out of range"
+            raise IndexError(msg)
+        vocabulary = self._vocabulary
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return tuple(vocabulary[i] for i in self._component_ids[start:end])
+
+    def convention(self, index: int, /) -> NamingConvention:
+        """
+        Get the naming convention of an identifier, without materializing it.
+
+        Args:
+            index: The index of the identifier in the table.
+
+        Returns:
+            The naming convention the identifier was parsed with.
+        """
+        return self._conventions[self._convention_codes[index]]
+
+    @overload
+    def __getitem__(self, index: int) -> Identifier: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Identifier]: ...
+
+    def __getitem__(self, index: int | slice) -> Identifier | list[Identifier]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return Identifier(
+            components=self.components(index), convention=self.convention(index)
+        )
+
+    def __iter__(self) -> Iterator[Identifier]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __len__(self) -> int:
+        return len(self._convention_codes)
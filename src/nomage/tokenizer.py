@@ -0,0 +1,119 @@
+"""
+Nomage - identifier tokenizer.
+
+This module provides precompiled tokenizers splitting identifiers into lower case
+components, on a separator and/or on case boundaries. They are used as `parser`
+by the built-in naming conventions, and can be reused by custom ones.
+
+The common strategies are provided as plain functions, the cheapest callables to
+call, and `Tokenizer` builds a tokenizer for any other separator.
+
+Examples:
+    >>> split_on_case("myHttpServer")
+    ('my', 'http', 'server')
+    >>> split_on_underscore("MY_HTTP_SERVER")
+    ('my', 'http', 'server')
+    >>> Tokenizer(".", case_boundary=True)("my.httpServer")
+    ('my', 'http', 'server')
+    >>> Tokenizer()("MYHTTPSERVER")
+    ('myhttpserver',)
+"""
+
+import re
+from collections.abc import Callable
+from functools import partial
+
+
+class Tokenizer(partial[tuple[str, ...]]):
+    """
+    Split identifiers into lower case components in a single pass.
+
+    Components are delimited by a separator, by case boundaries (before each
+    upper case letter), or both. Without any of them, the identifier is a single
+    component. The splitting regular expression is compiled once, when the
+    tokenizer is created, and no intermediate string is built. Separators of
+    several characters are split on first, then each part on case boundaries.
+
+    A tokenizer is a `functools.partial` of a specialized splitting function.
+    Unlike lambdas, tokenizers are picklable, so conventions using them can be
+    sent to other processes.
+
+    Examples:
+        >>> Tokenizer(".")("my.http.server")
+        ('my', 'http', 'server')
+        >>> Tokenizer(".", case_boundary=True)("my.httpServer")
+        ('my', 'http', 'server')
+
+    Attributes:
+        separator: The string separating components, empty for none.
+        case_boundary: If True, an upper case letter starts a new component.
+    """
+
+    separator: str
+    case_boundary: bool
+
+    def __new__(  # noqa: PYI034
+        cls, separator: str = "", *, case_boundary: bool = False
+    ) -> "Tokenizer":
+        """
+        Create a tokenizer.
+
+        Args:
+            separator: The string separating components, empty for none.
+            case_boundary: If True, an upper case letter starts a new component.
+        """
+        if case_boundary and len(separator) > 1:
+            self = super().__new__(cls, _split_separator_case, separator)
+        elif case_boundary:
+            not_boundary = f"[^A-Z{re.escape(separator)}]"
+            regex = re.compile(f"[A-Z]{not_boundary}*|{not_boundary}+")
+            self = super().__new__(cls, _split_case, regex.findall)
+        elif separator:
+            self = super().__new__(cls, _split_separator, separator)
+        else:
+            self = super().__new__(cls, split_none)
+        self.separator = separator
+        self.case_boundary = case_boundary
+        return self
+
+    def __repr__(self) -> str:
+        return f"Tokenizer({self.separator!r}, case_boundary={self.case_boundary!r})"
+
+
+_CASE_FINDALL = re.compile(r"[A-Z][^A-Z]*|[^A-Z]+").findall
+
+
+def split_on_case(id_str: str, /) -> tuple[str, ...]:
+    """Split an identifier before each upper case letter, like camelCase."""
+    return tuple(map(str.lower, _CASE_FINDALL(id_str)))
+
+
+def split_on_underscore(id_str: str, /) -> tuple[str, ...]:
+    """Split an identifier on underscores, like snake_case."""
+    return tuple(id_str.lower().split("_"))
+
+
+def split_on_hyphen(id_str: str, /) -> tuple[str, ...]:
+    """Split an identifier on hyphens, like kebab-case."""
+    return tuple(id_str.lower().split("-"))
+
+
+def split_none(id_str: str, /) -> tuple[str, ...]:
+    """Keep an identifier as a single component, like flatcase."""
+    return (id_str.lower(),)
+
+
+def _split_separator(separator: str, id_str: str, /) -> tuple[str, ...]:
+    return tuple(id_str.lower().split(separator))
+
+
+def _split_separator_case(separator: str, id_str: str, /) -> tuple[str, ...]:
+    return tuple(
+        component.lower()
+        for part in id_str.split(separator)
+        for component in _CASE_FINDALL(part)
+    )
+
+
+def _split_case(findall: Callable[[str], list[str]], id_str: str, /) -> tuple[str, ...]:
+    return tuple(map(str.lower, findall(id_str)))
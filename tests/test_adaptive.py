@@ -0,0 +1,155 @@
+"""Tests for the Nomage adaptive ordering of detection."""
+
+import re
+from collections.abc import Iterator
+
+import pytest
+
+from nomage import NamingConvention
+from nomage._languages import disjoint
+from nomage.adaptive import disable_adaptive_ordering, enable_adaptive_ordering
+from nomage.engine import DetectionEngine
+from nomage.instrument import clear_instrumentation, instrumentation_info, instrumented
+from nomage.naming import BUILTINS_CONVENTIONS
+from nomage.tokenizer import Tokenizer
+
+IDENTIFIERS = [
+    "myid",
+    "MYID",
+    "myId",
+    "MyId",
+    "my_id",
+    "MY_ID",
+    "my_Id",
+    "my-id",
+    "MY-ID",
+    "My-Id",
+    "A",
+    "a",
+    "a1",
+    "my__id",
+    "",
+    "été",
+    "MY_ID\n",
+]
+
+
+@pytest.fixture(autouse=True)
+def _ordering() -> Iterator[None]:
+    yield
+    disable_adaptive_ordering()
+
+
+def _first_match(engine: DetectionEngine, id_str: str) -> NamingConvention | None:
+    return next((nc for nc in engine.conventions if nc.match(id_str)), None)
+
+
+def test_disjoint_builtins() -> None:
+    """Built-in conventions are disjoint when their first letters differ in case."""
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    for a in engine.conventions:
+        for b in engine.conventions:
+            lower = {a.match("a"), b.match("a")}
+            assert disjoint(a.match_regex, b.match_regex) == (lower == {True, False})
+
+
+@pytest.mark.parametrize(
+    ("a", "b", "expected"),
+    [
+        (r"^a$", r"^b$", True),
+        (r"^abc$", r"^a", False),
+        (r"^a$", r"^a\n", False),
+        (r"^a\Z", r"^a\n", True),
+        (r"^x{2,3}y$", r"^x{4}", True),
+        (r"^(ab|cd)e", r"^c.e", False),
+        (r"^(ab|cd)e", r"^cdf", True),
+        (r"^.", r"^\n", True),
+        (r"(?s)^.", r"^\n", False),
+        (r"^[^a-z]", r"^[a-c]", True),
+        (r"^a*$", r"^b*$", False),
+        # Constructs the analysis does not model are never proven disjoint.
+        (r"^\d", r"^a", False),
+        (r"(?i)^a", r"^b", False),
+        (r"^a(?=b)", r"^ac", False),
+        (r"^a$|^b", r"^c", False),
+    ],
+)
+def test_disjoint(a: str, b: str, expected: bool) -> None:
+    """Disjointness is proven on the languages matched by `re.match`."""
+    assert disjoint(re.compile(a), re.compile(b)) is expected
+    assert disjoint(re.compile(b), re.compile(a)) is expected
+
+
+def test_adaptive_order() -> None:
+    """Frequent conventions move ahead, and back behind once the workload changes."""
+    enable_adaptive_ordering(interval=2)
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    engine.detect("My-Id")
+    assert engine.order == engine.conventions
+    engine.detect("My-Id")
+    names = [nc.names[0] for nc in engine.order]
+    assert names[:5] == [
+        "UPPERCASE",
+        "PascalCase",
+        "ALL_CAPS",
+        "COBOL-CASE",
+        "Train-Case",
+    ]
+    for _ in range(8):
+        engine.detect("my_id")
+    order = engine.order
+    assert [nc.names[0] for nc in order][:3] == ["flatcase", "camelCase", "snake_case"]
+    disable_adaptive_ordering()
+    for _ in range(8):
+        engine.detect("MY_ID")
+    assert engine.order == order
+
+
+@pytest.mark.parametrize("hot", ["MY_ID", "My-Id", "my-id", "été"])
+def test_adaptive_detection(hot: str) -> None:
+    """Detections are the same in any adapted order."""
+    enable_adaptive_ordering(interval=3)
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    for _ in range(4):
+        for id_str in [hot] * 5 + IDENTIFIERS:
+            assert engine.detect(id_str) is _first_match(engine, id_str)
+            data = id_str.encode()
+            assert engine.detect_bytes(data) is _first_match(engine, id_str)
+
+
+def test_adaptive_overlapping() -> None:
+    """Conventions which could match the same identifiers keep their order."""
+    enable_adaptive_ordering(interval=2)
+    conventions = [
+        NamingConvention(
+            names=(name,),
+            match_regex=re.compile(regex),
+            parser=Tokenizer("_"),
+            converter="_".join,
+        )
+        for name, regex in [("lower", r"^[a-z_]+$"), ("snake", r"^[a-z]+(_[a-z]+)+$")]
+    ]
+    engine = DetectionEngine(conventions)
+    for _ in range(10):
+        assert engine.detect("my_id") is conventions[0]
+    assert engine.order == engine.conventions
+
+
+def test_adaptive_instrumented() -> None:
+    """Instrumentation counts attempts in the adapted order."""
+    enable_adaptive_ordering(interval=1)
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    engine.detect("MY_ID")
+    clear_instrumentation()
+    with instrumented():
+        engine.detect("MY_ID")
+    report = instrumentation_info()
+    clear_instrumentation()
+    assert report.conventions["ALL_CAPS"].hits == 1
+    assert "flatcase" not in report.conventions
+
+
+def test_enable_adaptive_ordering_invalid() -> None:
+    """The interval between reorderings must be positive."""
+    with pytest.raises(ValueError, match="must be positive"):
+        enable_adaptive_ordering(interval=0)
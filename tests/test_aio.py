@@ -0,0 +1,99 @@
+"""Tests for the Nomage asyncio streaming conversion."""
+
+import asyncio
+import re
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+
+import pytest
+
+from nomage import NamingConvention, builtins_conventions, convert_many
+from nomage.aio import aconvert_many
+from nomage.exceptions import UnknownNamingConventionError
+from nomage.naming import ConversionResult
+from nomage.tokenizer import Tokenizer
+
+DOT_CASE = NamingConvention(
+    names=("dot.case",),
+    match_regex=re.compile(r"^[a-z]+(\.[a-z]+)*$"),
+    parser=Tokenizer("."),
+    converter=".".join,
+)
+
+ID_STRS = ["myId", "my__id", "MY_ID", "myHttpServer", ""] * 100
+
+
+async def _source(id_strs: list[str]) -> AsyncIterator[str]:
+    for id_str in id_strs:
+        yield id_str
+
+
+async def _collect(
+    results: AsyncIterator[ConversionResult],
+) -> list[ConversionResult]:
+    return [result async for result in results]
+
+
+def test_aconvert_many() -> None:
+    """Async conversion gives the same results as the serial one, in order."""
+    expected = list(convert_many(ID_STRS, "snake"))
+    for source in (_source(ID_STRS), ID_STRS):
+        results = asyncio.run(_collect(aconvert_many(source, "snake", chunksize=7)))
+        assert [r.id_str for r in results] == ID_STRS
+        assert [r.converted for r in results] == [r.converted for r in expected]
+        assert [type(r.error) for r in results] == [type(r.error) for r in expected]
+
+
+@pytest.mark.parametrize("executor_type", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_aconvert_many_executor(executor_type: type) -> None:
+    """Chunks are offloaded to executors from the threshold size."""
+    expected = [r.converted for r in convert_many(ID_STRS, "kebab")]
+    with executor_type(max_workers=1) as executor:
+        results = aconvert_many(
+            _source(ID_STRS), "kebab", chunksize=64, executor=executor
+        )
+        converted = [r.converted for r in asyncio.run(_collect(results))]
+    assert converted == expected
+
+
+def test_aconvert_many_yields_control() -> None:
+    """Other tasks run between chunks, even with a source never suspending."""
+    ticks: list[None] = []
+
+    async def main() -> None:
+        async def tick() -> None:
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(tick())
+        await _collect(aconvert_many(_source(ID_STRS), "snake", chunksize=100))
+        task.cancel()
+
+    asyncio.run(main())
+    assert len(ticks) >= len(ID_STRS) // 100
+
+
+@pytest.mark.parametrize("executor_type", [None, ProcessPoolExecutor])
+def test_aconvert_many_registry(executor_type: type | None) -> None:
+    """Targets are looked up in the registry of the conventions."""
+    registry = builtins_conventions().copy()
+    registry.register(DOT_CASE)
+    with ExitStack() as stack:
+        executor = executor_type and stack.enter_context(executor_type(max_workers=1))
+        results = aconvert_many(
+            ["myId", "my.id"],
+            "dot.case",
+            registry,
+            executor=executor,
+            offload_threshold=1,
+        )
+        converted = [r.converted for r in asyncio.run(_collect(results))]
+    assert converted == ["my.id", "my.id"]
+
+
+def test_aconvert_many_unknown() -> None:
+    """Unknown target conventions raise before any work."""
+    with pytest.raises(UnknownNamingConventionError):
+        aconvert_many(ID_STRS, "snack")
@@ -4,7 +4,15 @@ import re
 
 import pytest
 
-from nomage import Identifier, NamingConvention, builtins_conventions, naming
+from nomage import (
+    Identifier,
+    NamingConvention,
+    builtins_conventions,
+    compile_converter,
+    convert_many,
+    naming,
+    naming_many,
+)
 from nomage.exceptions import (
     UnknownNamingConventionError,
     UnrecognizedNamingConventionError,
@@ -152,3 +160,94 @@ def test_naming_unknown() -> None:
     """Function `naming` returns None for unrecognized identifiers."""
     with pytest.raises(UnrecognizedNamingConventionError):
         naming("my__identifier")
+
+
+def test_naming_many() -> None:
+    """Function `naming_many` parses identifiers lazily with per-item errors."""
+    results = naming_many(iter(["my_identifier", "my__identifier", "myIdentifier"]))
+    r1, r2, r3 = results
+
+    assert r1.identifier == naming("my_identifier")
+    assert r1.error is None
+    assert r2.identifier is None
+    assert isinstance(r2.error, UnrecognizedNamingConventionError)
+    assert r2.error.id_str == "my__identifier"
+    assert r3.identifier == naming("myIdentifier")
+
+
+def test_convert_many() -> None:
+    """Function `convert_many` converts identifiers lazily with per-item errors."""
+    id_strs = ["my_identifier", "my__identifier", "MyIdentifier"]
+    results = list(convert_many(id_strs, "camel"))
+
+    assert [r.id_str for r in results] == id_strs
+    assert [r.converted for r in results] == ["myIdentifier", None, "myIdentifier"]
+    assert isinstance(results[1].error, UnrecognizedNamingConventionError)
+
+
+def test_convert_many_unknown() -> None:
+    """Function `convert_many` raises for unknown target convention upfront."""
+    with pytest.raises(UnknownNamingConventionError):
+        convert_many(["my_identifier"], "unknown")
+
+
+def test_identifier_to_all() -> None:
+    """Identifier.to_all converts to several naming conventions at once."""
+    id_naming = naming("myIdentifier")
+    conventions = builtins_conventions()
+    kebab_nc = conventions["kebab"]
+
+    assert id_naming.to_all(["snake", kebab_nc]) == {
+        "snake_case": "my_identifier",
+        "kebab-case": "my-identifier",
+    }
+    all_forms = id_naming.to_all()
+    assert len(all_forms) == len(set(conventions.values()))
+    for name, converted in all_forms.items():
+        assert converted == id_naming.to(name)
+    with pytest.raises(UnknownNamingConventionError):
+        id_naming.to_all(["unknown"])
+
+
+TRANSCODE_IDENTIFIERS = (
+    "a",
+    "ABC",
+    "myId",
+    "myHTTPServer",
+    "HTTPServer",
+    "my2Id",
+    "my_id",
+    "my_ABc",
+    "v2x_y3",
+    "MY_HTTP_SERVER",
+    "my-http-v2",
+    "HTTP-Server",
+    "MY-ID",
+)
+
+
+def test_compile_converter_builtins() -> None:
+    """Compiled converters match the parse-then-render round trip on all pairs."""
+    ncs = tuple({id(nc): nc for nc in builtins_conventions().values()}.values())
+    for source in ncs:
+        id_strs = [id_str for id_str in TRANSCODE_IDENTIFIERS if source.match(id_str)]
+        assert id_strs, source.names[0]
+        for target in ncs:
+            convert = compile_converter(source, target)
+            for id_str in id_strs:
+                expected = target.converter(source.parser(id_str))
+                assert convert(id_str) == expected, (source, target, id_str)
+
+
+def test_compile_converter_custom() -> None:
+    """Compiled converters fall back to the round trip for custom conventions."""
+    dot_nc = NamingConvention(
+        names=("dot.case",),
+        match_regex=re.compile(r"^[a-z]+(\.[a-z]+)*$"),
+        parser=lambda id_str: tuple(id_str.split(".")),
+        converter=".".join,
+    )
+    assert compile_converter(dot_nc, "pascal")("my.id") == "MyId"
+    assert compile_converter("snake", dot_nc)("my_id") == "my.id"
+    with pytest.raises(UnknownNamingConventionError):
+        compile_converter("snack", "snake")
@@ -12,7 +12,7 @@ def test_builtins_conventions_is_mapping() -> None:
     assert isinstance(conventions, Container)
     assert isinstance(conventions, Iterable)
     assert isinstance(conventions, Sized)
-    assert len(conventions)
+    assert len(conventions) == len(conventions.conventions) == 10
 
 
 def test_builtins_conventions_values() -> None:
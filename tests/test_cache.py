@@ -0,0 +1,85 @@
+"""Tests for the Nomage detection and conversion cache."""
+
+import re
+from collections.abc import Iterator
+
+import pytest
+
+from nomage import NamingConvention, naming
+from nomage.cache import (
+    CacheInfo,
+    cache_info,
+    clear_cache,
+    disable_cache,
+    enable_cache,
+)
+from nomage.exceptions import UnrecognizedNamingConventionError
+
+
+@pytest.fixture(autouse=True)
+def _cache() -> Iterator[None]:
+    enable_cache(maxsize=4)
+    clear_cache()
+    yield
+    disable_cache()
+
+
+def test_cache_hits_misses() -> None:
+    """Cache counts hits and misses of detection and conversion."""
+    assert naming("myIdentifier").to("snake") == "my_identifier"
+    assert naming("myIdentifier").to("snake") == "my_identifier"
+    with pytest.raises(UnrecognizedNamingConventionError):
+        naming("my__identifier")
+    with pytest.raises(UnrecognizedNamingConventionError):
+        naming("my__identifier")
+
+    info = cache_info()
+    assert (info.hits, info.misses, info.maxsize, info.currsize) == (3, 3, 4, 3)
+
+
+def test_cache_lru_eviction() -> None:
+    """Cache evicts the least recently used entries first."""
+    first = naming("first")
+    for id_str in ("second", "third", "fourth"):
+        naming(id_str)
+    assert naming("first") is first
+    naming("fifth")
+    assert naming("first") is first
+    assert cache_info().currsize == 4
+    naming("second")
+    assert cache_info().misses == 6
+
+
+def test_cache_custom_conventions() -> None:
+    """Cache distinguishes conventions sharing the same match regex."""
+    regex = re.compile(r"^[a-z][a-z0-9]*(\.[a-z][a-z0-9]*)*$")
+    dot_nc = NamingConvention(
+        names=("dot.case",),
+        match_regex=regex,
+        parser=lambda id_str: tuple(id_str.split(".")),
+        converter=lambda components: ".".join(components),
+    )
+    reversed_dot_nc = NamingConvention(
+        names=("dot.esac",),
+        match_regex=regex,
+        parser=lambda id_str: tuple(reversed(id_str.split("."))),
+        converter=lambda components: ".".join(reversed(components)),
+    )
+    id_naming = naming("my.identifier", conventions=[dot_nc])
+    reversed_id_naming = naming("my.identifier", conventions=[reversed_dot_nc])
+
+    assert id_naming.components == ("my", "identifier")
+    assert reversed_id_naming.components == ("identifier", "my")
+    assert id_naming.to(dot_nc) == "my.identifier"
+    assert id_naming.to(reversed_dot_nc) == "identifier.my"
+
+
+def test_cache_disable() -> None:
+    """Cache can be disabled and only accepts a positive size."""
+    naming("myIdentifier")
+    disable_cache()
+    naming("myIdentifier")
+    assert cache_info() == CacheInfo(hits=0, misses=0, maxsize=0, currsize=0)
+
+    with pytest.raises(ValueError, match="positive"):
+        enable_cache(maxsize=0)
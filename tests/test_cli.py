@@ -1,6 +1,9 @@
 """Tests for the Nomage command-line interface."""
 
+import io
+import json
 from importlib.metadata import metadata
+from pathlib import Path
 
 import pytest
 
@@ -99,6 +102,26 @@ def test_convert(capsys: pytest.CaptureFixture[str]) -> None:
     assert "my_identifier" in capture.out
 
 
+def test_convert_many_targets(capsys: pytest.CaptureFixture[str]) -> None:
+    """Option --to accepts several conventions or 'all' and prints JSON."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["myIdentifier", "--to", "snake,kebab"])
+
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 0
+    assert json.loads(capture.out) == {
+        "snake_case": "my_identifier",
+        "kebab-case": "my-identifier",
+    }
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["myIdentifier", "--to", "all"])
+
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 0
+    assert json.loads(capture.out)["PascalCase"] == "MyIdentifier"
+
+
 def test_convert_error(capsys: pytest.CaptureFixture[str]) -> None:
     """Option --to fails with error when target convention is unknown."""
     with pytest.raises(SystemExit) as exc_info:
@@ -109,3 +132,142 @@ def test_convert_error(capsys: pytest.CaptureFixture[str]) -> None:
     stderr = capture.err.lower()
     assert "could not find" in stderr
     assert "unknown" in stderr
+
+
+def test_command_name_identifier(capsys: pytest.CaptureFixture[str]) -> None:
+    """Identifiers named like a command are detected and converted after '--'."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--", "json"])
+    assert exc_info.value.code == 0
+    assert "flatcase" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--to", "upper", "--", "stats"])
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == "STATS\n"
+
+
+def test_file_convert(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Option --file converts identifiers line by line, keeping line alignment."""
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("myIdentifier\nmy__identifier\n\nMY_IDENTIFIER\n")
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", str(ids_file), "--to", "kebab"])
+
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 1
+    assert capture.out == "my-identifier\n\n\nmy-identifier\n"
+    assert f"{ids_file}:2" in capture.err
+    assert "my__identifier" in capture.err
+
+
+def test_file_stdin_detection(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Option --file reads identifiers from stdin with '-'."""
+    monkeypatch.setattr("sys.stdin", io.StringIO("myIdentifier\nmy-identifier\n"))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", "-"])
+
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 0
+    assert capture.out == "camelCase\nkebab-case\n"
+
+
+def test_file_not_utf8(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Option --file reports lines which are not UTF-8, and goes on."""
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_bytes(b"myIdentifier\n\xff\xfe\nMY_IDENTIFIER\n")
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", str(ids_file), "--to", "snake"])
+
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 1
+    assert capture.out == "my_identifier\n\nmy_identifier\n"
+    assert f"{ids_file}:2: unrecognized" in capture.err
+    assert "\\udcff\\udcfe" in capture.err
+
+    stdin = io.TextIOWrapper(io.BytesIO(b"\xffmyId\nmyId\n"), encoding="utf-8")
+    monkeypatch.setattr("sys.stdin", stdin)
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", "-"])
+    assert exc_info.value.code == 1
+    assert capsys.readouterr().out == "\ncamelCase\n"
+
+
+def test_file_check(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Option --file with --check reports not matching identifiers."""
+    monkeypatch.setattr("sys.stdin", io.StringIO("my_identifier\nmyIdentifier\n"))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", "-", "--check", "snake"])
+
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 2
+    assert not capture.out
+    assert "<stdin>:2" in capture.err
+
+
+def test_file_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Option --file fails on missing files and with an identifier argument."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", str(tmp_path / "missing.txt")])
+    assert exc_info.value.code == 1
+    assert "could not read" in capsys.readouterr().err.lower()
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", "-", "--to", "unknown"])
+    assert exc_info.value.code == 1
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", "-", "myIdentifier"])
+    assert exc_info.value.code == 2
+
+
+def test_file_convert_many_targets(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Option --file with several --to conventions prints JSON lines."""
+    monkeypatch.setattr("sys.stdin", io.StringIO("myIdentifier\nmy__identifier\n"))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", "-", "--to", "snake, camel"])
+
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 1
+    assert [json.loads(line) for line in capture.out.splitlines()] == [
+        {"snake_case": "my_identifier", "camelCase": "myIdentifier"},
+        None,
+    ]
+
+
+def test_file_jobs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Option --jobs processes files in parallel, keeping the output order."""
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("myIdentifier\nmy__identifier\n\nMY_IDENTIFIER\n" * 600)
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", str(ids_file), "--to", "kebab"])
+    serial = capsys.readouterr()
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", str(ids_file), "--to", "kebab", "--jobs", "2"])
+    parallel = capsys.readouterr()
+    assert exc_info.value.code == 1
+    assert parallel.out == serial.out
+    assert parallel.err == serial.err
+    assert f"{ids_file}:2398:" in parallel.err
+
+
+def test_jobs_errors() -> None:
+    """Option --jobs requires --file, and a positive number of jobs."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["myIdentifier", "--jobs", "2"])
+    assert exc_info.value.code == 2
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--file", "-", "--jobs", "-1"])
+    assert exc_info.value.code == 2
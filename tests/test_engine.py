@@ -0,0 +1,242 @@
+"""Tests for the Nomage detection engine."""
+
+import mmap
+import re
+from pathlib import Path
+
+import pytest
+
+from nomage import NamingConvention, builtins_conventions, naming
+from nomage._buffers import _drop_leading_anchors, bytes_regex
+from nomage.engine import DetectionEngine, get_engine
+from nomage.naming import BUILTINS_CONVENTIONS
+from nomage.tokenizer import split_none
+
+IDENTIFIERS = (
+    "identifier",
+    "IDENTIFIER",
+    "myIdentifier",
+    "MyIdentifier",
+    "my_identifier",
+    "MY_IDENTIFIER",
+    "my_Identifier",
+    "my-identifier",
+    "MY-IDENTIFIER",
+    "My-Identifier",
+    "my__identifier",
+    "my-Identifier",
+    "",
+)
+
+
+def _sequential_detect(id_str: str) -> NamingConvention | None:
+    return next((nc for nc in BUILTINS_CONVENTIONS if nc.match(id_str)), None)
+
+
+def test_engine_first_match_order() -> None:
+    """DetectionEngine detects the same convention as sequential matching."""
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    for id_str in IDENTIFIERS:
+        assert engine.detect(id_str) is _sequential_detect(id_str)
+
+
+def test_engine_inner_groups() -> None:
+    """DetectionEngine maps matches to conventions with capturing groups."""
+    dot_nc = NamingConvention(
+        names=("dot.case",),
+        match_regex=re.compile(r"^([a-z]+)(\.([a-z]+))*$"),
+        parser=lambda id_str: tuple(id_str.split(".")),
+        converter=lambda components: ".".join(components),
+    )
+    engine = DetectionEngine((dot_nc, *BUILTINS_CONVENTIONS))
+    assert len(engine) == len(set(builtins_conventions().values())) + 1
+    assert engine.detect("my.identifier") is dot_nc
+    assert engine.detect("identifier") is dot_nc
+    assert engine.detect("myIdentifier") is builtins_conventions()["camel"]
+
+
+def test_engine_sequential_fallback() -> None:
+    """DetectionEngine falls back to sequential matching for group references."""
+    double_nc = NamingConvention(
+        names=("double",),
+        match_regex=re.compile(r"^([a-z]+)_\1$"),
+        parser=lambda id_str: tuple(id_str.split("_")),
+        converter=lambda components: "_".join(components),
+    )
+    engine = DetectionEngine((double_nc, *BUILTINS_CONVENTIONS))
+    assert engine.detect("abc_abc") is double_nc
+    assert engine.detect("abc_abd") is builtins_conventions()["snake"]
+
+
+def test_get_engine_cache() -> None:
+    """Function `get_engine` reuses engines and `naming` accepts them."""
+    conventions = list(BUILTINS_CONVENTIONS)
+    engine = get_engine(conventions)
+    assert get_engine(conventions) is engine
+    assert get_engine(engine) is engine
+    assert naming("my_identifier", conventions=engine).components == (
+        "my",
+        "identifier",
+    )
+
+
+def test_engine_candidates() -> None:
+    """DetectionEngine.candidates rules out conventions by signature."""
+    conventions = builtins_conventions()
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    assert engine.candidates("ENV_VAR_CASE") == (conventions["constant"],)
+    assert engine.candidates("Http-Header-Case") == (
+        conventions["cobol"],
+        conventions["train"],
+    )
+    assert engine.candidates("my_identifier") == (
+        conventions["snake"],
+        conventions["camel_Snake"],
+    )
+    assert engine.candidates("my-identifier_x") == ()
+    assert engine.candidates("") == engine.conventions
+    for id_str in IDENTIFIERS:
+        nc = _sequential_detect(id_str)
+        assert nc is None or nc in engine.candidates(id_str)
+
+
+def test_engine_check() -> None:
+    """DetectionEngine.check matches identifiers against a single convention."""
+    conventions = builtins_conventions()
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    assert engine.check("my_identifier", conventions["snake"])
+    assert not engine.check("my_identifier", conventions["kebab"])
+    assert not engine.check("my__identifier", conventions["snake"])
+
+
+def test_engine_signature_fallback() -> None:
+    """DetectionEngine narrows sequential matching with the signature index."""
+    double_nc = NamingConvention(
+        names=("double",),
+        match_regex=re.compile(r"^([a-z]+)_\1$"),
+        parser=lambda id_str: tuple(id_str.split("_")),
+        converter=lambda components: "_".join(components),
+    )
+    engine = DetectionEngine((*BUILTINS_CONVENTIONS, double_nc))
+    for id_str in IDENTIFIERS:
+        assert engine.detect(id_str) is _sequential_detect(id_str)
+
+
+WORD_NC = NamingConvention(
+    names=("word",),
+    match_regex=re.compile(r"^\w+$"),
+    parser=lambda id_str: (id_str.lower(),),
+    converter="".join,
+)
+
+
+def _spans(id_strs: tuple[str, ...]) -> tuple[bytes, list[tuple[int, int]]]:
+    data = b""
+    spans = []
+    for id_str in id_strs:
+        data += b"  "
+        spans.append((len(data), len(data) + len(id_str.encode())))
+        data += id_str.encode()
+    return data + b"\n", spans
+
+
+def test_engine_detect_bytes(tmp_path: Path) -> None:
+    """DetectionEngine.detect_bytes detects identifiers in place in buffers."""
+    engine = DetectionEngine(BUILTINS_CONVENTIONS)
+    data, spans = _spans(IDENTIFIERS)
+    path = tmp_path / "ids.txt"
+    path.write_bytes(data)
+    with (
+        path.open("rb") as file,
+        mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        for buffer in (data, bytearray(data), memoryview(data), mapped):
+            for id_str, (start, end) in zip(IDENTIFIERS, spans, strict=True):
+                assert engine.detect_bytes(buffer, start, end) is engine.detect(id_str)
+    assert engine.detect_bytes(b"my_identifier") is engine.detect("my_identifier")
+    assert engine.detect_bytes(b"\xc3\xa9t\xc3\xa9") is None
+
+
+def test_engine_detect_bytes_non_ascii() -> None:
+    """Identifiers with non-ASCII characters are detected like their decoded str."""
+    id_strs = ("été", "my_été", "ça_va", "my__id", "straße")
+    engine = DetectionEngine((*BUILTINS_CONVENTIONS, WORD_NC))
+    data, spans = _spans(id_strs)
+    for id_str, (start, end) in zip(id_strs, spans, strict=True):
+        assert engine.detect_bytes(data, start, end) is engine.detect(id_str)
+        assert WORD_NC.match_bytes(data, start, end)
+    assert engine.detect_bytes(b"\xff\xfe") is None
+    assert not WORD_NC.match_bytes(b"\xff\xfe")
+
+
+def test_engine_detect_bytes_fallback() -> None:
+    """Engines without combined regular expression decode identifiers."""
+    double_nc = NamingConvention(
+        names=("double",),
+        match_regex=re.compile(r"^([a-z]+)_\1$"),
+        parser=lambda id_str: tuple(id_str.split("_")),
+        converter="_".join,
+    )
+    engine = DetectionEngine((double_nc, *BUILTINS_CONVENTIONS))
+    assert engine.detect_bytes(b"x abc_abc", 2) is double_nc
+    assert double_nc.match_bytes(b"x abc_abc", 2)
+    assert not double_nc.match_bytes(b"x abc_abd", 2)
+
+
+def test_match_bytes_anchor_in_group() -> None:
+    """Anchors in repeated groups are matched like the str regular expression."""
+    nc = NamingConvention(
+        names=("anchored",),
+        match_regex=re.compile(r"(^a|b)+$"),
+        parser=split_none,
+        converter="".join,
+    )
+    engine = DetectionEngine([nc])
+    for id_str in ("a", "ab", "aa", "b", "ba", "aba"):
+        data = id_str.encode()
+        assert nc.match_bytes(data) is nc.match(id_str)
+        assert engine.detect_bytes(b"x " + data, 2) is engine.detect(id_str)
+
+
+def test_match_bytes() -> None:
+    """NamingConvention.match_bytes matches an identifier at its offsets."""
+    snake = builtins_conventions()["snake"]
+    data = b"userId = my_user_id;"
+    assert snake.match_bytes(data, 9, 19)
+    assert not snake.match_bytes(data, 0, 6)
+    assert not snake.match_bytes(data, 9)
+    assert not snake.match_bytes(data, 8, 19)
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        (r"^[a-z]+(_[a-z]+)*$", r"[a-z]+(_[a-z]+)*$"),
+        (r"(?i)^(a$)|\^b|\Ac", r"(?i)(a$)|\^b|c"),
+        (r"(^a$)|b", None),
+        (r"(^a|b)+$", None),
+        (r"^[]^a]\Z", r"[]^a]\Z"),
+        (r"a^b", None),
+        (r"x(a|^b)", None),
+        (r"\bfoo", None),
+        (r"(?<=_)foo", None),
+        (r"(?P<x>a)(?P=x)", None),
+        (r"(a)\1", None),
+    ],
+)
+def test_bytes_regex_anchors(pattern: str, expected: str | None) -> None:
+    """Bytes variants drop the anchors at the start of the match."""
+    assert _drop_leading_anchors(pattern) == expected
+
+
+def test_bytes_regex() -> None:
+    """Bytes variants are only checked for non-ASCII bytes when they could match."""
+    regex, checked = bytes_regex(re.compile(r"^[a-z]+(-[a-z0-9]+)*$"))
+    assert regex is not None
+    assert regex.pattern == rb"[a-z]+(-[a-z0-9]+)*$"
+    assert not checked
+    for pattern in (r"^\w+$", r"^[^_]+$", r"(?i)^k$", r"^\d$", r"^.$"):
+        assert bytes_regex(re.compile(pattern))[1]
+    assert bytes_regex(re.compile(r"^[a-zé]+$")) == (None, True)
+    assert bytes_regex(re.compile(r"^\u00e9$")) == (None, True)
+    assert bytes_regex(re.compile(r"^ a $", re.VERBOSE)) == (None, True)
@@ -0,0 +1,84 @@
+"""Tests for the Nomage vectorized conversion of arrays and data frames."""
+
+import pytest
+
+from nomage.frames import MISSING, UNRECOGNIZED, convert_array, rename_columns
+
+EVENTS = ["userLogin", "userLogout", "userLogin", "bad__name", "user_login"]
+CONVERTED = ["user_login", "user_logout", "user_login", "bad__name", "user_login"]
+
+
+def test_convert_array_unsupported() -> None:
+    """Only columns of the supported libraries are converted."""
+    with pytest.raises(TypeError, match="got list"):
+        convert_array(EVENTS, "snake")
+
+
+def test_convert_numpy_str() -> None:
+    """NumPy string arrays are converted, with the code of each value."""
+    np = pytest.importorskip("numpy")
+    result = convert_array(np.array(EVENTS).reshape(5, 1), "snake")
+    assert result.values.shape == (5, 1)
+    assert result.values.ravel().tolist() == CONVERTED
+    codes = result.codes.ravel().tolist()
+    names = [result.conventions[code].names[0] for code in codes if code >= 0]
+    assert names == ["camelCase"] * 3 + ["snake_case"]
+    assert codes[3] == UNRECOGNIZED
+
+
+def test_convert_numpy_object() -> None:
+    """NumPy object arrays keep missing and non-string values."""
+    np = pytest.importorskip("numpy")
+    values = np.array([*EVENTS, None, 1, True, 1.0, [1]], dtype=object)
+    result = convert_array(values, "snake")
+    assert result.values.tolist() == [*CONVERTED, None, 1, True, 1.0, [1]]
+    assert [type(value) for value in result.values[-4:]] == [int, bool, float, list]
+    assert result.codes.tolist()[-6:] == [result.codes[4]] + [MISSING] * 5
+
+
+def test_convert_pandas() -> None:
+    """Pandas Series and Index keep their index, name and missing values."""
+    pd = pytest.importorskip("pandas")
+    series = pd.Series([*EVENTS, None], index=list("abcdefg")[:6], name="event")
+    result = convert_array(series, "snake")
+    assert result.values.name == "event"
+    assert result.values.index.tolist() == series.index.tolist()
+    assert result.values.tolist()[:5] == CONVERTED
+    assert result.values.isna().iloc[-1]
+    assert result.codes.tolist()[-2:] == [result.codes[4], MISSING]
+
+    index = convert_array(pd.Index(EVENTS, name="events"), "kebab").values
+    assert isinstance(index, pd.Index)
+    assert index.name == "events"
+    assert index[0] == "user-login"
+
+    categories = convert_array(series.astype("category"), "snake").values
+    assert categories.tolist()[:5] == CONVERTED
+
+    mixed = convert_array(pd.Series([1, True, 1.0, "userId"]), "snake")
+    assert [type(value) for value in mixed.values] == [int, bool, float, str]
+    assert mixed.codes.tolist()[:3] == [MISSING] * 3
+
+
+def test_convert_arrow() -> None:
+    """Pyarrow arrays are converted, and nulls kept."""
+    pa = pytest.importorskip("pyarrow")
+    pytest.importorskip("numpy")
+    array = pa.array([*EVENTS, None])
+    result = convert_array(array, "snake")
+    assert result.values.to_pylist() == [*CONVERTED, None]
+    assert result.codes.tolist()[-1] == MISSING
+
+    chunked = pa.chunked_array([EVENTS[:2], EVENTS[2:]])
+    result = convert_array(chunked, "snake")
+    assert isinstance(result.values, pa.ChunkedArray)
+    assert result.values.to_pylist() == CONVERTED
+
+
+def test_rename_columns() -> None:
+    """DataFrame columns are renamed, other columns kept."""
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"userId": [1], "created_at": [2], "bad__name": [3], 4: [4]})
+    renamed = rename_columns(frame, "camel")
+    assert renamed.columns.tolist() == ["userId", "createdAt", "bad__name", 4]
+    assert frame.columns.tolist()[1] == "created_at"
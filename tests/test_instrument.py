@@ -0,0 +1,172 @@
+"""Tests for the Nomage instrumentation of the hot paths."""
+
+import re
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from nomage import NamingConvention, compile_converter, convert_many, naming
+from nomage._cli import main
+from nomage.cache import disable_cache, enable_cache
+from nomage.engine import DetectionEngine
+from nomage.exceptions import UnrecognizedNamingConventionError
+from nomage.instrument import (
+    Event,
+    Histogram,
+    add_listener,
+    clear_instrumentation,
+    disable_instrumentation,
+    enable_instrumentation,
+    instrumentation_info,
+    instrumented,
+    remove_listener,
+)
+from nomage.tokenizer import Tokenizer
+
+
+@pytest.fixture(autouse=True)
+def _instrumentation() -> Iterator[None]:
+    clear_instrumentation()
+    yield
+    disable_instrumentation()
+    clear_instrumentation()
+
+
+def test_disabled() -> None:
+    """Nothing is recorded while disabled."""
+    naming("myId").to("snake")
+    report = instrumentation_info()
+    assert report.timings == {}
+    assert report.conventions == {}
+    assert report.unrecognized == 0
+
+
+def test_timings() -> None:
+    """Detection, parsing and conversion are timed."""
+    enable_instrumentation()
+    naming("myId").to("snake")
+    with pytest.raises(UnrecognizedNamingConventionError):
+        naming("my__id")
+    timings = instrumentation_info().timings
+    assert timings["detect"].count == 2
+    assert timings["parse"].count == timings["convert"].count == 1
+    assert sum(timings["detect"].buckets) == 2
+    assert timings["detect"].total_ns > 0
+
+
+def test_detections() -> None:
+    """Conventions are counted by attempts until the first match, and by hits."""
+    enable_instrumentation()
+    for id_str in ("my_id", "my_id", "MY_ID", "my__id"):
+        next(convert_many([id_str], "camel"))
+    report = instrumentation_info()
+    assert report.conventions["snake_case"].hits == 2
+    assert report.conventions["ALL_CAPS"].hits == 1
+    assert all(c.attempts >= c.hits for c in report.conventions.values())
+    assert any(c.attempts > c.hits == 0 for c in report.conventions.values())
+    assert report.unrecognized == 1
+    assert report.timings["convert"].count == 3
+
+
+def test_sequential_engine() -> None:
+    """Engines matching conventions one by one are instrumented too."""
+    dotted = NamingConvention(
+        names=("dot.case",),
+        match_regex=re.compile(r"^[a-z]+(\.[a-z]+)+$", re.VERBOSE),
+        parser=Tokenizer("."),
+        converter=".".join,
+    )
+    engine = DetectionEngine([dotted])
+    assert engine.detect("my.id") is dotted
+    with instrumented():
+        assert engine.detect("my.id") is dotted
+    assert instrumentation_info().conventions["dot.case"].hits == 1
+
+
+def test_compiled_converters() -> None:
+    """Converters are only timed when compiled while instrumentation is enabled."""
+    to_kebab = compile_converter("snake", "kebab")
+    with instrumented():
+        to_kebab("my_id")
+        assert compile_converter("snake", "kebab")("my_id") == "my-id"
+    assert instrumentation_info().timings["convert"].count == 1
+
+
+def test_listeners() -> None:
+    """Listeners are called with each event, until removed."""
+    events: list[Event] = []
+    with instrumented(events.append):
+        naming("myId").to("snake")
+    assert [event.phase for event in events] == ["detect", "parse", "convert"]
+    assert events[0].identifier == "myId"
+    assert events[0].convention is not None
+    assert events[0].convention.names[0] == "camelCase"
+    assert events[2].identifier == ("my", "id")
+    assert events[2].convention is not None
+    assert events[2].convention.names[0] == "snake_case"
+
+    add_listener(events.append)
+    naming("myId")
+    remove_listener(events.append)
+    enable_instrumentation()
+    naming("myId")
+    assert len(events) == 3
+    with pytest.raises(ValueError, match="remove"):
+        remove_listener(events.append)
+
+
+def test_instrumented_restores() -> None:
+    """The context manager restores the previous state."""
+    enable_instrumentation()
+    with instrumented():
+        pass
+    naming("myId")
+    assert instrumentation_info().timings["detect"].count == 1
+
+
+def test_cache() -> None:
+    """Cached results skip the timed steps, the report has the cache statistics."""
+    enable_cache(maxsize=16)
+    try:
+        with instrumented():
+            for _ in range(3):
+                naming("myId").to("snake")
+        report = instrumentation_info()
+    finally:
+        disable_cache()
+    assert report.timings["detect"].count == 1
+    assert report.timings["convert"].count == 1
+    assert report.cache.hits == 4
+
+
+def test_histogram_quantile() -> None:
+    """Quantiles are estimated by the upper bound of their bucket."""
+    histogram = Histogram(4, 40, (0, 0, 0, 1, 2, 1))
+    assert histogram.mean_ns == 10
+    assert histogram.quantile(0.25) == 8
+    assert histogram.quantile(0.5) == 16
+    assert histogram.quantile(1) == 32
+    assert Histogram(0, 0, (0,) * 4).quantile(0.5) == 0
+    assert Histogram(0, 0, ()).mean_ns == 0
+
+
+def test_cli_profile(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """The CLI prints a breakdown of a run, also of commands."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--profile", "myId", "--to", "snake"])
+    assert exc_info.value.code == 0
+    captured = capsys.readouterr()
+    assert captured.out == "my_id\n"
+    assert re.search(r"^detect +1 ", captured.err, re.MULTILINE)
+    assert re.search(r"^camelCase +\d+ +1$", captured.err, re.MULTILINE)
+
+    path = tmp_path / "data.json"
+    path.write_text("{}")
+    enable_cache()
+    try:
+        with pytest.raises(SystemExit):
+            main(["--profile", "json", "--to", "snake", str(path)])
+    finally:
+        disable_cache()
+    assert "Cache: " in capsys.readouterr().err
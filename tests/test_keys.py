@@ -0,0 +1,205 @@
+"""Tests for the Nomage conversion of the keys of nested data."""
+
+import copy
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from nomage import builtins_conventions
+from nomage._cli import main
+from nomage.exceptions import (
+    UnknownNamingConventionError,
+    UnrecognizedNamingConventionError,
+)
+from nomage.keys import _KEY_CACHES, clear_key_cache, convert_keys, rewrite_json
+
+BODY = {
+    "user_id": 1,
+    "user_name": "Alice",
+    "_links": {"self_url": "/users/1"},
+    "roles": [{"role_name": "admin", "granted_at": None}, "plain_value", [{"a_b": 1}]],
+    2: "non-string key",
+}
+CONVERTED = {
+    "userId": 1,
+    "userName": "Alice",
+    "_links": {"selfUrl": "/users/1"},
+    "roles": [{"roleName": "admin", "grantedAt": None}, "plain_value", [{"aB": 1}]],
+    2: "non-string key",
+}
+
+
+def test_convert_keys() -> None:
+    """Keys of nested dicts are converted, values and key order are kept."""
+    original = copy.deepcopy(BODY)
+    converted = convert_keys(BODY, "camel")
+    assert converted == CONVERTED
+    assert list(converted) == list(CONVERTED)
+    assert original == BODY
+    assert converted["roles"] is not BODY["roles"]
+    assert convert_keys(converted, "snake")["roles"][0] == BODY["roles"][0]
+
+
+def test_convert_keys_in_place() -> None:
+    """Keys are changed in place when not copying."""
+    body = copy.deepcopy(BODY)
+    roles = body["roles"]
+    assert convert_keys(body, "camel", copy=False) is body
+    assert body == CONVERTED
+    assert list(body) == list(CONVERTED)
+    assert body["roles"] is roles
+
+
+@pytest.mark.parametrize("copy_", [True, False])
+def test_convert_keys_strict(copy_: bool) -> None:
+    """Unrecognized keys raise in strict mode, even when cached."""
+    convert_keys({"_links": 1}, "camel")
+    with pytest.raises(UnrecognizedNamingConventionError, match="_links"):
+        convert_keys(copy.deepcopy(BODY), "camel", strict=True, copy=copy_)
+    assert convert_keys({"user_id": {}}, "camel", strict=True) == {"userId": {}}
+
+
+def test_convert_keys_scalars() -> None:
+    """Values which are not dicts or lists are returned as is."""
+    assert convert_keys("user_id", "camel") == "user_id"
+    assert convert_keys([], "camel") == []
+    assert convert_keys([1, [2]], "camel", copy=False) == [1, [2]]
+
+
+def test_convert_keys_collision() -> None:
+    """The last of the keys converting to the same key wins."""
+    assert convert_keys({"userId": 1, "user_id": 2}, "snake") == {"user_id": 2}
+
+
+def test_convert_keys_deep() -> None:
+    """Deeply nested data does not hit the recursion limit."""
+    data: dict[str, object] = {}
+    node = data
+    for _ in range(sys.getrecursionlimit() * 2):
+        node["child_node"] = node = {}
+    converted = convert_keys(data, "camel")
+    for _ in range(sys.getrecursionlimit() * 2):
+        converted = converted["childNode"]
+    assert converted == {}
+
+
+def test_convert_keys_cache() -> None:
+    """Converted keys are cached by conventions, target and strictness."""
+    clear_key_cache()
+    convert_keys(BODY, "camel")
+    convert_keys(BODY, "camel", strict=False)
+    assert len(_KEY_CACHES) == 1
+    cache = next(iter(_KEY_CACHES.values()))
+    assert cache["user_id"] == "userId"
+    assert cache["_links"] == "_links"
+    convert_keys(BODY, "kebab")
+    assert len(_KEY_CACHES) == 2
+    clear_key_cache()
+    assert not _KEY_CACHES
+
+
+def test_convert_keys_registry() -> None:
+    """The target is looked up in the registry of the conventions."""
+    registry = builtins_conventions()
+    assert convert_keys({"myId": 1}, "CONSTANT", registry) == {"MY_ID": 1}
+    with pytest.raises(UnknownNamingConventionError):
+        convert_keys({}, "unknown")
+
+
+def test_convert_keys_cache_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Caches are cleared when full."""
+    monkeypatch.setattr("nomage.keys._KEY_CACHE_MAX_SIZE", 2)
+    clear_key_cache()
+    convert_keys({"a_b": 1, "c_d": 2, "e_f": 3}, "camel")
+    assert list(next(iter(_KEY_CACHES.values()))) == ["e_f"]
+
+
+JSON_TEXT = (
+    json.dumps(
+        [
+            BODY | {2: None},
+            {"tricky_value": 'a, "b_c": \\"d_e\\" {"f_g":', "escaped_key": [{}]},
+            {"split_key": "x\\\\", "empty": "", "": {"last_key": []}},
+        ],
+        indent=1,
+    )
+    .replace('"split_key"', '"split_key"  \n')
+    .replace("escaped_key", "escaped\\u005fkey")
+)
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 7, 64, 1 << 20])
+def test_rewrite_json(monkeypatch: pytest.MonkeyPatch, chunksize: int) -> None:
+    """Only keys are rewritten, whatever the chunks the JSON is cut into."""
+    monkeypatch.setattr("nomage.keys._JSON_CHUNKSIZE", chunksize)
+    output = io.BytesIO()
+    count = rewrite_json(io.BytesIO(JSON_TEXT.encode()), output, "camel")
+    assert count == 10
+    rewritten = output.getvalue().decode()
+    assert json.loads(rewritten) == convert_keys(json.loads(JSON_TEXT), "camel")
+    assert 'a, \\"b_c\\": \\\\\\"d_e' in rewritten
+    assert '"splitKey"  \n' in rewritten
+    assert '"escapedKey"' in rewritten
+    assert len(rewritten.splitlines()) == len(JSON_TEXT.splitlines())
+
+
+def test_rewrite_json_lines(tmp_path: Path) -> None:
+    """JSON lines files are memory-mapped and rewritten line by line."""
+    path = tmp_path / "export.ndjson"
+    path.write_text('{"userId": 1}\n{"userId": 2, "_id": "myId"}\n')
+    output = io.BytesIO()
+    assert rewrite_json(path, output, "snake") == 2
+    assert output.getvalue() == b'{"user_id": 1}\n{"user_id": 2, "_id": "myId"}\n'
+    with pytest.raises(UnrecognizedNamingConventionError, match="_id"):
+        rewrite_json(str(path), io.BytesIO(), "snake", strict=True)
+    path.write_bytes(b"")
+    assert rewrite_json(path, output, "snake") == 0
+
+
+def test_cli_json(tmp_path: Path, capsysbinary: pytest.CaptureFixture[bytes]) -> None:
+    """Command json rewrites the keys of files to stdout or to a file."""
+    path = tmp_path / "data.json"
+    path.write_text('{"userId": {"createdAt": "myId"}}')
+    with pytest.raises(SystemExit) as exc_info:
+        main(["json", "--to", "kebab", str(path)])
+    assert exc_info.value.code == 0
+    captured = capsysbinary.readouterr()
+    assert captured.out == b'{"user-id": {"created-at": "myId"}}'
+    assert captured.err == b"Rewrote 2 keys\n"
+
+    output = tmp_path / "out.json"
+    with pytest.raises(SystemExit) as exc_info:
+        main(["json", "--to", "snake", "-o", str(output), str(path), str(path)])
+    assert exc_info.value.code == 0
+    assert output.read_text().count('"created_at"') == 2
+
+
+def test_cli_json_stdin(
+    monkeypatch: pytest.MonkeyPatch, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    """Command json reads stdin by default."""
+    monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(b'{"myId": 1}')))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["json", "--to", "snake"])
+    assert exc_info.value.code == 0
+    assert capsysbinary.readouterr().out == b'{"my_id": 1}'
+
+
+def test_cli_json_errors(
+    tmp_path: Path, capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    """Command json fails on unknown conventions and unreadable files."""
+    path = tmp_path / "data.json"
+    path.write_text('{"_id": 1}')
+    for args, message in (
+        (["--to", "snack", str(path)], b"Could not find"),
+        (["--to", "snake", "--strict", str(path)], b"No matching"),
+        (["--to", "snake", str(tmp_path / "missing.json")], b"Could not rewrite"),
+    ):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["json", *args])
+        assert exc_info.value.code == 1
+        assert message in capsysbinary.readouterr().err
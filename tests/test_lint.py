@@ -0,0 +1,162 @@
+"""Tests for the Nomage naming convention linter."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from nomage._cli import main
+from nomage.exceptions import UnknownNamingConventionError
+from nomage.lint import lint_paths, lint_source, sarif_report
+
+SOURCE = """\
+MAX_SIZE = 10
+
+
+class userStore:
+    defaultName = "x"
+
+    def __init__(self, userId, _private=None):
+        self.byId = {}
+        itemCount = 0
+        for item_id in (lambda pageSize: [])(1):
+            itemCount += 1
+
+    async def getUser(self, user_id):
+        return user_id
+"""
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """Create a small source tree."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "store.py").write_text(SOURCE)
+    (tmp_path / "pkg" / "clean.py").write_text("def get_user(user_id):\n    pass\n")
+    (tmp_path / "pkg" / "notes.txt").write_text("def getUser(): pass\n")
+    return tmp_path
+
+
+def test_lint_source() -> None:
+    """Names are classified by kind, and checked against the rule of their kind."""
+    rules = {"class": "pascal", "function": "snake", "argument": "snake"}
+    violations = lint_source(SOURCE, {**rules, "variable": "snake"})
+    assert [(v.line, v.column, v.kind, v.name, v.expected) for v in violations] == [
+        (4, 1, "class", "userStore", "PascalCase"),
+        (7, 24, "argument", "userId", "snake_case"),
+        (9, 9, "variable", "itemCount", "snake_case"),
+        (10, 32, "argument", "pageSize", "snake_case"),
+        (11, 13, "variable", "itemCount", "snake_case"),
+        (13, 5, "function", "getUser", "snake_case"),
+    ]
+    violations = lint_source(SOURCE, {"global": "screaming_snake"})
+    assert [v.name for v in violations] == ["defaultName"]
+
+
+def test_lint_source_errors() -> None:
+    """Unknown kinds and conventions are rejected, and invalid sources raise."""
+    with pytest.raises(ValueError, match="unknown kind of name 'method'"):
+        lint_source("", {"method": "snake"})
+    with pytest.raises(UnknownNamingConventionError):
+        lint_source("", {"class": "snack"})
+    with pytest.raises(SyntaxError):
+        lint_source("def (", {"class": "pascal"})
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_lint_paths_cache(tree: Path, jobs: int) -> None:
+    """Unchanged files are read from the cache on later runs."""
+    cache = str(tree / "cache" / "lint.json")
+    results = list(lint_paths([str(tree)], jobs=jobs, cache=cache))
+    assert [(Path(r.path).name, len(r.violations), r.cached) for r in results] == [
+        ("clean.py", 0, False),
+        ("store.py", 6, False),
+    ]
+    assert (tree / "cache" / ".gitignore").read_text() == "*\n"
+
+    (tree / "pkg" / "clean.py").write_text("def getUser(): pass\n")
+    again = list(lint_paths([str(tree)], jobs=jobs, cache=cache))
+    assert [(len(r.violations), r.cached) for r in again] == [(1, False), (6, True)]
+    assert again[1].violations == results[1].violations
+
+    other_rules = list(lint_paths([str(tree)], {"class": "pascal"}, cache=cache))
+    assert [(len(r.violations), r.cached) for r in other_rules] == [
+        (0, False),
+        (1, False),
+    ]
+
+
+def test_lint_paths_errors(tmp_path: Path) -> None:
+    """Unparsable files are reported, and not cached."""
+    (tmp_path / "broken.py").write_text("def (\n")
+    cache = str(tmp_path / "lint.json")
+    for _ in range(2):
+        (result,) = lint_paths([str(tmp_path)], cache=cache)
+        assert result.error is not None
+        assert result.error.startswith("could not parse")
+        assert not result.cached
+    (result,) = lint_paths([str(tmp_path / "missing.py")])
+    assert result.error is not None
+    assert result.error.startswith("could not read")
+
+
+def test_sarif_report(tree: Path) -> None:
+    """SARIF logs hold a rule per kind and a result per violation."""
+    results = list(lint_paths([str(tree)], {"function": "snake"}))
+    report = sarif_report(results, {"function": "snake_case"})
+    (run,) = report["runs"]
+    assert report["version"] == "2.1.0"
+    assert [rule["id"] for rule in run["tool"]["driver"]["rules"]] == [
+        "nomage/function"
+    ]
+    (result,) = run["results"]
+    assert result["ruleId"] == "nomage/function"
+    assert result["locations"][0]["physicalLocation"]["region"] == {
+        "startLine": 13,
+        "startColumn": 5,
+    }
+    assert run["invocations"][0]["executionSuccessful"]
+
+
+def test_cli_lint(tree: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """The lint command reports violations as text, JSON or SARIF."""
+    args = ["lint", str(tree), "--no-cache", "--rule", "function=snake"]
+    with pytest.raises(SystemExit) as exc_info:
+        main(args)
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 1
+    assert capture.out.endswith("store.py:13:5: function 'getUser' is not snake_case\n")
+    assert "Checked 2 files (0 cached), found 1 violations" in capture.err
+
+    with pytest.raises(SystemExit) as exc_info:
+        main([*args, "--format", "json", "--exclude", "store.py"])
+    assert exc_info.value.code == 0
+    assert json.loads(capsys.readouterr().out) == {
+        "files": 1,
+        "violations": [],
+        "errors": [],
+    }
+
+    with pytest.raises(SystemExit) as exc_info:
+        main([*args, "--format", "sarif", "--include", "*.txt"])
+    assert exc_info.value.code == 1
+    (run,) = json.loads(capsys.readouterr().out)["runs"]
+    assert len(run["results"]) == 1
+
+
+def test_cli_lint_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """The lint command exits with 2 on invalid rules and unparsable files."""
+    (tmp_path / "broken.py").write_text("def (\n")
+    with pytest.raises(SystemExit) as exc_info:
+        main(["lint", str(tmp_path), "--no-cache"])
+    assert exc_info.value.code == 2
+    assert "broken.py: could not parse" in capsys.readouterr().err
+
+    for rule in ("method=snake", "class=snack"):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["lint", str(tmp_path), "--rule", rule])
+        assert exc_info.value.code == 2
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["lint", "-j", "-1"])
+    assert exc_info.value.code == 2
@@ -1,5 +1,41 @@
 """Basic package test."""
 
+import subprocess
+import sys
+
+# Modules not loaded on every CLI call: only needed for --version and --help, for
+# parallel runs, by the other commands, or optional dependencies.
+CLI_DEFERRED_IMPORTS = (
+    "importlib.metadata",
+    "email",
+    "zipfile",
+    "multiprocessing",
+    "concurrent.futures.process",
+    "asyncio",
+    "nomage._languages",
+    "nomage._server",
+    "nomage.aio",
+    "nomage.frames",
+    "nomage.keys",
+    "nomage.lint",
+    "nomage.parallel",
+    "nomage.rewrite",
+    "nomage.stats",
+    "numpy",
+    "pandas",
+    "pyarrow",
+)
+
+
+def _imported_modules(module: str) -> set[str]:
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", f"import sys, {module}; print(*sys.modules)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(result.stdout.split())
+
 
 def test_package_import() -> None:
     """Import package."""
@@ -11,3 +47,39 @@ def test_package_version_is_defined() -> None:
     import nomage  # noqa: PLC0415
 
     assert nomage.__version__ != "undefined"
+    assert nomage.__version__ is nomage.__version__
+
+
+def test_package_missing_attribute() -> None:
+    """Missing package attributes raise AttributeError."""
+    import nomage  # noqa: PLC0415
+
+    assert not hasattr(nomage, "__missing__")
+
+
+def test_package_exports() -> None:
+    """Exports of the package are imported on first access."""
+    import nomage  # noqa: PLC0415
+    from nomage.naming import naming  # noqa: PLC0415
+
+    assert nomage.naming is naming
+    for name in nomage.__all__:
+        assert name in dir(nomage)
+        assert getattr(nomage, name).__name__ == name
+
+
+def test_client_imports() -> None:
+    """The thin client of the command does not load the library."""
+    modules = _imported_modules("nomage._client")
+    assert {name for name in modules if name.startswith("nomage")} == {
+        "nomage",
+        "nomage._client",
+    }
+    assert "typing" not in modules
+
+
+def test_cli_imports() -> None:
+    """Importing the CLI does not load modules it only needs for some commands."""
+    modules = _imported_modules("nomage._cli")
+    assert "nomage.naming" in modules
+    assert not modules.intersection(CLI_DEFERRED_IMPORTS)
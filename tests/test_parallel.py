@@ -0,0 +1,59 @@
+"""Tests for the Nomage parallel bulk conversion."""
+
+import pickle
+import re
+
+import pytest
+
+from nomage import NamingConvention, builtins_conventions, convert_many
+from nomage.exceptions import UnknownNamingConventionError
+from nomage.parallel import convert_many_parallel
+from nomage.tokenizer import Tokenizer
+
+DOT_CASE = NamingConvention(
+    names=("dot.case",),
+    match_regex=re.compile(r"^[a-z]+(\.[a-z]+)*$"),
+    parser=Tokenizer("."),
+    converter=".".join,
+)
+
+
+def test_convert_many_parallel() -> None:
+    """Parallel conversion gives the same results as the serial one, in order."""
+    id_strs = ["myId", "my__id", "MY_ID", "myHttpServer", ""] * 100
+    results = list(convert_many_parallel(id_strs, "snake", jobs=2, chunksize=7))
+    expected = list(convert_many(id_strs, "snake"))
+    assert [r.id_str for r in results] == id_strs
+    assert [r.converted for r in results] == [r.converted for r in expected]
+    assert [type(r.error) for r in results] == [type(r.error) for r in expected]
+
+
+def test_convert_many_parallel_custom() -> None:
+    """Custom conventions with picklable callables are shipped to the workers."""
+    results = convert_many_parallel(["my.id", "myId"], "kebab", [DOT_CASE], jobs=2)
+    assert [r.converted for r in results] == ["my-id", None]
+    results = convert_many_parallel(["my-id"], DOT_CASE, jobs=1)
+    assert [r.converted for r in results] == ["my.id"]
+
+
+def test_convert_many_parallel_registry() -> None:
+    """Conventions of a registry are shipped, and targets looked up in it."""
+    registry = builtins_conventions().copy()
+    registry.register(DOT_CASE)
+    results = convert_many_parallel(["my.id", "myId"], "dot.case", registry, jobs=2)
+    assert [r.converted for r in results] == ["my.id", "my.id"]
+    results = convert_many_parallel(["my.id"], "CONSTANT", registry, jobs=1)
+    assert [r.converted for r in results] == ["MY_ID"]
+
+
+def test_convert_many_parallel_unknown() -> None:
+    """Unknown target conventions raise before any work."""
+    with pytest.raises(UnknownNamingConventionError):
+        convert_many_parallel(["myId"], "snack")
+
+
+def test_pickle_conventions() -> None:
+    """Built-in conventions are unpickled as themselves, custom ones by value."""
+    for nc in builtins_conventions().values():
+        assert pickle.loads(pickle.dumps(nc)) is nc  # noqa: S301
+    assert pickle.loads(pickle.dumps(DOT_CASE)) == DOT_CASE  # noqa: S301
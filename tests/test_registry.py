@@ -0,0 +1,128 @@
+"""Tests for the Nomage naming convention registry."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from nomage import ConventionRegistry, NamingConvention, builtins_conventions, naming
+from nomage._cli import main
+from nomage.engine import get_engine
+from nomage.exceptions import UnknownNamingConventionError
+from nomage.naming import BUILTINS_CONVENTIONS, convert_many
+from nomage.tokenizer import Tokenizer
+
+
+def _dot_convention(*names: str) -> NamingConvention:
+    return NamingConvention(
+        names=names or ("dot.case", "dotted"),
+        match_regex=re.compile(r"^[a-z]+(\.[a-z]+)+$"),
+        parser=Tokenizer("."),
+        converter=".".join,
+    )
+
+
+@pytest.fixture
+def registry() -> ConventionRegistry:
+    """A copy of the built-in registry, with a dot.case convention."""
+    registry = builtins_conventions().copy()
+    registry.register(_dot_convention())
+    return registry
+
+
+def test_lookup(registry: ConventionRegistry) -> None:
+    """Names are looked up like built-in names, and lookups are memoized."""
+    assert registry["Dotted"] is registry["dotted"] is registry.get("DOTTED")
+    assert registry["snake"] is builtins_conventions()["snake_case"]
+    assert registry.get("unknown") is None
+    assert "dot.case" in registry
+    assert 1 not in registry
+    with pytest.raises(KeyError):
+        registry["unknown"]
+
+
+def test_mapping(registry: ConventionRegistry) -> None:
+    """The registry maps each name of each convention, and counts conventions."""
+    assert list(registry)[-2:] == ["dot.case", "dotted"]
+    assert len(registry) == len(builtins_conventions()) + 1
+    assert registry.conventions[-1].names == ("dot.case", "dotted")
+    assert len(registry.conventions) == len(set(registry.conventions))
+    assert repr(registry).endswith("'dot.case'])")
+
+
+def test_register_conflict(registry: ConventionRegistry) -> None:
+    """Registering a name twice is rejected, unless replacing."""
+    nc = registry["dotted"]
+    assert registry.register(nc) is nc
+    other = _dot_convention("Dotted")
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(other)
+    assert registry.register(other, replace=True) is other
+    assert registry["dotted"] is other
+    assert "dot.case" not in registry
+
+
+def test_shared_registry() -> None:
+    """The built-in registry cannot be changed, but can be copied."""
+    with pytest.raises(TypeError, match="copy"):
+        builtins_conventions().register(_dot_convention())
+    copy = builtins_conventions().copy()
+    assert copy.register(_dot_convention())
+    assert "dotted" not in builtins_conventions()
+
+
+def test_engine(registry: ConventionRegistry) -> None:
+    """Registries share the engine of the same conventions, and rebuild on change."""
+    engine = builtins_conventions().engine
+    assert naming("my_id", builtins_conventions()).convention.names[0] == "snake_case"
+    assert engine is get_engine(BUILTINS_CONVENTIONS)
+    assert registry.engine is registry.engine
+    registry.register(_dot_convention("dot.case"), replace=True)
+    assert registry.engine.detect("my.id") is registry["dot.case"]
+
+
+def test_convention_uid() -> None:
+    """Conventions are hashed and compared by a stable integer id."""
+    nc, same = _dot_convention(), _dot_convention()
+    assert isinstance(nc.uid, int)
+    assert nc == same
+    assert hash(nc) == hash(same) == nc.uid
+    assert nc != builtins_conventions()["snake"]
+    assert nc == "Dotted"
+    assert nc != "snake"
+
+
+def test_naming(registry: ConventionRegistry) -> None:
+    """Identifiers are detected and converted with the conventions of a registry."""
+    id_naming = naming("my.identifier", registry)
+    assert id_naming.convention is registry["dotted"]
+    assert id_naming.to("snake") == "my_identifier"
+    assert naming("myId").to("dotted", registry) == "my.id"
+    assert naming("myId").to_all(registry=registry)["dot.case"] == "my.id"
+    with pytest.raises(UnknownNamingConventionError):
+        naming("myId").to("dotted")
+
+
+def test_convert_many(registry: ConventionRegistry) -> None:
+    """Batch conversion looks the target up in the registry."""
+    results = convert_many(["my.id", "myId"], "dotted", registry)
+    assert [r.converted for r in results] == ["my.id", "my.id"]
+    assert [r.converted for r in convert_many(["myId"], "snake", BUILTINS_CONVENTIONS)]
+
+
+def test_cli(
+    registry: ConventionRegistry, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """The CLI detects and converts with a registry."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["my.identifier", "--check", "dotted", "--to", "camel"], registry)
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == "myIdentifier\n"
+
+    path = tmp_path / "ids.txt"
+    path.write_text("myId\nmy.id\n", encoding="utf-8")
+    for jobs in ("1", "2"):
+        with pytest.raises(SystemExit) as exc_info:
+            main(["--file", str(path), "--to", "dotted", "-j", jobs], registry)
+        assert exc_info.value.code == 0
+        assert capsys.readouterr().out == "my.id\nmy.id\n"
@@ -0,0 +1,180 @@
+"""Tests for the Nomage convention migration of source trees."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from nomage._cli import main
+from nomage.exceptions import UnknownNamingConventionError
+from nomage.rewrite import DEFAULT_EXCLUDE, find_files, rewrite_text, rewrite_tree
+
+SOURCE = """\
+def getUserId(user, userId=None):
+    # Returns the userId, see HTTPServer and MAX_SIZE.
+    return userId or user.id
+"""
+REWRITTEN = """\
+def get_user_id(user, user_id=None):
+    # Returns the user_id, see HTTPServer and MAX_SIZE.
+    return user_id or user.id
+"""
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """Create a small source tree."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "users.py").write_text(SOURCE)
+    (tmp_path / "pkg" / "const.py").write_text("MAX_SIZE = 1\n")
+    (tmp_path / "pkg" / "empty.py").write_text("")
+    (tmp_path / "pkg" / "data.bin").write_bytes(b"\0myId")
+    (tmp_path / "README.md").write_text("Call `getUserId`.\n")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("myId\n")
+    return tmp_path
+
+
+def test_rewrite_text() -> None:
+    """Only identifiers detected in the source convention are rewritten."""
+    assert rewrite_text(SOURCE, "camel", "snake") == REWRITTEN
+    assert rewrite_text("my_id = my-id", "snake", "camel") == "myId = my-id"
+    assert rewrite_text("my-id = my_id", "kebab", "camel") == "myId = my_id"
+    assert rewrite_text("x-my-id", "kebab", "snake") == "x_my_id"
+    assert rewrite_text("nothing", "camel", "snake") == "nothing"
+
+
+def test_rewrite_text_word_boundaries() -> None:
+    """Words end at hyphens unless hyphenated, and never inside non-ASCII ones."""
+    for text in ("total-userCount", "total - userCount", "userCount-1"):
+        expected = text.replace("userCount", "user_count")
+        assert rewrite_text(text, "camel", "snake") == expected
+    assert rewrite_text("my-id-x", "kebab", "snake") == "my_id_x"
+    assert rewrite_text("éuserId userIdé userId", "camel", "snake") == (
+        "éuserId userIdé user_id"
+    )
+    assert rewrite_text("nothing", "camel", "snake") == "nothing"
+    with pytest.raises(UnknownNamingConventionError):
+        rewrite_text("myId", "snack", "camel")
+
+
+def test_find_files(tree: Path) -> None:
+    """Files are listed in order, filtered by include and exclude patterns."""
+    root = str(tree)
+    files = [os.path.relpath(p, root) for p in find_files([root])]
+    assert files == [
+        "README.md",
+        "pkg/const.py",
+        "pkg/data.bin",
+        "pkg/empty.py",
+        "pkg/users.py",
+    ]
+    files = [
+        os.path.relpath(p, root)
+        for p in find_files([root], include=["*.py"], exclude=["const.py"])
+    ]
+    assert files == ["pkg/empty.py", "pkg/users.py"]
+    files = list(find_files([root], exclude=[*DEFAULT_EXCLUDE, "pkg"]))
+    assert files == [str(tree / "README.md")]
+    files = list(find_files([root], exclude=()))
+    assert str(tree / ".git" / "HEAD") in files
+    single = str(tree / "README.md")
+    assert list(find_files([single])) == [single]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_rewrite_tree(tree: Path, jobs: int) -> None:
+    """Changed files are rewritten in place, others are left untouched."""
+    const_mtime = (tree / "pkg" / "const.py").stat().st_mtime_ns
+    results = list(rewrite_tree([str(tree)], "camel", "snake", jobs=jobs))
+    assert [(Path(r.path).name, r.replacements) for r in results] == [
+        ("README.md", 1),
+        ("users.py", 4),
+    ]
+    assert (tree / "pkg" / "users.py").read_text() == REWRITTEN
+    assert (tree / "README.md").read_text() == "Call `get_user_id`.\n"
+    assert (tree / "pkg" / "const.py").stat().st_mtime_ns == const_mtime
+    assert (tree / "pkg" / "data.bin").read_bytes() == b"\0myId"
+    assert (tree / ".git" / "HEAD").read_text() == "myId\n"
+    assert list(rewrite_tree([str(tree)], "camel", "snake", jobs=jobs)) == []
+
+
+def test_rewrite_tree_dry_run(tree: Path) -> None:
+    """Dry runs compute diffs, without writing files."""
+    (result,) = rewrite_tree(
+        [str(tree)], "camel", "snake", include=["*.md"], dry_run=True
+    )
+    assert result.diff is not None
+    assert "-Call `getUserId`.\n+Call `get_user_id`.\n" in result.diff
+    assert (tree / "README.md").read_text() == "Call `getUserId`.\n"
+
+
+def test_rewrite_tree_symlink(tmp_path: Path) -> None:
+    """Symbolic links are kept, and their target is rewritten."""
+    target = tmp_path / "users.py"
+    target.write_text(SOURCE)
+    target.chmod(0o640)
+    link = tmp_path / "link.py"
+    link.symlink_to(target)
+    (result,) = rewrite_tree([str(link)], "camel", "snake")
+    assert result.replacements == 4
+    assert link.is_symlink()
+    assert target.read_text() == REWRITTEN
+    assert target.stat().st_mode & 0o777 == 0o640
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["link.py", "users.py"]
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "geteuid") or os.geteuid() != 0, reason="needs to give files away"
+)
+def test_rewrite_tree_owner(tmp_path: Path) -> None:
+    """Rewritten files keep their owner."""
+    path = tmp_path / "users.py"
+    path.write_text(SOURCE)
+    os.chown(path, 12345, 12346)
+    rewrite_tree([str(path)], "camel", "snake")
+    stat = path.stat()
+    assert (stat.st_uid, stat.st_gid) == (12345, 12346)
+
+
+def test_rewrite_tree_error(tmp_path: Path) -> None:
+    """Unreadable files are reported, without stopping the rewrite."""
+    missing = str(tmp_path / "missing.py")
+    (result,) = rewrite_tree([missing], "camel", "snake")
+    assert result.path == missing
+    assert isinstance(result.error, FileNotFoundError)
+
+
+def test_cli_rewrite(tree: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """The rewrite command prints diffs on dry runs, and a summary."""
+    args = ["rewrite", "--from", "camel", "--to", "snake", str(tree)]
+    with pytest.raises(SystemExit) as exc_info:
+        main([*args, "--dry-run", "--exclude", "*.md"])
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 0
+    assert "+def get_user_id(user, user_id=None):" in capture.out
+    assert "Would rewrite 4 identifiers in 1 files" in capture.err
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(args)
+    capture = capsys.readouterr()
+    assert exc_info.value.code == 0
+    assert capture.out == ""
+    assert "Rewrote 5 identifiers in 2 files" in capture.err
+
+
+def test_cli_rewrite_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """The rewrite command fails on unknown conventions and unreadable files."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["rewrite", "--from", "snack", "--to", "camel"])
+    assert exc_info.value.code == 1
+    assert "Could not find naming convention 'snack'" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["rewrite", "--from", "camel", "--to", "snake", str(tmp_path / "x")])
+    assert exc_info.value.code == 1
+    assert "Could not rewrite file" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["rewrite", "--from", "camel", "--to", "snake", "-j", "-1"])
+    assert exc_info.value.code == 2
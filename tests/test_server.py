@@ -0,0 +1,210 @@
+"""Tests for the Nomage server and its thin client."""
+
+import io
+import json
+import socketserver
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from nomage import __version__
+from nomage._cli import main
+from nomage._client import default_socket_path, forward, is_forwardable
+from nomage._server import _CLI_LOCK, handle_line, serve_stdio, serve_unix
+
+
+def _call(method: str, **params: object) -> object:
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    response = handle_line(json.dumps(request))
+    assert response is not None
+    return json.loads(response)
+
+
+@pytest.fixture
+def server_socket(tmp_path: Path) -> Iterator[str]:
+    """Serve on a Unix socket in a thread."""
+    path = str(tmp_path / "nomage.sock")
+    started = threading.Event()
+    servers: list[socketserver.BaseServer] = []
+
+    def ready(server: socketserver.BaseServer) -> None:
+        servers.append(server)
+        started.set()
+
+    thread = threading.Thread(target=serve_unix, args=(path,), kwargs={"ready": ready})
+    thread.start()
+    assert started.wait(timeout=10)
+    yield path
+    servers[0].shutdown()
+    thread.join()
+
+
+def test_methods() -> None:
+    """Server methods detect, check and convert identifiers."""
+    assert _call("detect", identifier="myId")["result"] == "camelCase"
+    assert _call("detect", identifiers=["my_id", "my__id"])["result"] == [
+        "snake_case",
+        None,
+    ]
+    assert _call("check", identifier="myId", convention="camel")["result"] is True
+    assert _call("check", identifiers=["MyId"], convention="camel")["result"] == [False]
+    assert _call("convert", identifier="myId", to="kebab")["result"] == "my-id"
+    assert _call("convert", identifiers=["myId", "my__id"], to=["snake"])["result"] == [
+        {"snake_case": "my_id"},
+        None,
+    ]
+    result = _call("cli", args=["myId", "--to", "snake"], version=__version__)
+    assert result["result"] == {
+        "stdout": "my_id\n",
+        "stderr": "",
+        "status": 0,
+    }
+
+
+def test_errors() -> None:
+    """Invalid requests are answered with JSON-RPC errors."""
+    assert _call("unknown")["error"]["code"] == -32601
+    assert _call("detect")["error"]["code"] == -32602
+    assert _call("detect", identifiers="myId")["error"]["code"] == -32602
+    assert _call("convert", identifier="myId")["error"]["code"] == -32602
+    assert _call("convert", identifier="myId", to="snack")["error"]["code"] == -32602
+    assert _call("cli", args=["--file", "x.txt"])["error"]["code"] == -32602
+    assert _call("cli", args="myId")["error"]["code"] == -32602
+    assert _call("cli", args=["myId"])["error"]["code"] == -32602
+    assert _call("cli", args=["myId"], version="0")["error"]["code"] == -32602
+    assert json.loads(handle_line("{")) == {
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {"code": -32700, "message": "parse error"},
+    }
+    assert json.loads(handle_line("[]"))["error"]["code"] == -32600
+    assert json.loads(handle_line("[1]"))[0]["error"]["code"] == -32600
+    assert json.loads(handle_line('{"id": 1}'))["error"]["code"] == -32600
+    assert (
+        json.loads(handle_line('{"id": 1, "method": "detect", "params": []}'))["error"][
+            "code"
+        ]
+        == -32602
+    )
+
+
+def test_batch_and_notifications() -> None:
+    """Batches get a list of responses, notifications get none."""
+    notification = {"method": "detect", "params": {"identifier": "myId"}}
+    request = {"id": "a", "method": "detect", "params": {"identifier": "MyId"}}
+    assert handle_line(json.dumps(notification)) is None
+    assert handle_line(json.dumps([notification])) is None
+    responses = json.loads(handle_line(json.dumps([notification, request])))
+    assert responses == [{"jsonrpc": "2.0", "id": "a", "result": "PascalCase"}]
+
+
+def test_serve_stdio() -> None:
+    """Server answers requests line by line on streams."""
+    infile = io.StringIO(
+        '{"id": 1, "method": "detect", "params": {"identifier": "x"}}\n'
+    )
+    outfile = io.StringIO()
+    serve_stdio(infile, outfile)
+    assert json.loads(outfile.getvalue())["result"] == "flatcase"
+
+
+def test_serve_unix(server_socket: str, capsys: pytest.CaptureFixture[str]) -> None:
+    """Client forwards command lines to the server."""
+    assert forward(["myId", "--to", "snake"], server_socket) == 0
+    assert forward(["my__id"], server_socket) == 1
+    capture = capsys.readouterr()
+    assert capture.out == "my_id\n"
+    assert "no matching" in capture.err.lower()
+    with pytest.raises(OSError, match="already listening"):
+        serve_unix(server_socket)
+
+
+def test_forward_other_user(
+    server_socket: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Client does not forward to a socket owned by another user."""
+    uid = Path(server_socket).stat().st_uid
+    monkeypatch.setattr("os.getuid", lambda: uid + 1)
+    assert forward(["myId", "--to", "snake"], server_socket) is None
+
+
+def test_forward_other_version(
+    server_socket: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Client does not forward to a server of another version."""
+    monkeypatch.setattr("nomage._server.__version__", "0")
+    assert forward(["myId", "--to", "snake"], server_socket) is None
+
+
+def test_forward_slow_response(
+    server_socket: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The connection timeout does not apply to the response."""
+    monkeypatch.setattr("nomage._client._CONNECT_TIMEOUT", 0.05)
+    _CLI_LOCK.acquire()
+    threading.Timer(0.3, _CLI_LOCK.release).start()
+    assert forward(["myId", "--to", "snake"], server_socket) == 0
+
+
+def test_serve_unix_not_socket(tmp_path: Path) -> None:
+    """Server refuses to replace a file which is not a socket."""
+    path = tmp_path / "ids.txt"
+    path.write_text("myId\n")
+    with pytest.raises(OSError, match="not a socket"):
+        serve_unix(str(path))
+    assert path.read_text() == "myId\n"
+
+
+def test_forward_fallback(tmp_path: Path) -> None:
+    """Client does not forward without a server, or when not forwardable."""
+    assert forward(["myId"], str(tmp_path / "missing.sock")) is None
+    assert forward(["myId"], "") is None
+    (tmp_path / "file.sock").touch()
+    assert forward(["myId"], str(tmp_path / "file.sock")) is None
+    assert not is_forwardable(["serve"])
+    assert not is_forwardable(["--file", "-"])
+    assert not is_forwardable(["-fids.txt"])
+    assert not is_forwardable(["--profile", "myId", "--to", "snake"])
+    assert is_forwardable(["myId", "--to", "snake"])
+
+
+def test_default_socket_path(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Socket path is read from the environment."""
+    monkeypatch.setenv("NOMAGE_SOCKET", "/run/nomage.sock")
+    assert default_socket_path() == "/run/nomage.sock"
+    monkeypatch.delenv("NOMAGE_SOCKET")
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert default_socket_path().startswith("/run/user/1000/nomage-")
+
+
+def test_cli_serve_stdio(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Command serve reads requests from stdin with --stdio."""
+    request = (
+        '{"id": 1, "method": "convert", "params": {"identifier": "a", "to": "UPPER"}}'
+    )
+    monkeypatch.setattr("sys.stdin", io.StringIO(request + "\n"))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["serve", "--stdio"])
+    assert exc_info.value.code == 0
+    assert json.loads(capsys.readouterr().out)["result"] == "A"
+
+
+def test_cli_serve_errors(
+    server_socket: str,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Command serve fails when a server is running, or without a socket path."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["serve", "--socket", server_socket])
+    assert exc_info.value.code == 1
+    assert "already listening" in capsys.readouterr().err
+
+    monkeypatch.setenv("NOMAGE_SOCKET", "")
+    with pytest.raises(SystemExit) as exc_info:
+        main(["serve"])
+    assert exc_info.value.code == 2
@@ -0,0 +1,152 @@
+"""Tests for the Nomage naming convention census."""
+
+import io
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+from nomage._cli import main
+from nomage.stats import _HyperLogLog, _Reservoir, census
+
+IDENTIFIERS = ["user", "myUser", "MyUser", "my_user", "my_user", "my__user", "my_id"]
+
+
+def test_census() -> None:
+    """Identifiers are counted in the first matching convention."""
+    report = census(IDENTIFIERS)
+    assert report.total == len(IDENTIFIERS)
+    assert report.conventions["snake_case"].count == 3
+    assert report.conventions["snake_case"].distinct == 2
+    assert report.conventions["UPPERCASE"].count == 0
+    assert report.unrecognized.count == report.unrecognized.distinct == 1
+    assert report.unrecognized_rate == pytest.approx(1 / 7)
+    assert report.distinct == 6
+    assert not report.approximate
+
+
+def test_census_ambiguous() -> None:
+    """Identifiers matching several conventions are counted by overlap."""
+    report = census(["user", "user", "MY", "myUser"])
+    assert report.ambiguous == 3
+    assert report.ambiguous_rate == pytest.approx(0.75)
+    names, count = next(iter(report.overlaps.items()))
+    assert names[:2] == ("flatcase", "camelCase")
+    assert count == 2
+
+
+def test_census_empty() -> None:
+    """An empty stream has no rates."""
+    report = census([])
+    assert report.total == report.distinct == 0
+    assert report.ambiguous_rate == report.unrecognized_rate == 0.0
+
+
+def test_census_approximate() -> None:
+    """Distinct identifiers are estimated in the approximate mode."""
+    id_strs = [f"id{i}" for i in range(20_000)] * 2
+    report = census(id_strs, approximate=True)
+    assert report.approximate
+    assert report.total == 40_000
+    assert report.distinct == pytest.approx(20_000, rel=0.05)
+    assert report.conventions["flatcase"].count == 40_000
+
+
+def test_census_samples() -> None:
+    """Samples are reproducible with a seed, and come from their convention."""
+    id_strs = [f"my_id{i}" for i in range(1000)]
+    report = census(id_strs, sample_size=5, seed=42)
+    samples = report.conventions["snake_case"].samples
+    assert len(samples) == 5
+    assert set(samples) <= set(id_strs)
+    assert (
+        samples
+        == census(id_strs, sample_size=5, seed=42).conventions["snake_case"].samples
+    )
+    assert report.conventions["flatcase"].samples == ()
+    with pytest.raises(ValueError, match="negative"):
+        census(id_strs, sample_size=-1)
+
+
+def test_hyperloglog() -> None:
+    """Estimates are exact for small cardinalities, and close for large ones."""
+    sketch = _HyperLogLog()
+    assert sketch.estimate() == 0
+    for i in range(100):
+        sketch.add(str(i))
+    assert sketch.estimate() == pytest.approx(100, abs=2)
+    for i in range(200_000):
+        sketch.add(str(i))
+    assert sketch.estimate() == pytest.approx(200_000, rel=0.05)
+
+
+def test_reservoir_uniform() -> None:
+    """Each item of the stream is sampled with the same probability."""
+    rng = random.Random(0)  # noqa: S311
+    hits = [0] * 100
+    for _ in range(2000):
+        reservoir = _Reservoir(10, rng)
+        for i in range(100):
+            reservoir.add(str(i))
+        for item in reservoir.items:
+            hits[int(item)] += 1
+    # 2000 draws of 10 among 100: 200 hits per item on average.
+    assert min(hits) > 140
+    assert max(hits) < 260
+
+
+def test_cli_stats(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Command stats prints the census of files, as text or JSON."""
+    path = tmp_path / "ids.txt"
+    path.write_text("\n".join(IDENTIFIERS) + "\n\n", encoding="utf-8")
+    with pytest.raises(SystemExit) as exc_info:
+        main(["stats", "--sample", "1", str(path)])
+    assert exc_info.value.code == 0
+    out = capsys.readouterr().out
+    assert out.startswith("Identifiers: 7 (6 distinct), ambiguous: 1")
+    assert "e.g. my__user" in out
+    assert "flatcase / camelCase" in out
+
+    with pytest.raises(SystemExit) as exc_info:
+        main(["stats", "--format", "json", "-a", str(path)])
+    report = json.loads(capsys.readouterr().out)
+    assert report["total"] == 7
+    assert report["approximate"]
+    assert report["conventions"]["snake_case"]["count"] == 3
+
+
+def test_cli_stats_stdin(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Command stats reads stdin by default."""
+    monkeypatch.setattr(sys, "stdin", io.StringIO("myId\n"))
+    with pytest.raises(SystemExit) as exc_info:
+        main(["stats"])
+    assert exc_info.value.code == 0
+    assert "camelCase" in capsys.readouterr().out
+
+
+def test_cli_stats_not_utf8(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Command stats counts lines which are not UTF-8 as unrecognized."""
+    path = tmp_path / "ids.txt"
+    path.write_bytes(b"myId\n\xff\xfe\nmy_id\n")
+    with pytest.raises(SystemExit) as exc_info:
+        main(["stats", "--sample", "1", str(path)])
+    assert exc_info.value.code == 0
+    out = capsys.readouterr().out
+    assert out.startswith("Identifiers: 3 (3 distinct)")
+    assert "unrecognized: 1" in out
+    assert "e.g. \\udcff\\udcfe" in out
+
+
+def test_cli_stats_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Command stats fails on missing files and invalid arguments."""
+    with pytest.raises(SystemExit) as exc_info:
+        main(["stats", str(tmp_path / "missing.txt")])
+    assert exc_info.value.code == 1
+    assert "Could not read file" in capsys.readouterr().err
+    with pytest.raises(SystemExit) as exc_info:
+        main(["stats", "--sample", "-1"])
+    assert exc_info.value.code == 2
@@ -0,0 +1,57 @@
+"""Tests for the Nomage columnar identifier storage."""
+
+import pytest
+
+from nomage import naming
+from nomage.exceptions import UnrecognizedNamingConventionError
+from nomage.table import CompactIdentifier, IdentifierTable
+
+
+def test_compact_identifier() -> None:
+    """Compact identifiers are API-compatible with identifiers."""
+    identifier = naming("myHttpServer")
+    compact = CompactIdentifier.from_identifier(identifier)
+    assert compact.components == identifier.components
+    assert compact.convention is identifier.convention
+    assert compact.to("snake") == "my_http_server"
+    assert str(compact) == "myHttpServer"
+    assert compact.identifier() == identifier
+    assert compact == CompactIdentifier.from_identifier(naming("myHttpServer"))
+    assert compact.text is CompactIdentifier.from_identifier(identifier).text
+
+
+def test_compact_identifier_long() -> None:
+    """Compact identifiers longer than 255 characters keep their components."""
+    identifier = naming("_".join(["component"] * 40))
+    compact = CompactIdentifier.from_identifier(identifier)
+    assert compact.components == identifier.components
+    assert str(compact) == str(identifier)
+
+
+def test_identifier_table() -> None:
+    """Identifier tables store identifiers with an interned vocabulary."""
+    id_strs = ["userId", "user_name", "USER_ID", "userName", "x"]
+    table = IdentifierTable.from_strings(id_strs)
+    assert len(table) == len(id_strs)
+    assert list(table) == [naming(id_str) for id_str in id_strs]
+    assert [str(identifier) for identifier in table] == id_strs
+    assert table.vocabulary == ("user", "id", "name", "x")
+    assert table.components(-1) == ("x",)
+    assert table.convention(2) is naming("USER_ID").convention
+    assert table[1:3] == [naming("user_name"), naming("USER_ID")]
+    assert table[0].components[0] is table[1].components[0]
+    with pytest.raises(IndexError):
+        table[5]
+
+
+def test_identifier_table_append() -> None:
+    """Identifier tables grow with identifiers, and measure their size."""
+    table = IdentifierTable()
+    empty_nbytes = table.nbytes
+    table.append(naming("myId"))
+    table.extend([naming("my_id"), naming("my-id")])
+    assert [identifier.to("kebab") for identifier in table] == ["my-id"] * 3
+    assert len(table.vocabulary) == 2
+    assert table.nbytes > empty_nbytes
+    with pytest.raises(UnrecognizedNamingConventionError):
+        IdentifierTable.from_strings(["my__id"])
@@ -0,0 +1,187 @@
+"""Stress tests of Nomage shared by many threads."""
+
+import re
+import sys
+import threading
+from collections.abc import Callable, Iterator
+from itertools import permutations
+
+import pytest
+
+from nomage import NamingConvention, builtins_conventions, naming
+from nomage.adaptive import disable_adaptive_ordering, enable_adaptive_ordering
+from nomage.cache import cache_info, clear_cache, disable_cache, enable_cache
+from nomage.engine import _ENGINES_MAX_SIZE, get_engine
+from nomage.instrument import clear_instrumentation, instrumentation_info, instrumented
+from nomage.keys import clear_key_cache, convert_keys
+from nomage.naming import BUILTINS_CONVENTIONS, convert_many
+from nomage.parallel import convert_many_threaded, gil_enabled
+from nomage.tokenizer import Tokenizer
+
+THREADS = 8
+ROUNDS = 200
+IDENTIFIERS = {
+    "myIdentifier": "my_identifier",
+    "MyIdentifier": "my_identifier",
+    "my-identifier": "my_identifier",
+    "MY_IDENTIFIER": "my_identifier",
+    "myHttpServer": "my_http_server",
+    "a": "a",
+}
+
+
+@pytest.fixture(autouse=True)
+def _switch_often() -> Iterator[None]:
+    # With the GIL, threads switch after each few bytecodes, to expose races.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(target: Callable[[int], None], threads: int = THREADS) -> None:
+    barrier = threading.Barrier(threads)
+    errors: list[BaseException] = []
+
+    def run(index: int) -> None:
+        barrier.wait()
+        try:
+            target(index)
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert errors == []
+
+
+def _convert_all(_: int) -> None:
+    for _ in range(ROUNDS):
+        for id_str, expected in IDENTIFIERS.items():
+            assert naming(id_str).to("snake") == expected
+
+
+def test_threads_naming() -> None:
+    """Detection and conversion give the same results in all threads."""
+    _run_threads(_convert_all)
+
+
+def test_threads_cache() -> None:
+    """The cache stays consistent when threads evict each other's entries."""
+    enable_cache(maxsize=3)
+    clear_cache()
+    try:
+        _run_threads(_convert_all)
+        info = cache_info()
+    finally:
+        disable_cache()
+    # A lookup by `naming` and one by `Identifier.to` per conversion.
+    assert info.hits + info.misses == 2 * THREADS * ROUNDS * len(IDENTIFIERS)
+    assert info.currsize <= 3
+
+
+def test_threads_engines() -> None:
+    """Engines evicted and rebuilt concurrently detect like their conventions."""
+    orders = list(permutations(BUILTINS_CONVENTIONS[:5]))
+    assert len(orders) > _ENGINES_MAX_SIZE
+
+    def detect(index: int) -> None:
+        for conventions in orders[index::2]:
+            engine = get_engine(conventions)
+            for id_str in IDENTIFIERS:
+                expected = next((nc for nc in conventions if nc.match(id_str)), None)
+                assert engine.detect(id_str) is expected
+
+    _run_threads(detect)
+
+
+def test_threads_adaptive() -> None:
+    """Engines reordered concurrently detect like their conventions."""
+    enable_adaptive_ordering(interval=5)
+    try:
+        _run_threads(_convert_all)
+    finally:
+        disable_adaptive_ordering()
+
+
+def test_threads_registry() -> None:
+    """Lookups and detection run while other threads register conventions."""
+    registry = builtins_conventions().copy()
+    snake = registry["snake"]
+
+    def use(index: int) -> None:
+        for i in range(ROUNDS // 4):
+            if index % 2:
+                registry.register(
+                    NamingConvention(
+                        names=(f"dot{index}.{i}",),
+                        match_regex=re.compile(r"^[a-z]+(\.[a-z]+)+$"),
+                        parser=Tokenizer("."),
+                        converter=".".join,
+                    )
+                )
+            else:
+                assert registry.get("Snake Case") is snake
+                assert naming("myId", registry).to("snake", registry) == "my_id"
+
+    _run_threads(use)
+    registered = len(registry.conventions) - len(builtins_conventions().conventions)
+    assert registered == THREADS // 2 * (ROUNDS // 4)
+    assert registry.engine.conventions == registry.conventions
+    assert naming("my.id", registry).to("snake") == "my_id"
+
+
+def test_threads_instrumentation() -> None:
+    """Instrumentation counts every detection of every thread."""
+    clear_instrumentation()
+    with instrumented():
+        _run_threads(_convert_all)
+    report = instrumentation_info()
+    clear_instrumentation()
+    assert report.timings["detect"].count == THREADS * ROUNDS * len(IDENTIFIERS)
+    assert sum(stats.hits for stats in report.conventions.values()) == (
+        THREADS * ROUNDS * len(IDENTIFIERS)
+    )
+
+
+def test_threads_keys() -> None:
+    """Threads share the converted keys of `convert_keys`."""
+    clear_key_cache()
+    body = {id_str: [{id_str: i}] for i, id_str in enumerate(IDENTIFIERS)}
+    expected = convert_keys(body, "kebab")
+    clear_key_cache()
+
+    def convert(_: int) -> None:
+        for _ in range(ROUNDS // 4):
+            assert convert_keys(body, "kebab") == expected
+
+    _run_threads(convert)
+
+
+@pytest.mark.parametrize("jobs", [None, 1, 4])
+def test_convert_many_threaded(jobs: int | None) -> None:
+    """Threaded conversion gives the same results as the serial one, in order."""
+    id_strs = [*IDENTIFIERS, "my__id", ""] * 100
+    results = list(convert_many_threaded(id_strs, "kebab", jobs=jobs, chunksize=7))
+    expected = list(convert_many(id_strs, "kebab"))
+    assert [r.id_str for r in results] == id_strs
+    assert [r.converted for r in results] == [r.converted for r in expected]
+    assert [type(r.error) for r in results] == [type(r.error) for r in expected]
+
+
+def test_convert_many_threaded_registry() -> None:
+    """Targets are looked up in the registry of the conventions."""
+    registry = builtins_conventions()
+    results = convert_many_threaded(["myId"], "CONSTANT", registry, jobs=2)
+    assert [r.converted for r in results] == ["MY_ID"]
+
+
+def test_gil_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The GIL is enabled unless a free-threaded build says otherwise."""
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    assert not gil_enabled()
+    monkeypatch.delattr(sys, "_is_gil_enabled")
+    assert gil_enabled()
@@ -0,0 +1,63 @@
+"""Tests for the Nomage identifier tokenizer."""
+
+import pickle
+import re
+
+from nomage import NamingConvention, naming
+from nomage.tokenizer import (
+    Tokenizer,
+    split_none,
+    split_on_case,
+    split_on_hyphen,
+    split_on_underscore,
+)
+
+
+def test_split_functions() -> None:
+    """Tokenizer functions split identifiers into lower case components."""
+    assert split_on_case("myHTTPServer2") == ("my", "h", "t", "t", "p", "server2")
+    assert split_on_case("MyIdentifier") == ("my", "identifier")
+    assert split_on_underscore("MY_IDENTIFIER") == ("my", "identifier")
+    assert split_on_hyphen("My-Identifier") == ("my", "identifier")
+    assert split_none("MYIDENTIFIER") == ("myidentifier",)
+
+
+def test_tokenizer() -> None:
+    """Tokenizer splits on any separator and/or on case boundaries."""
+    assert Tokenizer(".")("MY.IDENTIFIER") == ("my", "identifier")
+    assert Tokenizer("+", case_boundary=True)("my+otherIdentifier") == (
+        "my",
+        "other",
+        "identifier",
+    )
+    assert Tokenizer(case_boundary=True)("myIdentifier") == ("my", "identifier")
+    assert Tokenizer()("MyIdentifier") == ("myidentifier",)
+    assert repr(Tokenizer(".")) == "Tokenizer('.', case_boundary=False)"
+
+
+def test_tokenizer_multi_character_separator() -> None:
+    """Tokenizer splits on the whole separator, not on each of its characters."""
+    assert Tokenizer("::")("a::b:c") == ("a", "b:c")
+    assert Tokenizer("::", case_boundary=True)("a::b:c") == ("a", "b:c")
+    assert Tokenizer("::", case_boundary=True)("my::otherId") == ("my", "other", "id")
+    tokenizer = pickle.loads(pickle.dumps(Tokenizer("::", case_boundary=True)))  # noqa: S301
+    assert tokenizer("a::bC") == ("a", "b", "c")
+
+
+def test_tokenizer_pickle() -> None:
+    """Tokenizer can be pickled, with its attributes."""
+    tokenizer = pickle.loads(pickle.dumps(Tokenizer(".", case_boundary=True)))  # noqa: S301
+    assert tokenizer("my.otherIdentifier") == ("my", "other", "identifier")
+    assert tokenizer.separator == "."
+    assert tokenizer.case_boundary
+
+
+def test_tokenizer_custom_convention() -> None:
+    """Tokenizer can be used as parser of a custom convention."""
+    dot_nc = NamingConvention(
+        names=("dot.case",),
+        match_regex=re.compile(r"^[a-z][a-z0-9]*(\.[a-z][a-z0-9]*)*$"),
+        parser=Tokenizer("."),
+        converter=lambda components: ".".join(components),
+    )
+    assert naming("my.identifier", conventions=[dot_nc]).to("camel") == "myIdentifier"